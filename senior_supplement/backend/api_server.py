@@ -1,27 +1,112 @@
 #!/usr/bin/env python3
 import os
-import json
+import asyncio
+import threading
+import time
 import base64
 import io
+import orjson
+from contextlib import asynccontextmanager
 from PIL import Image
-from fastapi import FastAPI, HTTPException, Depends
+from botocore.exceptions import BotoCoreError, ClientError
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Optional
-import boto3
-from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from aws_clients import client_status, get_client, get_session
 from rag_system import RAGSystem
 from korean_food_classifier import korean_classifier
-from database import get_db, create_tables
-from db_service import DatabaseService
-
-# 데이터베이스 테이블 생성
-create_tables()
-
-# FastAPI 앱 초기화
-app = FastAPI(title="Senior Supplement API", version="1.0.0")
-
-# RAG 시스템 초기화
-rag_system = RAGSystem()
+from food_nutrition_db import nutrition_db
+from food_name_index import food_name_index
+from prompt_templates import prompt_registry, PromptParts
+from circuit_breaker import CircuitOpenError, breaker_status, converse_breaker, sts_breaker, youtube_breaker
+from checkup_rules import build_checkup_result, format_metrics, interpret_checkup, worse
+from supplement_buckets import RecommendationContextCache, find_bucket
+from model_router import ModelRouter
+from structured_output import (
+    CheckupAnalysis, CheckupImageAnalysis, FoodVerification, MealVisionResult, SupplementPlan,
+    StructuredOutputError, TextFactCheck, VideoFactCheck, parse_converse_response, supports_tool_use, tool_config
+)
+from database import get_async_db, create_tables, ping_database, pool_status, async_engine
+from db_service import AsyncDatabaseService, latest_record_cache, latest_cache_key
+from cache import etag_matches, make_etag
+from health_checks import health_monitor
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
+
+@asynccontextmanager
+async def lifespan(app):
+    """테이블 생성, AWS 클라이언트, RAG 인덱스 로드는 백그라운드에서 진행하고 바로 요청을 받음
+    
+    준비 상태는 /readyz(startup 점검)로 확인하고, RAG가 로드되기 전 검색은 SQLite 폴백을 사용합니다.
+    """
+    health_monitor.start()
+    threading.Thread(target=initialize_subsystems, name="startup-init", daemon=True).start()
+    yield
+    health_monitor.stop()
+
+# FastAPI 앱 초기화 (응답 직렬화는 orjson)
+app = FastAPI(
+    title="Senior Supplement API", version="1.0.0", default_response_class=ORJSONResponse, lifespan=lifespan
+)
+
+# 응답 압축 (brotli-asgi가 설치되어 있으면 br, 아니면 gzip). 작은 응답은 압축하지 않음
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_SIZE, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
+# RAG 시스템 (인덱스는 서버 시작 후 백그라운드에서 로드)
+rag_system = RAGSystem(lazy=True)
+
+# 영양제 추천 RAG 컨텍스트 캐시 (RAG 로드 후 버킷 검색어를 백그라운드에서 미리 검색)
+recommendation_cache = RecommendationContextCache(rag_system)
+RECOMMENDATION_PRECOMPUTE = os.getenv("RECOMMENDATION_PRECOMPUTE", "on").lower() not in ("off", "false", "0")
+
+# ==================== 백그라운드 초기화 ====================
+
+# 단계별 상태 (pending → running → done / failed)
+startup_steps = {name: {"status": "pending"} for name in ("tables", "aws_clients", "rag", "recommendation_context")}
+
+def warm_aws_clients():
+    for profile in ("converse", "rekognition", "embeddings", "sts", "bedrock"):
+        get_client(profile)
+
+def load_rag():
+    rag_system.load()
+    # 로드 전 SQLite 폴백 결과로 채워진 캐시는 버리고 FAISS 결과로 다시 계산
+    recommendation_cache.clear()
+
+def precompute_recommendation_context():
+    if RECOMMENDATION_PRECOMPUTE:
+        recommendation_cache.precompute()
+
+def initialize_subsystems():
+    """무거운 초기화를 순서대로 실행 (실패한 단계는 기록만 하고 다음 단계 진행)"""
+    steps = (
+        ("tables", create_tables),
+        ("aws_clients", warm_aws_clients),
+        ("rag", load_rag),
+        ("recommendation_context", precompute_recommendation_context),
+    )
+    for name, step in steps:
+        start = time.time()
+        startup_steps[name] = {"status": "running"}
+        try:
+            step()
+            startup_steps[name] = {"status": "done", "seconds": round(time.time() - start, 2)}
+        except Exception as e:
+            print(f"❌ 초기화 실패 ({name}): {str(e)}")
+            startup_steps[name] = {"status": "failed", "error": str(e)[:200]}
+        # 준비 상태가 다음 점검 주기를 기다리지 않고 바로 반영되도록
+        health_monitor.refresh()
+    print(f"✅ 백그라운드 초기화 완료: {startup_steps}")
 
 # 데이터베이스 연동을 위한 Pydantic 모델들
 class UserCreate(BaseModel):
@@ -80,27 +165,122 @@ class SyncData(BaseModel):
     fact_checks: Optional[List[dict]] = []
     medication_records: Optional[List[dict]] = []
 
+# Bedrock converse 프롬프트 캐시(cachePoint)를 지원하는 모델 → 캐시되는 최소 접두부 토큰 수
+# 기본 대형 모델(claude-3-5-sonnet 20240620)은 지원하지 않고, 고정 프롬프트도 대부분 최소 길이보다 짧아
+# 현재 설정에서는 프롬프트 캐시가 동작하지 않습니다 (/api/health의 prompt_cache 참고).
+PROMPT_CACHE_MODELS = {
+    "claude-3-7-sonnet": 1024,
+    "claude-3-5-haiku": 2048,
+    "claude-sonnet-4": 1024,
+    "claude-opus-4": 1024,
+    "claude-haiku-4-5": 4096,
+}
+CACHED_PROMPT_FILES = ("checkup_expert.txt", "final_supplement_expert.txt", "meal_vision_coach.txt")
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 (한글은 글자당 1토큰, 그 외는 4글자당 1토큰으로 계산)"""
+    hangul = sum(1 for char in text if "가" <= char <= "힣")
+    return hangul + (len(text) - hangul) // 4
+
 class NutriApp:
     def __init__(self):
-        self.session = boto3.Session()
-        self.bedrock = self.session.client('bedrock-runtime', region_name='us-east-1')
-        self.rekognition = self.session.client('rekognition', region_name='us-east-1')
+        # 모듈 간 공유 클라이언트 (연결 풀/타임아웃/재시도 설정은 aws_clients, 처음 사용할 때 생성)
+        self._bedrock = None
+        self._rekognition = None
         self.model_id = "anthropic.claude-3-5-sonnet-20240620-v1:0"
+        # 짧은 텍스트 작업은 소형 모델 우선, 나머지는 self.model_id
+        self.router = ModelRouter(large_model_id=self.model_id)
+        self.usage_stats = {
+            "calls": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_read_input_tokens": 0,
+            "cache_write_input_tokens": 0
+        }
+        self._usage_lock = threading.Lock()
     
-    def load_prompt(self, filename, variables):
-        """prompts 폴더 내의 텍스트 파일을 읽고 변수를 치환합니다."""
-        filepath = os.path.join("prompts", filename)
-        
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {os.path.abspath(filepath)}")
+    @property
+    def session(self):
+        return get_session()
+
+    @property
+    def bedrock(self):
+        if self._bedrock is None:
+            self._bedrock = get_client("converse")
+        return self._bedrock
+
+    @bedrock.setter
+    def bedrock(self, client):
+        self._bedrock = client
+
+    @property
+    def rekognition(self):
+        if self._rekognition is None:
+            self._rekognition = get_client("rekognition")
+        return self._rekognition
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()
+    def load_prompt(self, filename, variables):
+        """컴파일된 prompts 템플릿에 변수를 치환합니다."""
+        return prompt_registry.render(filename, variables)
+
+    def load_prompt_parts(self, filename, variables, extra_static=()):
+        """캐시 가능한 고정 부분과 사용자별 부분으로 나눠 템플릿을 렌더링합니다."""
+        return prompt_registry.render_parts(filename, variables, extra_static)
+
+    def prompt_cache_min_tokens(self, model_id=None):
+        """모델의 프롬프트 캐시 최소 토큰 수 (cachePoint를 지원하지 않으면 None)"""
+        model_id = model_id or self.model_id
+        return next((tokens for name, tokens in PROMPT_CACHE_MODELS.items() if name in model_id), None)
+
+    def supports_prompt_cache(self, model_id=None):
+        """모델이 converse cachePoint를 지원하는지 확인"""
+        return self.prompt_cache_min_tokens(model_id) is not None
+
+    def build_system_blocks(self, system_prompt, model_id=None):
+        """시스템 프롬프트를 converse system 블록으로 변환 (고정 부분이 충분히 길면 뒤에 cachePoint)"""
+        if not isinstance(system_prompt, PromptParts):
+            return [{"text": str(system_prompt)}]
+
+        blocks = [{"text": text} for text in system_prompt.static if text.strip()]
+        min_tokens = self.prompt_cache_min_tokens(model_id)
+        # 최소 길이보다 짧은 접두부는 캐시되지 않으므로 cachePoint를 보내지 않음
+        if blocks and min_tokens is not None and estimate_tokens("".join(system_prompt.static)) >= min_tokens:
+            blocks.append({"cachePoint": {"type": "default"}})
+        if system_prompt.dynamic.strip():
+            blocks.append({"text": system_prompt.dynamic})
+        return blocks
+
+    def prompt_cache_status(self):
+        """/api/health용 프롬프트 캐시 상태 (모델 지원 여부와 프롬프트별 고정 부분 길이)"""
+        models = {}
+        for model_id in dict.fromkeys((self.model_id, self.router.fast_model_id)):
+            min_tokens = self.prompt_cache_min_tokens(model_id)
+            models[model_id] = {"supported": min_tokens is not None, "min_tokens": min_tokens}
+        prompts = {}
+        for filename in CACHED_PROMPT_FILES:
+            static = prompt_registry.get(filename).static_prefix
+            if filename == "meal_vision_coach.txt":
+                static += korean_classifier.get_detailed_classification_prompt()
+            prompts[filename] = estimate_tokens(static)
+        large_min = models[self.model_id]["min_tokens"]
+        return {
+            "active": large_min is not None and any(tokens >= large_min for tokens in prompts.values()),
+            "models": models,
+            "static_prefix_tokens": prompts,
+        }
 
-        for key, value in variables.items():
-            content = content.replace(f"{{{{{key}}}}}", str(value))
-        
-        return content
+    def record_usage(self, response):
+        """converse 응답의 토큰 사용량(캐시 포함) 기록"""
+        usage = response.get('usage') or {}
+        with self._usage_lock:
+            self.usage_stats["calls"] += 1
+            self.usage_stats["input_tokens"] += usage.get('inputTokens', 0)
+            self.usage_stats["output_tokens"] += usage.get('outputTokens', 0)
+            self.usage_stats["cache_read_input_tokens"] += usage.get('cacheReadInputTokens', 0)
+            self.usage_stats["cache_write_input_tokens"] += usage.get('cacheWriteInputTokens', 0)
+        if usage.get('cacheReadInputTokens') or usage.get('cacheWriteInputTokens'):
+            print(f"🗂️ 프롬프트 캐시: 읽기 {usage.get('cacheReadInputTokens', 0)} / "
+                  f"쓰기 {usage.get('cacheWriteInputTokens', 0)} 토큰")
     
     def resize_image_for_bedrock(self, image_data):
         """이미지를 Bedrock 요구사항에 맞게 리사이즈"""
@@ -119,15 +299,81 @@ class NutriApp:
                     quality -= 10
         except Exception as e:
             raise Exception(f"이미지 처리 중 오류 발생: {str(e)}")
-    
+
+    def crop_image_region(self, image_data, bbox, padding=0.05, max_side=512):
+        """정규화된 bbox [x, y, w, h] (0~1) 영역만 잘라 작은 JPEG로 반환"""
+        with Image.open(io.BytesIO(image_data)) as img:
+            if img.mode in ("RGBA", "P"):
+                img = img.convert("RGB")
+
+            width, height = img.size
+            x, y, w, h = [float(v) for v in bbox]
+            left = max(0.0, x - padding) * width
+            top = max(0.0, y - padding) * height
+            right = min(1.0, x + w + padding) * width
+            bottom = min(1.0, y + h + padding) * height
+            if right - left < 1 or bottom - top < 1:
+                raise ValueError(f"잘못된 bbox: {bbox}")
+
+            region = img.crop((int(left), int(top), int(right), int(bottom)))
+            region.thumbnail((max_side, max_side))
+
+            output = io.BytesIO()
+            region.save(output, format="JPEG", quality=85)
+            return output.getvalue()
+
     # def analyze_food_with_rekognition(self, image_data):
     #     """AWS Rekognition으로 음식 인식 - Claude Vision으로 대체됨"""
     #     # 이 메서드는 더 이상 사용하지 않음 - Claude Vision이 더 정확함
     #     pass
     
-    def call_claude(self, system_prompt, user_message, image_data=None):
-        """Claude API 호출"""
-        import time
+    def converse_json(self, messages, system_prompt=None, schema=None, task="default", model_id=None):
+        """converse 호출 후 JSON 응답 반환 (schema가 있으면 도구 입력으로 형식을 강제하고 검증)"""
+        model_id = model_id or self.model_id
+        kwargs = {"modelId": model_id, "messages": messages}
+        if system_prompt is not None:
+            kwargs["system"] = self.build_system_blocks(system_prompt, model_id)
+        if schema is not None and supports_tool_use(model_id):
+            kwargs["toolConfig"] = tool_config(schema)
+
+        start = time.perf_counter()
+        try:
+            # Bedrock 장애로 서킷이 열려 있으면 바로 CircuitOpenError (호출부는 기본 응답으로 처리)
+            response = converse_breaker.call(self.bedrock.converse, **kwargs)
+        except CircuitOpenError:
+            raise
+        except Exception:
+            self.router.record_error(task)
+            raise
+        self.router.record(task, model_id, time.perf_counter() - start, response.get('usage'))
+        self.record_usage(response)
+        return parse_converse_response(response, schema)
+
+    def routed_converse(self, task, messages, system_prompt=None, schema=None, input_chars=0, has_image=False):
+        """작업 종류와 입력 크기로 모델을 고르고, 소형 모델 결과가 불확실하면 대형 모델로 재호출"""
+        models = self.router.candidates(task, input_chars, has_image)
+        for index, model_id in enumerate(models):
+            is_last = index == len(models) - 1
+            try:
+                result = self.converse_json(messages, system_prompt, schema, task, model_id)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                # 소형 모델 오류(형식 불일치, 모델 미활성화 등)는 대형 모델로 넘김
+                if is_last:
+                    raise
+                print(f"⚠️ {task}: {model_id} 호출 실패 ({e})")
+                result = None
+            if is_last or self.router.accepts(task, result):
+                return result
+            self.router.record_escalation(task)
+            print(f"🔼 {task}: 소형 모델 결과가 불확실해 대형 모델로 다시 호출합니다.")
+
+    def call_claude(self, system_prompt, user_message, image_data=None, schema=None, task="default", input_chars=None):
+        """Claude API 호출 (schema: structured_output의 응답 스키마, task: model_router 작업 종류)
+        
+        input_chars는 모델 선택에 쓰는 사용자 입력 길이 (기본은 user_message 길이)
+        """
         import random
         
         max_retries = 1  # 재시도 횟수를 1로 줄임
@@ -162,24 +408,14 @@ class NutriApp:
                         "content": [{"text": user_message}]
                     })
                 
-                response = self.bedrock.converse(
-                    modelId=self.model_id,
-                    messages=messages,
-                    system=[{"text": system_prompt}]
-                )
-                
-                raw_text = response['output']['message']['content'][0]['text']
-                
                 try:
-                    if "```json" in raw_text:
-                        json_text = raw_text.split("```json")[1].split("```")[0].strip()
-                    else:
-                        start_idx = raw_text.find("{")
-                        end_idx = raw_text.rfind("}") + 1
-                        json_text = raw_text[start_idx:end_idx]
-                    return json.loads(json_text)
-                except:
-                    return {"content": raw_text, "status": "Unknown"}
+                    return self.routed_converse(
+                        task, messages, system_prompt, schema,
+                        len(user_message) if input_chars is None else input_chars, image_data is not None
+                    )
+                except StructuredOutputError as e:
+                    print(f"⚠️ JSON 응답 파싱 실패: {e}")
+                    return {"content": e.raw_text, "status": "Unknown"}
                     
             except Exception as e:
                 if "ThrottlingException" in str(e) and attempt < max_retries - 1:
@@ -228,6 +464,114 @@ class NutriApp:
 # NutriApp 인스턴스 생성
 nutri_app = NutriApp()
 
+# 식단 분석 재검증 설정
+LOW_CONFIDENCE_THRESHOLD = 0.7
+MAX_VERIFICATION_ITEMS = 4
+FOOD_VERIFICATION_SYSTEM_PROMPT = "당신은 한국 음식 분류 검증 전문가입니다. 사진에 실제로 보이는 특징만으로 판단하고 JSON으로만 답하세요."
+
+def _parse_confidence(value) -> Optional[float]:
+    """확신도를 0~1 범위로 변환 (1-10 척도 응답도 허용, 없거나 숫자가 아니면 None)"""
+    try:
+        confidence = float(value)
+    except (TypeError, ValueError):
+        return None
+    return confidence / 10 if confidence > 1 else confidence
+
+def _has_bbox(item: dict) -> bool:
+    bbox = item.get('bbox')
+    return isinstance(bbox, list) and len(bbox) == 4
+
+def _needs_verification(item: dict) -> bool:
+    """재검증이 필요한 음식 항목인지 확인 (일반적/빈 이름, 또는 확신도가 명시적으로 낮은 경우)"""
+    if food_name_index.is_generic(str(item.get('name', ''))):
+        return True
+    confidence = _parse_confidence(item.get('confidence'))
+    # 확신도가 없으면 낮은 것으로 보지 않음
+    return confidence is not None and confidence < LOW_CONFIDENCE_THRESHOLD
+
+async def verify_low_confidence_foods(result: dict, image_data: bytes) -> dict:
+    """1차 분석에서 확신도가 낮은 음식만 잘라낸 영역으로 동시에 재검증"""
+    items = result.get('food_items')
+    if not isinstance(items, list) or not items:
+        # bbox 정보가 없으면 detected_foods로 항목을 구성 (확신도가 없으므로 일반적/빈 항목만 재검증)
+        items = [{"name": food} for food in result.get('detected_foods', []) if isinstance(food, str)]
+        if not items:
+            items = [{"name": ""}]
+    items = [item for item in items if isinstance(item, dict)]
+
+    targets, full_image_checks = [], 0
+    for item in items:
+        if not _needs_verification(item):
+            continue
+        if not _has_bbox(item):
+            # bbox가 없으면 전체 이미지로 검증하므로 최대 한 번만
+            if full_image_checks:
+                continue
+            full_image_checks += 1
+        targets.append(item)
+    targets = targets[:MAX_VERIFICATION_ITEMS]
+    if targets:
+        print(f"⚠️ 확신도 낮은 음식 {len(targets)}개를 잘라낸 영역으로 재검증합니다.")
+
+        async def verify(item):
+            region = image_data
+            if _has_bbox(item):
+                try:
+                    region = nutri_app.crop_image_region(image_data, item['bbox'])
+                except Exception as e:
+                    print(f"영역 자르기 실패, 전체 이미지 사용: {str(e)}")
+            prompt = korean_classifier.get_item_verification_prompt(item.get('name', ''))
+            return await asyncio.to_thread(
+                nutri_app.call_claude, FOOD_VERIFICATION_SYSTEM_PROMPT, prompt, region, FoodVerification,
+                "food_verification"
+            )
+
+        answers = await asyncio.gather(*(verify(item) for item in targets), return_exceptions=True)
+        for item, answer in zip(targets, answers):
+            if not isinstance(answer, dict):
+                continue
+            name = str(answer.get('food_name', '')).strip()
+            if not food_name_index.is_generic(name):
+                item['name'] = name
+                item['confidence'] = _parse_confidence(answer.get('confidence'))
+                item['verified'] = True
+        print(f"재검증 결과: {[item.get('name') for item in targets]}")
+
+    # 자유 텍스트 음식명을 표준 음식 ID로 정규화
+    for item in items:
+        item['food_id'] = food_name_index.resolve(str(item.get('name', '')))
+
+    result['food_items'] = items
+    result['detected_foods'] = [
+        item['name'] for item in items
+        if not food_name_index.is_generic(str(item.get('name', '')))
+    ]
+    result['food_ids'] = [item['food_id'] for item in items if item['food_id']]
+    return result
+
+def build_meal_nutrition_summary(result: dict, user_info) -> dict:
+    """인식된 음식과 양으로 영양소 합계와 부족 영양소를 로컬 DB에서 계산"""
+    items = result.get('food_items') or result.get('detected_foods', [])
+    totals = nutrition_db.compute_meal_totals(items)
+    nutrients = totals['nutrients']
+    lacking = nutrition_db.find_lacking_nutrient(nutrients, user_info.gender)
+
+    if lacking:
+        content = (f"{user_info.name}님, 이번 식사는 약 {nutrients['calories']:.0f}kcal이며 "
+                   f"{lacking['name']}이(가) 부족합니다.")
+    else:
+        content = (f"{user_info.name}님, 이번 식사는 약 {nutrients['calories']:.0f}kcal로 "
+                   f"주요 영양소가 고르게 들어있어요.")
+
+    return {
+        "nutrients": nutrients,
+        "calories": totals['calories'],
+        "unmatched_foods": totals['unmatched_foods'],
+        "content": content,
+        "recommended_nutrient": lacking['name'] if lacking else "",
+        "action_plan": lacking['action_plan'] if lacking else "지금처럼 골고루 드세요.",
+    }
+
 # Pydantic 모델들
 class UserInfo(BaseModel):
     name: str
@@ -239,6 +583,7 @@ class UserInfo(BaseModel):
 class HealthCheckupRequest(BaseModel):
     user_info: UserInfo
     checkup_text: str
+    fast_mode: bool = False  # True면 규칙 판정만 사용 (Claude 호출 없음)
 
 class MealAnalysisRequest(BaseModel):
     user_info: UserInfo
@@ -264,23 +609,43 @@ async def analyze_checkup(request: HealthCheckupRequest):
     try:
         print(f"건강검진 분석 요청 받음: {request.user_info.name}")
         
+        # 수치는 규칙으로 먼저 판정 (fast_mode면 Claude 없이 바로 응답하고, 판정하지 못한 수치/소견을 안내)
+        # 그 외에는 짧은 소견("요단백 양성")이나 규칙에 없는 수치도 놓치지 않도록 항상 Claude로 해석
+        interpretation = interpret_checkup(request.checkup_text, request.user_info.height, request.user_info.weight)
+        if request.fast_mode:
+            result = build_checkup_result(interpretation, request.user_info.name)
+            result["source"] = "rules"
+            print(f"규칙 판정 결과: {result['status']} ({result['analysis_logic']})")
+            return {"success": True, "data": result}
+        
+        checkup_text = request.checkup_text
+        if interpretation["metrics"]:
+            checkup_text += f"\n(수치 판정: {format_metrics(interpretation['metrics'])})"
         user_vars = {
             "name": request.user_info.name,
             "age": str(request.user_info.age),
             "gender": request.user_info.gender,
             "height": str(request.user_info.height),
             "weight": str(request.user_info.weight),
-            "checkup_text": request.checkup_text
+            "checkup_text": checkup_text
         }
         
         print(f"사용자 변수: {user_vars}")
         
-        system_prompt = nutri_app.load_prompt("checkup_expert.txt", user_vars)
+        system_prompt = nutri_app.load_prompt_parts("checkup_expert.txt", user_vars)
         print("프롬프트 로드 완료")
         
-        result = nutri_app.call_claude(system_prompt, "제공된 검진 수치를 바탕으로 상태를 분석해주세요.")
+        result = nutri_app.call_claude(
+            system_prompt, "제공된 검진 수치를 바탕으로 상태를 분석해주세요.", schema=CheckupAnalysis,
+            task="checkup_text", input_chars=len(request.checkup_text)
+        )
         print(f"Claude 호출 결과: {result}")
         
+        # 수치 판정은 규칙 결과가 기준 (서술에서 더 나쁜 소견이 나오면 그쪽을 따름)
+        if interpretation["metrics"]:
+            result["metrics"] = interpretation["metrics"]
+            result["status"] = worse(interpretation["status"], result.get("status"))
+        result["source"] = "llm"
         return {"success": True, "data": result}
     except Exception as e:
         print(f"건강검진 분석 오류: {str(e)}")
@@ -307,15 +672,14 @@ async def analyze_meal(request: MealAnalysisRequest):
         
         print(f"사용자 변수: {user_vars}")
         
-        system_prompt = nutri_app.load_prompt("meal_vision_coach.txt", user_vars)
-        
-        # 정교한 한국 음식 분류 프롬프트 사용
+        # 정교한 한국 음식 분류 프롬프트는 고정 시스템 블록으로 함께 캐시
         detailed_classification = korean_classifier.get_detailed_classification_prompt()
+        system_prompt = nutri_app.load_prompt_parts(
+            "meal_vision_coach.txt", user_vars, extra_static=(detailed_classification,)
+        )
         
         user_message = f"""
-{detailed_classification}
-
-이 식단 사진을 위의 정교한 분류 기준에 따라 매우 정확히 분석해주세요.
+이 식단 사진을 시스템 프롬프트의 정교한 분류 기준에 따라 매우 정확히 분석해주세요.
 
 **단계별 분석:**
 1. 각 음식의 색깔을 정확히 관찰
@@ -333,59 +697,31 @@ async def analyze_meal(request: MealAnalysisRequest):
 JSON 형식으로 응답:
 {{
   "analysis_logic": "각 음식별 색깔, 모양, 재료 분석 과정",
-  "detected_foods": ["정교하게 분류된 정확한 한국 음식명"],
-  "visual_details": "각 음식의 시각적 특징 설명",
-  "content": "{request.user_info.name}님의 식단 분석 결과",
-  "recommended_nutrient": "가장 부족한 영양소",
-  "action_plan": "다음 식사에 추가할 구체적인 음식"
+  "food_items": [
+    {{
+      "name": "정교하게 분류된 정확한 한국 음식명",
+      "bbox": [0.0, 0.0, 0.0, 0.0],
+      "confidence": 0.0,
+      "portion": 1.0
+    }}
+  ],
+  "detected_foods": ["정교하게 분류된 정확한 한국 음식명"]
 }}
-"""
-        
-        result = nutri_app.call_claude(system_prompt, user_message, image_data)
-        print(f"1차 Claude Vision 분석 결과: {result}")
-        
-        # 분석 결과 검증 및 재시도 로직
-        if result and isinstance(result, dict):
-            detected_foods = result.get('detected_foods', [])
-            
-            # 일반적인 라벨이나 부정확한 분류 감지
-            generic_terms = ['Food', 'Meal', 'Dish', '음식', '식사', '요리']
-            inaccurate_classification = any(food in generic_terms for food in detected_foods)
-            
-            if not detected_foods or inaccurate_classification:
-                print("⚠️ 부정확한 분류 감지. 검증 질문으로 재분석합니다.")
-                
-                # 검증 질문을 통한 재분석
-                verification_questions = korean_classifier.get_verification_questions()
-                
-                retry_message = f"""
-이전 분석이 부정확했습니다. 다음 검증 질문에 답하면서 다시 정확히 분석해주세요:
 
-{chr(10).join([f"{i+1}. {q}" for i, q in enumerate(verification_questions)])}
+- bbox: 사진 전체를 1로 보았을 때 음식 영역의 [왼쪽 x, 위쪽 y, 너비, 높이] 비율
+- confidence: 해당 음식 분류에 대한 확신도 (0~1)
+- portion: 1인분 대비 양 (예: 반 공기=0.5, 한 공기=1.0)
+- 영양소는 서버에서 계산하므로 추정하지 마세요.
+"""
 
-**재분석 지침:**
-- 김치 vs 깍두기: 모양 확인 (길쭉한 잎=김치, 정사각형 조각=깍두기)
-- 된장국 vs 미역국: 국물 색깔 (갈색 탁함=된장국, 맑음+검은미역=미역국)
-- 오징어콩나물볶음 vs 콩나물볶음: 오징어 유무 확인
-- 시금치나물 vs 기타 나물: 색깔과 잎 모양 확인
+        result = nutri_app.call_claude(system_prompt, user_message, image_data, MealVisionResult, "meal_vision")
+        print(f"1차 Claude Vision 분석 결과: {result}")
 
-각 검증 질문에 대한 답변과 함께 정확한 음식명을 다시 분류해주세요.
+        # 확신도가 낮은 음식만 잘라낸 영역으로 재검증
+        if result and isinstance(result, dict):
+            result = await verify_low_confidence_foods(result, image_data)
+            result.update(build_meal_nutrition_summary(result, request.user_info))
 
-JSON 형식으로 응답:
-{{
-  "verification_answers": ["각 질문에 대한 답변"],
-  "corrected_analysis": "수정된 분석 과정",
-  "detected_foods": ["재검증된 정확한 음식명"],
-  "confidence_score": "분류 확신도 (1-10)",
-  "content": "수정된 분석 결과",
-  "recommended_nutrient": "부족한 영양소",
-  "action_plan": "권장사항"
-}}
-"""
-                
-                result = nutri_app.call_claude(system_prompt, retry_message, image_data)
-                print(f"재검증 분석 결과: {result}")
-        
         return {"success": True, "data": result}
     except Exception as e:
         print(f"식단 분석 오류: {str(e)}")
@@ -395,66 +731,27 @@ JSON 형식으로 응답:
 
 @app.post("/api/recommend-supplements-fast")
 async def recommend_supplements_fast(request: SupplementRecommendationRequest):
-    """빠른 영양제 추천 (기본 추천 제공)"""
+    """빠른 영양제 추천 (미리 계산한 연령대/성별/권장 영양소 버킷 조회)"""
     try:
         print(f"빠른 영양제 추천 요청 받음: {request.user_info.name}")
         
-        # 기본 영양제 추천 로직
-        age = request.user_info.age
-        gender = request.user_info.gender
-        
-        basic_supplements = []
-        
-        # 나이별 기본 추천
-        if age >= 65:
-            basic_supplements.extend([
-                {
-                    "name": "비타민D",
-                    "reason": "뼈 건강과 면역력 강화를 위해 필요합니다",
-                    "dosage": "1000IU",
-                    "schedule": {"time": "아침", "timing": "식후"}
-                },
-                {
-                    "name": "칼슘",
-                    "reason": "골다공증 예방을 위해 필요합니다",
-                    "dosage": "500mg",
-                    "schedule": {"time": "저녁", "timing": "식후"}
-                }
-            ])
-        else:
-            basic_supplements.append({
-                "name": "비타민D",
-                "reason": "면역력 강화를 위해 필요합니다",
-                "dosage": "1000IU",
-                "schedule": {"time": "아침", "timing": "식후"}
-            })
-        
-        # 성별별 추가 추천
-        if gender == "남성":
-            basic_supplements.append({
-                "name": "오메가3",
-                "reason": "심혈관 건강을 위해 필요합니다",
-                "dosage": "1000mg",
-                "schedule": {"time": "저녁", "timing": "식후"}
-            })
-        else:
-            basic_supplements.append({
-                "name": "철분",
-                "reason": "빈혈 예방을 위해 필요합니다",
-                "dosage": "18mg",
-                "schedule": {"time": "아침", "timing": "식후"}
-            })
+        bucket = find_bucket(
+            request.user_info.age, request.user_info.gender,
+            request.checkup_result.get('recommended_nutrient', ''), request.meal_result.get('recommended_nutrient', '')
+        )
+        considered = "나이와 성별, 검진 결과" if bucket.nutrient else "나이와 성별"
         
         result = {
-            "content": f"{request.user_info.name}님의 나이와 성별을 고려한 기본 영양제를 추천드립니다.",
+            "content": f"{request.user_info.name}님의 {considered}를 고려한 기본 영양제를 추천드립니다.",
             "status": "Green",
-            "supplement_list": basic_supplements,
-            "special_caution": "현재 복용 중인 약물이 있다면 의사와 상담 후 복용하세요.",
+            "supplement_list": bucket.supplement_list,
+            "special_caution": bucket.special_caution,
             "rag_info": {
                 "context_sources": 0,
                 "safety_checks": 0,
                 "database_used": False,
-                "fast_mode": True
+                "fast_mode": True,
+                "bucket": {"age_band": bucket.age_band, "gender": bucket.gender, "nutrient": bucket.nutrient}
             }
         }
         
@@ -469,47 +766,18 @@ async def recommend_supplements(request: SupplementRecommendationRequest):
     try:
         print(f"영양제 추천 요청 받음: {request.user_info.name}")
         
-        # RAG 시스템에서 관련 정보 검색
-        search_queries = [
-            request.checkup_result.get('recommended_nutrient', ''),
-            request.meal_result.get('recommended_nutrient', ''),
-            f"{request.user_info.age}세 {request.user_info.gender}",
-            "영양제 추천"
-        ]
-        
-        print(f"검색 쿼리: {search_queries}")
-        
-        rag_context = ""
-        for query in search_queries:
-            if query.strip():
-                results = rag_system.search_similar_documents(query, top_k=3)
-                for doc in results:
-                    content = doc.get('content', doc.get('full_text', ''))
-                    if content:
-                        rag_context += f"[{doc.get('name', 'Unknown')}] {content[:200]}...\n"
-        
-        print(f"RAG 컨텍스트 길이: {len(rag_context)}")
-        
-        # 안전성 정보 (추천할 영양제 목록 기반)
-        potential_supplements = ['비타민D', '칼슘', '오메가3', '마그네슘']
-        safety_info = rag_system.get_safety_information(potential_supplements)
-        print(f"안전성 정보 길이: {len(safety_info)}")
-        
-        # 상호작용 정보
-        interaction_info = rag_system.get_supplement_interactions(potential_supplements)
-        print(f"상호작용 정보 개수: {len(interaction_info)}")
+        # 버킷 검색어(연령대/성별/영양소)와 안전성/상호작용 정보는 캐시된 RAG 결과 재사용
+        nutrients = (request.checkup_result.get('recommended_nutrient', ''), request.meal_result.get('recommended_nutrient', ''))
+        bucket = find_bucket(request.user_info.age, request.user_info.gender, *nutrients)
+        comprehensive_context, context_sources, safety_checks = await asyncio.to_thread(
+            recommendation_cache.context, bucket, *nutrients
+        )
+        print(f"RAG 컨텍스트 길이: {len(comprehensive_context)} (문서 {context_sources}개, 상호작용 {safety_checks}개)")
         
-        # 종합 RAG 컨텍스트 구성
-        comprehensive_context = f"""
-=== 영양제 추천 데이터베이스 정보 ===
-{rag_context}
-
-=== 안전성 정보 ===
-{safety_info}
-
-=== 상호작용 정보 ===
-{'; '.join([f"{item['supplement']}: {item['interaction_info']}" for item in interaction_info[:3]])}
-"""
+        # 검진 수치 판정이 있으면 요약과 함께 그대로 전달
+        checkup_summary = request.checkup_result.get('content', '')
+        if isinstance(request.checkup_result.get('metrics'), dict):
+            checkup_summary += f" [{format_metrics(request.checkup_result['metrics'])}]"
         
         user_vars = {
             "name": request.user_info.name,
@@ -517,7 +785,7 @@ async def recommend_supplements(request: SupplementRecommendationRequest):
             "gender": request.user_info.gender,
             "height": str(request.user_info.height),
             "weight": str(request.user_info.weight),
-            "checkup_analysis_result": request.checkup_result.get('content', ''),
+            "checkup_analysis_result": checkup_summary,
             "meal_analysis_result": request.meal_result.get('content', ''),
             "retrieved_context": comprehensive_context  # RAG 컨텍스트 사용
         }
@@ -525,55 +793,31 @@ async def recommend_supplements(request: SupplementRecommendationRequest):
         try:
             print(f"사용자 변수 준비 완료")
             
-            system_prompt = nutri_app.load_prompt("final_supplement_expert.txt", user_vars)
+            system_prompt = nutri_app.load_prompt_parts("final_supplement_expert.txt", user_vars)
             print("프롬프트 로드 완료")
             
-            result = nutri_app.call_claude(system_prompt, "모든 데이터를 통합하여 최적의 영양제 스케줄을 설계해주세요.")
+            result = nutri_app.call_claude(
+                system_prompt, "모든 데이터를 통합하여 최적의 영양제 스케줄을 설계해주세요.", schema=SupplementPlan,
+                task="supplement_plan"
+            )
             print(f"Claude 호출 결과: {result}")
             
             # API 호출 실패 시 기본 응답인지 확인
             if "AI 서버가 과부하" in result.get('content', ''):
-                # 기본 영양제 추천 로직
-                age = request.user_info.age
-                gender = request.user_info.gender
-                
-                basic_supplements = []
-                if age >= 65:
-                    basic_supplements.extend([
-                        {
-                            "name": "비타민D",
-                            "reason": "뼈 건강과 면역력 강화를 위해 필요합니다",
-                            "dosage": "1000IU",
-                            "schedule": {"time": "아침", "timing": "식후"}
-                        },
-                        {
-                            "name": "칼슘",
-                            "reason": "골다공증 예방을 위해 필요합니다",
-                            "dosage": "500mg",
-                            "schedule": {"time": "저녁", "timing": "식후"}
-                        }
-                    ])
-                
-                if gender == "남성":
-                    basic_supplements.append({
-                        "name": "오메가3",
-                        "reason": "심혈관 건강을 위해 필요합니다",
-                        "dosage": "1000mg",
-                        "schedule": {"time": "아침", "timing": "식후"}
-                    })
-                
+                # 미리 계산한 버킷의 기본 영양제 추천
                 result = {
                     "content": f"{request.user_info.name}님의 나이와 성별을 고려한 기본 영양제를 추천드립니다. AI 서버 과부하로 상세 분석은 나중에 다시 시도해주세요.",
                     "status": "Yellow",
-                    "supplement_list": basic_supplements,
-                    "special_caution": "현재 복용 중인 약물이 있다면 의사와 상담 후 복용하세요."
+                    "supplement_list": bucket.supplement_list,
+                    "special_caution": bucket.special_caution
                 }
             
             # RAG 메타데이터 추가
             result["rag_info"] = {
-                "context_sources": len(rag_context.split('\n')),
-                "safety_checks": len(interaction_info),
-                "database_used": True
+                "context_sources": context_sources,
+                "safety_checks": safety_checks,
+                "database_used": True,
+                "rag_ready": rag_system.is_ready  # False면 인덱스 로드 중이라 키워드 검색 결과 사용
             }
             
             return {"success": True, "data": result}
@@ -601,35 +845,80 @@ async def recommend_supplements(request: SupplementRecommendationRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+# ==================== 헬스 체크 ====================
+# 의존성 점검은 health_monitor가 백그라운드에서 주기적으로 실행하고, 엔드포인트는 캐시된 결과만 반환
+
+def probe_sts():
+    identity = sts_breaker.call(get_client("sts").get_caller_identity)
+    return {"account": identity.get('Account', 'Unknown')}
+
+def probe_bedrock():
+    # 호출 차단 중이면 장애로 판단 (메타데이터 조회는 요금이 없는 제어 API)
+    if converse_breaker.state == "open":
+        raise RuntimeError(f"bedrock_converse 서킷 열림: {converse_breaker.last_error}")
+    model = get_client("bedrock").get_foundation_model(modelIdentifier=nutri_app.model_id)
+    return {"model_id": nutri_app.model_id, "lifecycle": model.get("modelDetails", {}).get("modelLifecycle", {}).get("status")}
+
+def probe_faiss():
+    if not rag_system.is_ready:
+        raise RuntimeError(f"FAISS 인덱스 {rag_system.state} (키워드 검색으로 대체)")
+    return {"total_documents": len(rag_system.metadata)}
+
+def probe_startup():
+    # 테이블 생성 전에는 DB 요청이 실패하므로 트래픽을 받지 않음 (RAG는 폴백이 있어 기다리지 않음)
+    if startup_steps["tables"]["status"] != "done":
+        raise RuntimeError(f"테이블 생성 {startup_steps['tables']['status']}")
+    return {"steps": {name: dict(step) for name, step in startup_steps.items()}}
+
+health_monitor.register("startup", probe_startup, required=True)
+health_monitor.register("database", ping_database, required=True)
+health_monitor.register("sts", probe_sts)
+health_monitor.register("bedrock", probe_bedrock)
+health_monitor.register("faiss", probe_faiss)
+
+@app.get("/livez")
+async def liveness():
+    """프로세스 생존 확인 (I/O 없음, Docker HEALTHCHECK용)"""
+    return {"status": "alive"}
+
+@app.get("/readyz")
+async def readiness():
+    """트래픽을 받을 준비가 됐는지 (캐시된 의존성 점검 결과, 필수 점검 실패 시 503)"""
+    snapshot = health_monitor.snapshot()
+    return ORJSONResponse(snapshot, status_code=200 if health_monitor.ready else 503)
+
 @app.get("/api/health")
 async def health_check():
-    """서버 상태 확인"""
-    try:
-        # AWS 연결 테스트
-        sts = nutri_app.session.client('sts')
-        identity = sts.get_caller_identity()
-        
-        # RAG 시스템 상태 확인
-        rag_status = {
-            "faiss_loaded": rag_system.index is not None,
-            "metadata_loaded": rag_system.metadata is not None and len(rag_system.metadata) > 0,
-            "total_documents": len(rag_system.metadata) if rag_system.metadata else 0
-        }
-        
-        return {
-            "status": "healthy",
-            "aws_connected": True,
-            "aws_account": identity.get('Account', 'Unknown'),
-            "rag_system": rag_status,
-            "message": "모든 시스템이 정상 작동 중입니다."
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "aws_connected": False,
-            "error": str(e),
-            "rag_system": {"faiss_loaded": False, "metadata_loaded": False}
-        }
+    """서버 상태 확인 (캐시된 의존성 점검 결과 + 내부 통계)"""
+    checks = health_monitor.results
+    sts_check = checks.get("sts", {})
+    faiss_check = checks.get("faiss", {})
+    status = health_monitor.status
+    
+    rag_status = {
+        "state": rag_system.state,
+        "faiss_loaded": rag_system.index is not None,
+        "metadata_loaded": rag_system.metadata is not None and len(rag_system.metadata) > 0,
+        "total_documents": faiss_check.get("total_documents", len(rag_system.metadata) if rag_system.metadata else 0)
+    }
+    
+    return {
+        "status": "healthy" if status == "ready" else status,
+        "aws_connected": sts_check.get("ok", False),
+        "aws_account": sts_check.get("account"),
+        "checks": health_monitor.snapshot(),
+        "rag_system": rag_status,
+        "bedrock_usage": nutri_app.usage_stats,
+        "prompt_cache": nutri_app.prompt_cache_status(),
+        "model_routing": nutri_app.router.stats,
+        "recommendation_cache": recommendation_cache.stats,
+        "circuit_breakers": breaker_status(),
+        "aws_clients": client_status(),
+        "database_pool": pool_status(),
+        "async_database_pool": pool_status(async_engine.sync_engine),
+        "latest_record_cache": latest_record_cache.stats,
+        "message": "모든 시스템이 정상 작동 중입니다." if status == "ready" else "일부 의존성 점검에 실패했습니다."
+    }
 
 @app.post("/api/fact-check-youtube")
 async def fact_check_youtube(request: YouTubeFactCheckRequest):
@@ -649,46 +938,21 @@ async def fact_check_youtube(request: YouTubeFactCheckRequest):
             print(f"유튜브 비디오 ID 발견: {video_id}")
             # 실제 유튜브 자막 가져오기
             try:
-                from youtube_transcript_api import YouTubeTranscriptApi
-                
                 print("자막 가져오기 시도 중...")
-                # 자막 가져오기
-                transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+                # 유튜브 장애로 서킷이 열려 있으면 바로 기본 메시지로 처리
+                full_transcript = await asyncio.to_thread(youtube_breaker.call, fetch_youtube_transcript, video_id)
+                print(f"자막 길이: {len(full_transcript)} 문자")
                 
-                # 한국어 자막 우선, 없으면 영어
-                transcript = None
-                try:
-                    transcript = transcript_list.find_generated_transcript(['ko'])
-                    print("한국어 자동 생성 자막 발견")
-                except:
-                    try:
-                        transcript = transcript_list.find_transcript(['ko'])
-                        print("한국어 수동 자막 발견")
-                    except:
-                        try:
-                            transcript = transcript_list.find_generated_transcript(['en'])
-                            print("영어 자동 생성 자막 발견")
-                        except:
-                            transcript = transcript_list.find_transcript(['en'])
-                            print("영어 수동 자막 발견")
-                
-                if transcript:
-                    transcript_data = transcript.fetch()
-                    full_transcript = ' '.join([item.text for item in transcript_data])
-                    print(f"자막 길이: {len(full_transcript)} 문자")
+                # 너무 긴 자막은 처음 2000자만 사용
+                if len(full_transcript) > 2000:
+                    full_transcript = full_transcript[:2000] + "..."
                     
-                    # 너무 긴 자막은 처음 2000자만 사용
-                    if len(full_transcript) > 2000:
-                        full_transcript = full_transcript[:2000] + "..."
-                        
-                    video_info = {
-                        "title": f"유튜브 영상 (ID: {video_id})",
-                        "description": "자막에서 추출한 내용",
-                        "transcript": full_transcript
-                    }
-                    print("자막 추출 성공")
-                else:
-                    raise Exception("자막을 찾을 수 없습니다.")
+                video_info = {
+                    "title": f"유튜브 영상 (ID: {video_id})",
+                    "description": "자막에서 추출한 내용",
+                    "transcript": full_transcript
+                }
+                print("자막 추출 성공")
                     
             except Exception as e:
                 print(f"자막 추출 실패: {str(e)}")
@@ -753,28 +1017,21 @@ async def fact_check_youtube(request: YouTubeFactCheckRequest):
 }}
 """
         
-        response = nutri_app.bedrock.converse(
-            modelId=nutri_app.model_id,
-            messages=[{"role": "user", "content": [{"text": fact_check_prompt}]}]
-        )
-        
-        raw_text = response['output']['message']['content'][0]['text']
-        print(f"Claude 응답 길이: {len(raw_text)}")
-        
         try:
-            if "```json" in raw_text:
-                json_text = raw_text.split("```json")[1].split("```")[0].strip()
-            else:
-                start_idx = raw_text.find("{")
-                end_idx = raw_text.rfind("}") + 1
-                json_text = raw_text[start_idx:end_idx]
-            result = json.loads(json_text)
+            # 영상 자막은 대형 모델, 사용자가 입력한 짧은 텍스트는 소형 모델 우선
+            result = nutri_app.routed_converse(
+                "video_fact_check" if video_id else "text_fact_check",
+                [{"role": "user", "content": [{"text": fact_check_prompt}]}], schema=VideoFactCheck,
+                input_chars=len(video_info["transcript"])
+            )
             print("JSON 파싱 성공")
-        except Exception as parse_error:
-            print(f"JSON 파싱 실패: {parse_error}")
+        except (StructuredOutputError, CircuitOpenError, ClientError, BotoCoreError) as e:
+            # 형식 오류는 원문을, Bedrock 장애/서킷 열림은 안내 문구를 그대로 보여줌 (call_claude와 같은 기본 응답)
+            print(f"팩트체크 분석 실패: {e}")
             result = {
                 "overall_credibility": "보통",
-                "fact_check_result": raw_text,
+                "fact_check_result": e.raw_text if isinstance(e, StructuredOutputError)
+                else "현재 AI 서버 사용량이 많습니다. 잠시 후 다시 시도해주세요.",
                 "verified_claims": [],
                 "questionable_claims": [],
                 "recommendations": "전문의와 상담하세요.",
@@ -793,6 +1050,33 @@ async def fact_check_youtube(request: YouTubeFactCheckRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+def fetch_youtube_transcript(video_id: str) -> str:
+    """유튜브 자막 전체 텍스트 (한국어 우선, 없으면 영어)"""
+    from youtube_transcript_api import YouTubeTranscriptApi
+    
+    transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+    
+    transcript = None
+    try:
+        transcript = transcript_list.find_generated_transcript(['ko'])
+        print("한국어 자동 생성 자막 발견")
+    except:
+        try:
+            transcript = transcript_list.find_transcript(['ko'])
+            print("한국어 수동 자막 발견")
+        except:
+            try:
+                transcript = transcript_list.find_generated_transcript(['en'])
+                print("영어 자동 생성 자막 발견")
+            except:
+                transcript = transcript_list.find_transcript(['en'])
+                print("영어 수동 자막 발견")
+    
+    if not transcript:
+        raise Exception("자막을 찾을 수 없습니다.")
+    transcript_data = transcript.fetch()
+    return ' '.join([item.text for item in transcript_data])
+
 def extract_video_id(url: str) -> str:
     """유튜브 URL에서 비디오 ID 추출"""
     import re
@@ -819,41 +1103,6 @@ def extract_health_claims(text: str) -> list:
     
     return claims if claims else ["일반 건강 정보"]
 
-@app.get("/api/health")
-async def health_check():
-    """서버 상태 확인"""
-    try:
-        # AWS 연결 상태 확인
-        aws_connected = False
-        aws_account = None
-        try:
-            sts = nutri_app.session.client('sts', region_name='us-east-1')
-            identity = sts.get_caller_identity()
-            aws_connected = True
-            aws_account = identity.get('Account')
-        except Exception:
-            pass
-        
-        # RAG 시스템 상태 확인
-        rag_status = {
-            "faiss_loaded": rag_system.index is not None,
-            "metadata_loaded": rag_system.metadata is not None,
-            "total_documents": len(rag_system.metadata) if rag_system.metadata else 0
-        }
-        
-        return {
-            "status": "healthy",
-            "aws_connected": aws_connected,
-            "aws_account": aws_account,
-            "rag_system": rag_status,
-            "message": "모든 시스템이 정상 작동 중입니다."
-        }
-    except Exception as e:
-        return {
-            "status": "error",
-            "message": str(e)
-        }
-
 @app.post("/api/analyze-checkup-image")
 async def analyze_checkup_image(request: MealAnalysisRequest):
     """건강검진 이미지 분석"""
@@ -868,10 +1117,11 @@ async def analyze_checkup_image(request: MealAnalysisRequest):
             "age": str(request.user_info.age),
             "gender": request.user_info.gender,
             "height": str(request.user_info.height),
-            "weight": str(request.user_info.weight)
+            "weight": str(request.user_info.weight),
+            "checkup_text": "첨부된 건강검진 결과 이미지"
         }
         
-        system_prompt = nutri_app.load_prompt("checkup_expert.txt", user_vars)
+        system_prompt = nutri_app.load_prompt_parts("checkup_expert.txt", user_vars)
         
         user_message = """
 이 건강검진 결과 이미지를 분석해주세요.
@@ -888,9 +1138,20 @@ JSON 형식으로 응답:
 }
 """
         
-        result = nutri_app.call_claude(system_prompt, user_message, image_data)
+        result = nutri_app.call_claude(system_prompt, user_message, image_data, CheckupImageAnalysis, "checkup_image")
         print(f"건강검진 이미지 분석 결과: {result}")
         
+        # 이미지에서 읽은 수치도 같은 규칙으로 판정
+        extracted = result.get("extracted_values")
+        if isinstance(extracted, dict) and extracted:
+            interpretation = interpret_checkup(
+                ", ".join(f"{key} {value}" for key, value in extracted.items()),
+                request.user_info.height, request.user_info.weight
+            )
+            if interpretation["recognized"]:
+                result["metrics"] = interpretation["metrics"]
+                result["status"] = worse(interpretation["status"], result.get("status"))
+        
         return {"success": True, "data": result}
     except Exception as e:
         print(f"건강검진 이미지 분석 오류: {str(e)}")
@@ -945,7 +1206,10 @@ JSON 형식으로 응답:
 """
             
             try:
-                result = nutri_app.call_claude(system_prompt, "위 건강 정보를 분석해주세요.")
+                result = nutri_app.call_claude(
+                    system_prompt, "위 건강 정보를 분석해주세요.", schema=TextFactCheck,
+                    task="text_fact_check", input_chars=len(user_vars['query_text'])
+                )
                 print(f"텍스트 팩트체크 결과: {result}")
             except Exception as claude_error:
                 print(f"Claude 호출 오류: {claude_error}")
@@ -980,40 +1244,62 @@ async def search_supplements(query: str, limit: int = 5):
 
 # ==================== 데이터베이스 연동 API ====================
 
+def encode_json(data: dict) -> bytes:
+    """캐시에 보관할 JSON 응답 bytes"""
+    return orjson.dumps(data)
+
+async def user_etag(request: Request, db: AsyncSession, user_id: str) -> Tuple[int, str]:
+    """사용자 데이터 버전 + 요청 경로/파라미터로 ETag 생성 (기록이 바뀌면 값이 바뀜)
+    
+    버전은 DB의 last_seq라 모든 워커가 같은 값을 보므로 응답 캐시 키/검증에도 사용합니다.
+    """
+    version = await AsyncDatabaseService.get_data_version(db, user_id)
+    return version, make_etag(version, request.url.path, request.url.query)
+
+def etag_headers(etag: str) -> dict:
+    # 매번 재검증하되 변경이 없으면 304로 본문 없이 응답
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """If-None-Match가 현재 ETag와 같으면 304 응답"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
+
 # 사용자 관리 API
 @app.post("/api/users")
-async def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """새 사용자 생성"""
     try:
-        db_user = DatabaseService.create_user(db, user.dict())
+        db_user = await AsyncDatabaseService.create_user(db, user.dict())
         return {
             "success": True,
-            "user_id": db_user.user_id,
+            "user_id": db_user["user_id"],
             "message": "사용자가 성공적으로 생성되었습니다."
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/users/{user_id}")
-async def get_user(user_id: str, db: Session = Depends(get_db)):
+async def get_user(user_id: str, db: AsyncSession = Depends(get_async_db)):
     """사용자 정보 조회"""
     try:
-        user = DatabaseService.get_user_by_id(db, user_id)
+        user = await AsyncDatabaseService.get_user_by_id(db, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
         
         return {
             "success": True,
             "user": {
-                "user_id": user.user_id,
-                "name": user.name,
-                "age": user.age,
-                "gender": user.gender,
-                "height": user.height,
-                "weight": user.weight,
-                "health_concerns": user.health_concerns,
-                "created_at": user.created_at.isoformat(),
-                "updated_at": user.updated_at.isoformat()
+                "user_id": user["user_id"],
+                "name": user["name"],
+                "age": user["age"],
+                "gender": user["gender"],
+                "height": user["height"],
+                "weight": user["weight"],
+                "health_concerns": user["health_concerns"],
+                "created_at": user["created_at"],
+                "updated_at": user["updated_at"]
             }
         }
     except HTTPException:
@@ -1022,10 +1308,10 @@ async def get_user(user_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.put("/api/users/{user_id}")
-async def update_user(user_id: str, user_update: UserUpdate, db: Session = Depends(get_db)):
+async def update_user(user_id: str, user_update: UserUpdate, db: AsyncSession = Depends(get_async_db)):
     """사용자 정보 업데이트"""
     try:
-        updated_user = DatabaseService.update_user(db, user_id, user_update.dict(exclude_unset=True))
+        updated_user = await AsyncDatabaseService.update_user(db, user_id, user_update.dict(exclude_unset=True))
         if not updated_user:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
         
@@ -1040,184 +1326,191 @@ async def update_user(user_id: str, user_update: UserUpdate, db: Session = Depen
 
 # 식사 기록 API
 @app.post("/api/users/{user_id}/meals")
-async def add_meal_record(user_id: str, meal: MealRecordCreate, db: Session = Depends(get_db)):
+async def add_meal_record(user_id: str, meal: MealRecordCreate, db: AsyncSession = Depends(get_async_db)):
     """식사 기록 추가"""
     try:
-        db_meal = DatabaseService.add_meal_record(db, user_id, meal.dict())
+        meal_id = await AsyncDatabaseService.add_meal_record(db, user_id, meal.dict())
         return {
             "success": True,
-            "meal_id": db_meal.id,
+            "meal_id": meal_id,
             "message": "식사 기록이 추가되었습니다."
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/users/{user_id}/meals")
-async def get_meals(user_id: str, date: Optional[str] = None, start_date: Optional[str] = None, 
-                   end_date: Optional[str] = None, db: Session = Depends(get_db)):
-    """식사 기록 조회"""
+async def get_meals(user_id: str, request: Request, date: Optional[str] = None, start_date: Optional[str] = None, 
+                   end_date: Optional[str] = None, fields: Optional[str] = None, cursor: Optional[str] = None,
+                   limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    """식사 기록 조회 (fields=id,date,calories 처럼 필요한 필드만 선택, cursor로 다음 페이지)"""
     try:
-        if date:
-            meals = DatabaseService.get_meals_by_date(db, user_id, date)
-        elif start_date and end_date:
-            meals = DatabaseService.get_meals_by_date_range(db, user_id, start_date, end_date)
-        else:
+        if not date and not (start_date and end_date):
             raise HTTPException(status_code=400, detail="date 또는 start_date, end_date를 제공해야 합니다.")
         
-        meal_list = []
-        for meal in meals:
-            meal_list.append({
-                "id": meal.id,
-                "date": meal.date,
-                "meal_type": meal.meal_type,
-                "foods": meal.foods,
-                "nutrients": meal.nutrients,
-                "calories": meal.calories,
-                "image_path": meal.image_path,
-                "ai_analysis": meal.ai_analysis,
-                "created_at": meal.created_at.isoformat()
-            })
+        _, etag = await user_etag(request, db, user_id)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
         
-        return {
+        page = await AsyncDatabaseService.list_meals(
+            db, user_id, date, start_date, end_date, fields, cursor, max(1, min(limit, 500)), raw_json=True
+        )
+        # JSON 컬럼이 Fragment로 들어 있으므로 jsonable_encoder를 거치지 않고 바로 응답
+        return ORJSONResponse({
             "success": True,
-            "meals": meal_list,
-            "total_count": len(meal_list)
-        }
+            "meals": page["items"],
+            "total_count": len(page["items"]),
+            "next_cursor": page["next_cursor"]
+        }, headers=etag_headers(etag))
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # 영양제 분석 API
 @app.post("/api/users/{user_id}/supplement-analysis")
-async def save_supplement_analysis(user_id: str, analysis: SupplementAnalysisCreate, db: Session = Depends(get_db)):
+async def save_supplement_analysis(user_id: str, analysis: SupplementAnalysisCreate, db: AsyncSession = Depends(get_async_db)):
     """영양제 분석 결과 저장"""
     try:
-        db_analysis = DatabaseService.save_supplement_analysis(db, user_id, analysis.dict())
+        analysis_id = await AsyncDatabaseService.save_supplement_analysis(db, user_id, analysis.dict())
         return {
             "success": True,
-            "analysis_id": db_analysis.id,
+            "analysis_id": analysis_id,
             "message": "영양제 분석 결과가 저장되었습니다."
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/users/{user_id}/supplement-analysis/latest")
-async def get_latest_supplement_analysis(user_id: str, db: Session = Depends(get_db)):
-    """최신 영양제 분석 결과 조회"""
-    try:
-        analysis = DatabaseService.get_latest_supplement_analysis(db, user_id)
+async def get_latest_supplement_analysis(user_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """최신 영양제 분석 결과 조회 (데이터 버전별 응답 캐시 사용)"""
+    async def load() -> bytes:
+        analysis = await AsyncDatabaseService.get_latest_supplement_analysis(db, user_id)
         if not analysis:
-            return {"success": True, "analysis": None}
+            return encode_json({"success": True, "analysis": None})
         
-        return {
+        return encode_json({
             "success": True,
             "analysis": {
-                "id": analysis.id,
-                "analysis_result": analysis.analysis_result,
-                "recommended_supplements": analysis.recommended_supplements,
-                "deficient_nutrients": analysis.deficient_nutrients,
-                "created_at": analysis.created_at.isoformat()
+                "id": analysis["id"],
+                "analysis_result": analysis["analysis_result"],
+                "recommended_supplements": analysis["recommended_supplements"],
+                "deficient_nutrients": analysis["deficient_nutrients"],
+                "created_at": analysis["created_at"]
             }
-        }
+        })
+    
+    try:
+        version, etag = await user_etag(request, db, user_id)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
+        
+        body = await latest_record_cache.get_or_load(latest_cache_key("supplement_analyses", user_id, version), load)
+        return Response(content=body, media_type="application/json", headers=etag_headers(etag))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # 건강검진 API
 @app.post("/api/users/{user_id}/health-checkups")
-async def save_health_checkup(user_id: str, checkup: HealthCheckupCreate, db: Session = Depends(get_db)):
+async def save_health_checkup(user_id: str, checkup: HealthCheckupCreate, db: AsyncSession = Depends(get_async_db)):
     """건강검진 결과 저장"""
     try:
-        db_checkup = DatabaseService.save_health_checkup(db, user_id, checkup.dict())
+        checkup_id = await AsyncDatabaseService.save_health_checkup(db, user_id, checkup.dict())
         return {
             "success": True,
-            "checkup_id": db_checkup.id,
+            "checkup_id": checkup_id,
             "message": "건강검진 결과가 저장되었습니다."
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/users/{user_id}/health-checkups/latest")
-async def get_latest_health_checkup(user_id: str, db: Session = Depends(get_db)):
-    """최신 건강검진 결과 조회"""
-    try:
-        checkup = DatabaseService.get_latest_health_checkup(db, user_id)
+async def get_latest_health_checkup(user_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """최신 건강검진 결과 조회 (데이터 버전별 응답 캐시 사용)"""
+    async def load() -> bytes:
+        checkup = await AsyncDatabaseService.get_latest_health_checkup(db, user_id)
         if not checkup:
-            return {"success": True, "checkup": None}
+            return encode_json({"success": True, "checkup": None})
         
-        return {
+        return encode_json({
             "success": True,
             "checkup": {
-                "id": checkup.id,
-                "checkup_date": checkup.checkup_date,
-                "checkup_data": checkup.checkup_data,
-                "ai_analysis": checkup.ai_analysis,
-                "status": checkup.status,
-                "image_path": checkup.image_path,
-                "created_at": checkup.created_at.isoformat()
+                "id": checkup["id"],
+                "checkup_date": checkup["checkup_date"],
+                "checkup_data": checkup["checkup_data"],
+                "ai_analysis": checkup["ai_analysis"],
+                "status": checkup["status"],
+                "image_path": checkup["image_path"],
+                "created_at": checkup["created_at"]
             }
-        }
+        })
+    
+    try:
+        version, etag = await user_etag(request, db, user_id)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
+        
+        body = await latest_record_cache.get_or_load(latest_cache_key("health_checkups", user_id, version), load)
+        return Response(content=body, media_type="application/json", headers=etag_headers(etag))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # 팩트체크 API
 @app.post("/api/users/{user_id}/fact-checks")
-async def save_fact_check(user_id: str, fact_check: FactCheckCreate, db: Session = Depends(get_db)):
+async def save_fact_check(user_id: str, fact_check: FactCheckCreate, db: AsyncSession = Depends(get_async_db)):
     """팩트체크 결과 저장"""
     try:
-        db_fact_check = DatabaseService.save_fact_check(db, user_id, fact_check.dict())
+        fact_check_id = await AsyncDatabaseService.save_fact_check(db, user_id, fact_check.dict())
         return {
             "success": True,
-            "fact_check_id": db_fact_check.id,
+            "fact_check_id": fact_check_id,
             "message": "팩트체크 결과가 저장되었습니다."
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/users/{user_id}/fact-checks")
-async def get_fact_check_history(user_id: str, limit: int = 15, db: Session = Depends(get_db)):
-    """팩트체크 기록 조회"""
+async def get_fact_check_history(user_id: str, limit: int = 15, fields: Optional[str] = None,
+                                 cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    """팩트체크 기록 조회 (fields로 필드 선택, cursor로 다음 페이지)"""
     try:
-        fact_checks = DatabaseService.get_fact_check_history(db, user_id, limit)
-        
-        fact_check_list = []
-        for fc in fact_checks:
-            fact_check_list.append({
-                "id": fc.id,
-                "query": fc.query,
-                "source_type": fc.source_type,
-                "credibility_score": fc.credibility_score,
-                "fact_check_result": fc.fact_check_result,
-                "created_at": fc.created_at.isoformat()
-            })
-        
-        return {
+        page = await AsyncDatabaseService.list_fact_checks(
+            db, user_id, fields, cursor, max(1, min(limit, 100)), raw_json=True
+        )
+        return ORJSONResponse({
             "success": True,
-            "fact_checks": fact_check_list,
-            "total_count": len(fact_check_list)
-        }
+            "fact_checks": page["items"],
+            "total_count": len(page["items"]),
+            "next_cursor": page["next_cursor"]
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # 복용 기록 API
 @app.post("/api/users/{user_id}/medications")
-async def add_medication_record(user_id: str, medication: MedicationRecordCreate, db: Session = Depends(get_db)):
+async def add_medication_record(user_id: str, medication: MedicationRecordCreate, db: AsyncSession = Depends(get_async_db)):
     """복용 기록 추가"""
     try:
-        db_medication = DatabaseService.add_medication_record(db, user_id, medication.dict())
+        medication_id = await AsyncDatabaseService.add_medication_record(db, user_id, medication.dict())
         return {
             "success": True,
-            "medication_id": db_medication.id,
+            "medication_id": medication_id,
             "message": "복용 기록이 추가되었습니다."
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.put("/api/users/{user_id}/medications/{date}/{medication_name}")
-async def update_medication_taken(user_id: str, date: str, medication_name: str, taken: bool, db: Session = Depends(get_db)):
+async def update_medication_taken(user_id: str, date: str, medication_name: str, taken: bool, db: AsyncSession = Depends(get_async_db)):
     """복용 상태 업데이트"""
     try:
-        updated_medication = DatabaseService.update_medication_taken(db, user_id, date, medication_name, taken)
+        updated_medication = await AsyncDatabaseService.update_medication_taken(db, user_id, date, medication_name, taken)
         if not updated_medication:
             raise HTTPException(status_code=404, detail="복용 기록을 찾을 수 없습니다.")
         
@@ -1227,54 +1520,71 @@ async def update_medication_taken(user_id: str, date: str, medication_name: str,
         }
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/users/{user_id}/medications")
-async def get_medication_records(user_id: str, date: str, db: Session = Depends(get_db)):
-    """복용 기록 조회"""
+async def get_medication_records(user_id: str, date: str, fields: Optional[str] = None, cursor: Optional[str] = None,
+                                 limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    """복용 기록 조회 (fields로 필드 선택, cursor로 다음 페이지)"""
     try:
-        medications = DatabaseService.get_medication_records_by_date(db, user_id, date)
-        
-        medication_list = []
-        for med in medications:
-            medication_list.append({
-                "id": med.id,
-                "date": med.date,
-                "medication_name": med.medication_name,
-                "dosage": med.dosage,
-                "taken": med.taken,
-                "taken_time": med.taken_time.isoformat() if med.taken_time else None,
-                "created_at": med.created_at.isoformat()
-            })
-        
+        page = await AsyncDatabaseService.list_medications(
+            db, user_id, date, fields, cursor, max(1, min(limit, 500)), raw_json=True
+        )
+        return ORJSONResponse({
+            "success": True,
+            "medications": page["items"],
+            "total_count": len(page["items"]),
+            "next_cursor": page["next_cursor"]
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# 일별 요약 API
+@app.get("/api/users/{user_id}/summary")
+async def get_daily_summary(user_id: str, start_date: str = Query(..., alias="from"),
+                            end_date: str = Query(..., alias="to"), db: AsyncSession = Depends(get_async_db)):
+    """기간별 하루 칼로리/영양소 합계와 복용률 (달력, 보호자 화면용)"""
+    try:
+        days = await AsyncDatabaseService.get_daily_summaries(db, user_id, start_date, end_date)
         return {
             "success": True,
-            "medications": medication_list,
-            "total_count": len(medication_list)
+            "days": days,
+            "total_count": len(days)
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # 통계 API
 @app.get("/api/users/{user_id}/statistics")
-async def get_user_statistics(user_id: str, db: Session = Depends(get_db)):
+async def get_user_statistics(user_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
     """사용자 데이터 통계"""
     try:
-        stats = DatabaseService.get_user_statistics(db, user_id)
-        return {
+        version, etag = await user_etag(request, db, user_id)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
+        
+        stats = await AsyncDatabaseService.get_user_statistics(db, user_id, version)
+        return ORJSONResponse({
             "success": True,
             "statistics": stats
-        }
+        }, headers=etag_headers(etag))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # 데이터 동기화 API
 @app.post("/api/users/{user_id}/sync")
-async def sync_user_data(user_id: str, sync_data: SyncData, db: Session = Depends(get_db)):
+async def sync_user_data(user_id: str, sync_data: SyncData, db: AsyncSession = Depends(get_async_db)):
     """클라이언트와 서버 데이터 동기화"""
     try:
-        result = DatabaseService.sync_user_data(db, user_id, sync_data.dict())
+        result = await AsyncDatabaseService.sync_user_data(db, user_id, sync_data.dict())
         return {
             "success": True,
             "sync_result": result,
@@ -1283,6 +1593,35 @@ async def sync_user_data(user_id: str, sync_data: SyncData, db: Session = Depend
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/users/{user_id}/changes")
+async def get_user_changes(user_id: str, since: int = 0, limit: int = 500, db: AsyncSession = Depends(get_async_db)):
+    """since 커서 이후 변경/삭제된 기록 조회 (델타 동기화)"""
+    try:
+        changes = await AsyncDatabaseService.get_changes(db, user_id, since, max(1, min(limit, 1000)))
+        return {
+            "success": True,
+            **changes
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.delete("/api/users/{user_id}/records/{table}/{record_id}")
+async def delete_user_record(user_id: str, table: str, record_id: int, db: AsyncSession = Depends(get_async_db)):
+    """기록 삭제 (다른 기기에는 삭제 기록으로 전달)"""
+    try:
+        if not await AsyncDatabaseService.delete_record(db, user_id, table, record_id):
+            raise HTTPException(status_code=404, detail="기록을 찾을 수 없습니다.")
+        return {
+            "success": True,
+            "message": "기록이 삭제되었습니다."
+        }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 if __name__ == "__main__":
     import uvicorn
     print("🚀 Senior Supplement API Server 시작 중...")
@@ -1,16 +1,17 @@
-import boto3
-import json
 import os
 import io
 from PIL import Image
+from aws_clients import get_client, get_session
+from prompt_templates import prompt_registry
+from structured_output import StructuredOutputError, parse_converse_response
 
 # [1] 클래스 정의
 class NutriScanApp:
     def __init__(self):
         # AWS 서비스 클라이언트 설정
-        self.session = boto3.Session()
-        self.bedrock = self.session.client(service_name='bedrock-runtime', region_name='us-east-1')
-        self.rekognition = self.session.client(service_name='rekognition', region_name='us-east-1')
+        self.session = get_session()
+        self.bedrock = get_client("converse")
+        self.rekognition = get_client("rekognition")
         
         # [TEXTRACT 주석 처리] 나중에 기능을 사용할 때 아래 줄의 주석을 해제하세요.
         # self.textract = self.session.client(service_name='textract', region_name='us-east-1')
@@ -19,20 +20,8 @@ class NutriScanApp:
 
     # NutriScanApp 클래스 내부의 메서드 수정
     def load_prompt(self, filename, variables):
-        """prompts 폴더 내의 텍스트 파일을 읽고 변수를 치환합니다."""
-        # 기존 "frontend" 대신 "prompts"로 경로 수정
-        filepath = os.path.join("prompts", filename) 
-
-        if not os.path.exists(filepath):
-            # 현재 실행 위치 확인을 위해 경로 포함 출력
-            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {os.path.abspath(filepath)}")
-
-        with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        for key, value in variables.items():
-            content = content.replace(f"{{{{{key}}}}}", str(value))
-        return content
+        """컴파일된 prompts 템플릿에 변수를 치환합니다."""
+        return prompt_registry.render(filename, variables)
 
 
     def analyze_food_with_rekognition(self, image_path):
@@ -74,19 +63,11 @@ class NutriScanApp:
             messages=[{"role": "user", "content": [{"text": user_message}]}]
         )
         
-        raw_text = response['output']['message']['content'][0]['text']
-        
         try:
-            if "```json" in raw_text:
-                json_text = raw_text.split("```json")[1].split("```")[0].strip()
-            else:
-                start_idx = raw_text.find("{")
-                end_idx = raw_text.rfind("}") + 1
-                json_text = raw_text[start_idx:end_idx]
-            return json.loads(json_text)
-        except Exception as e:
-            print(f"JSON 파싱 실패! 원문: {raw_text}")
-            raise e
+            return parse_converse_response(response)
+        except StructuredOutputError as e:
+            print(f"JSON 파싱 실패! 원문: {e.raw_text}")
+            raise
 
 # [2] 실행 로직
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+공유 boto3 클라이언트 팩토리
+
+NutriApp, RAGSystem, NutriScanApp이 각자 Session/클라이언트를 만들면 botocore 기본값
+(연결 풀 10개, 읽기 타임아웃 60초, legacy 재시도)을 쓰게 되어 동시 요청이 풀에서 막힙니다.
+용도별 프로필(타임아웃, 재시도 횟수)마다 클라이언트를 한 번만 만들어 모듈 간에 재사용합니다.
+"""
+import os
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+AWS_REGION = os.getenv("BEDROCK_REGION", "us-east-1")
+# asyncio.to_thread 기본 스레드 풀(최대 32)과 같은 동시 호출 수를 풀에서 막지 않도록
+MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "32"))
+RETRY_MODE = os.getenv("AWS_RETRY_MODE", "adaptive")
+
+
+class ClientProfile(NamedTuple):
+    service: str
+    connect_timeout: float
+    read_timeout: float
+    max_attempts: int           # 첫 호출 포함 총 시도 횟수
+
+
+# 용도별 타임아웃
+# converse는 사용자가 기다리는 요청이라 기존 기본값(60초)을 넘지 않게 하고 재시도는 1회만
+# (응답이 멈춘 호출이 몇 분씩 붙잡지 않고 서킷 브레이커/기본 응답으로 넘어가도록)
+PROFILES: Dict[str, ClientProfile] = {
+    "converse": ClientProfile("bedrock-runtime", 3, 60, 2),
+    "embeddings": ClientProfile("bedrock-runtime", 2, 10, 3),
+    "rekognition": ClientProfile("rekognition", 3, 30, 3),
+    "sts": ClientProfile("sts", 2, 5, 1),   # 헬스 체크용, 재시도 없이 빠르게 실패
+    "bedrock": ClientProfile("bedrock", 2, 5, 1),  # 모델 메타데이터 조회 (헬스 체크)
+}
+
+_session: Optional[boto3.Session] = None
+_clients: Dict[Tuple[str, str], object] = {}
+_lock = threading.Lock()  # boto3 Session의 클라이언트 생성은 스레드 안전하지 않음
+
+
+def client_config(profile: str) -> Config:
+    """프로필의 botocore Config (연결 풀, adaptive 재시도, 연결/읽기 타임아웃)"""
+    settings = PROFILES[profile]
+    return Config(
+        max_pool_connections=MAX_POOL_CONNECTIONS,
+        connect_timeout=settings.connect_timeout,
+        read_timeout=settings.read_timeout,
+        retries={"mode": RETRY_MODE, "total_max_attempts": settings.max_attempts},
+        tcp_keepalive=True,
+    )
+
+def get_session() -> boto3.Session:
+    global _session
+    with _lock:
+        if _session is None:
+            _session = boto3.Session()
+        return _session
+
+def get_client(profile: str, region_name: Optional[str] = None):
+    """프로필별 공유 클라이언트 (처음 요청할 때 생성)"""
+    region_name = region_name or AWS_REGION
+    key = (profile, region_name)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    session = get_session()
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = session.client(PROFILES[profile].service, region_name=region_name, config=client_config(profile))
+            _clients[key] = client
+        return client
+
+def client_status() -> dict:
+    """/api/health용 클라이언트 설정 요약"""
+    return {
+        "max_pool_connections": MAX_POOL_CONNECTIONS,
+        "retry_mode": RETRY_MODE,
+        "clients": {
+            f"{profile}@{region}": {
+                "connect_timeout": PROFILES[profile].connect_timeout,
+                "read_timeout": PROFILES[profile].read_timeout,
+                "max_attempts": PROFILES[profile].max_attempts,
+            }
+            for profile, region in list(_clients)
+        },
+    }
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+기록 목록 응답 직렬화 벤치마크
+
+팩트체크/식사 기록 목록 한 페이지를 조회해 응답 bytes로 만드는 시간을 비교합니다.
+- stdlib: JSON 컬럼 파싱 → jsonable_encoder → json.dumps (기존 JSONResponse 경로)
+- orjson: JSON 컬럼 파싱 → orjson.dumps
+- raw: JSON 컬럼을 텍스트로 읽어 orjson.Fragment로 그대로 삽입 (현재 API 경로)
+
+사용법: python benchmark_history_json.py [페이지 크기] [반복 횟수]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import orjson
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import sessionmaker
+from database import Base, create_db_engine
+from db_service import DatabaseService
+
+def make_fact_check(i: int) -> dict:
+    # 실제 팩트체크 결과와 비슷한 크기 (약 8KB)
+    return {
+        "query": f"홍삼이 혈압에 좋나요? {i}",
+        "source_type": "youtube",
+        "credibility_score": 0.6,
+        "fact_check_result": {
+            "summary": "일부 근거가 있으나 과장된 부분이 있습니다. " * 20,
+            "claims": [
+                {"claim": f"주장 {n}", "verdict": "부분적으로 사실", "evidence": "연구 결과 요약 " * 15, "score": n / 10}
+                for n in range(8)
+            ],
+            "sources": [{"title": f"논문 {n}", "url": f"https://example.com/{n}"} for n in range(10)],
+        },
+    }
+
+def make_meal(i: int) -> dict:
+    return {
+        "date": "2026-10-19",
+        "meal_type": "점심",
+        "foods": ["흰밥", "된장찌개", "배추김치", "고등어구이"],
+        "calories": 650,
+        "ai_analysis": {"content": "나트륨 섭취가 많은 편입니다. 국물은 절반만 드세요. " * 30, "score": i % 10},
+    }
+
+def measure(label: str, serialize, repeat: int) -> float:
+    serialize()  # 워밍업
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = serialize()
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    print(f"  {label:<8} {elapsed:8.2f}ms  ({len(body) / 1024:.0f}KB)")
+    return elapsed
+
+def run(page_size: int = 100, repeat: int = 50):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_engine = create_db_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        Base.metadata.create_all(bind=db_engine)
+        db = sessionmaker(bind=db_engine)()
+        DatabaseService.sync_user_data(db, "bench-user", {
+            "fact_checks": [make_fact_check(i) for i in range(page_size)],
+            "meals": [make_meal(i) for i in range(page_size)],
+        })
+
+        endpoints = [
+            ("fact_checks", lambda **kwargs: DatabaseService.list_fact_checks(db, "bench-user", limit=page_size, **kwargs)),
+            ("meals", lambda **kwargs: DatabaseService.list_meals(db, "bench-user", date="2026-10-19", limit=page_size, **kwargs)),
+        ]
+        for name, list_page in endpoints:
+            print(f"\n📊 {name} ({page_size}건/페이지, {repeat}회 평균, 조회+직렬화)")
+            stdlib = measure("stdlib", lambda: json.dumps(
+                jsonable_encoder({"success": True, "items": list_page()["items"]}),
+                ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8"), repeat)
+            measure("orjson", lambda: orjson.dumps({"success": True, "items": list_page()["items"]}), repeat)
+            raw = measure("raw", lambda: orjson.dumps({"success": True, "items": list_page(raw_json=True)["items"]}), repeat)
+            print(f"  → stdlib 대비 {stdlib / raw:.1f}배")
+
+        db.close()
+        db_engine.dispose()
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+응답 캐시
+
+- TTLCache: 프로세스 내 TTL + LRU 캐시 (사용자 통계 등)
+- ReadThroughCache: 직렬화된 응답 bytes를 보관하는 읽기 캐시.
+  REDIS_URL이 설정되어 있고 redis 패키지가 있으면 여러 워커가 공유하는 Redis를 사용합니다.
+쓰기 후에는 invalidate로 해당 키를 바로 지웁니다 (조회 중이던 오래된 값도 저장하지 않음).
+- make_etag / etag_matches: 사용자 데이터 버전 기반 조건부 GET (If-None-Match → 304)
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class TTLCache:
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """만료되지 않은 값 반환 (없으면 None)"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any):
+        """값 저장 (가득 차면 가장 오래 안 쓴 항목 제거)"""
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """키 삭제"""
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    @property
+    def stats(self) -> dict:
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+class RedisBytesCache:
+    """Redis 공유 캐시 (연결 오류 시 캐시 미스로 처리)"""
+
+    def __init__(self, url: str, ttl: float, prefix: str):
+        self.ttl = ttl
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.2)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get(self.prefix + key)
+        except redis.RedisError as e:
+            print(f"⚠️ Redis 조회 실패: {e}")
+            return None
+
+    def set(self, key: str, value: bytes):
+        try:
+            self.client.set(self.prefix + key, value, ex=max(1, int(self.ttl)))
+        except redis.RedisError as e:
+            print(f"⚠️ Redis 저장 실패: {e}")
+
+    def invalidate(self, key: str):
+        """키 삭제와 함께 세대 번호 증가 (다른 워커에서 조회 중이던 값도 저장되지 않음)"""
+        try:
+            with self.client.pipeline() as pipe:
+                pipe.incr(self._generation_key(key))
+                pipe.expire(self._generation_key(key), self._generation_ttl)
+                pipe.delete(self.prefix + key)
+                pipe.execute()
+        except redis.RedisError as e:
+            print(f"⚠️ Redis 삭제 실패: {e}")
+
+    def _generation_key(self, key: str) -> str:
+        return f"{self.prefix}gen:{key}"
+
+    @property
+    def _generation_ttl(self) -> int:
+        # 조회가 끝날 때까지는 남아 있도록 캐시 TTL보다 길게 (그 뒤에는 자동 삭제)
+        return max(60, int(self.ttl))
+
+    def generation(self, key: str) -> Optional[int]:
+        """키의 현재 세대 번호 (Redis 오류 시 None → 조회 결과를 저장하지 않음)"""
+        try:
+            return int(self.client.get(self._generation_key(key)) or 0)
+        except redis.RedisError as e:
+            print(f"⚠️ Redis 조회 실패: {e}")
+            return None
+
+    def set_if_generation(self, key: str, value: bytes, generation: Optional[int]):
+        """조회를 시작한 뒤 어느 워커에서도 무효화하지 않았을 때만 저장 (WATCH/MULTI)"""
+        if generation is None:
+            return
+        try:
+            with self.client.pipeline() as pipe:
+                pipe.watch(self._generation_key(key))
+                if int(pipe.get(self._generation_key(key)) or 0) != generation:
+                    pipe.unwatch()
+                    return
+                pipe.multi()
+                pipe.set(self.prefix + key, value, ex=max(1, int(self.ttl)))
+                pipe.execute()
+        except redis.WatchError:
+            pass  # 저장 직전에 무효화됨
+        except redis.RedisError as e:
+            print(f"⚠️ Redis 저장 실패: {e}")
+
+    @property
+    def stats(self) -> dict:
+        return {"backend": "redis"}
+
+
+class ReadThroughCache:
+    def __init__(self, name: str, ttl: float, maxsize: int = 4096, redis_url: Optional[str] = None):
+        if redis_url and redis is not None:
+            self.backend = RedisBytesCache(redis_url, ttl, prefix=f"{name}:")
+        else:
+            if redis_url:
+                print("⚠️ redis 패키지가 없어 프로세스 내 캐시를 사용합니다. pip install redis")
+            self.backend = TTLCache(ttl, maxsize)
+        # 조회 중에 무효화된 키는 오래된 값을 저장하지 않도록 조회 중인 키에만 세대 번호 관리
+        # (Redis 백엔드는 세대 번호도 Redis에 두어 다른 워커의 무효화까지 반영)
+        self._generations: Dict[str, int] = {}
+        self._loading: Dict[str, int] = {}   # 키별 진행 중인 조회 수 (0이 되면 세대 번호와 함께 삭제)
+        self._lock = threading.Lock()
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        """캐시된 bytes 반환, 없으면 loader 결과를 저장 후 반환"""
+        value = self.backend.get(key)
+        if value is not None:
+            return value
+
+        if isinstance(self.backend, RedisBytesCache):
+            generation = self.backend.generation(key)
+            value = await loader()
+            self.backend.set_if_generation(key, value, generation)
+            return value
+
+        with self._lock:
+            generation = self._generations.get(key, 0)
+            self._loading[key] = self._loading.get(key, 0) + 1
+        try:
+            value = await loader()
+        finally:
+            with self._lock:
+                fresh = self._generations.get(key, 0) == generation
+                self._loading[key] -= 1
+                if not self._loading[key]:
+                    del self._loading[key]
+                    self._generations.pop(key, None)
+        if fresh:
+            self.backend.set(key, value)
+        return value
+
+    def invalidate(self, key: str):
+        with self._lock:
+            if key in self._loading:
+                self._generations[key] = self._generations.get(key, 0) + 1
+        self.backend.invalidate(key)
+
+    @property
+    def stats(self) -> dict:
+        return self.backend.stats
+
+
+def make_etag(version: int, *parts: str) -> str:
+    """데이터 버전과 요청 경로/파라미터로 만든 약한 ETag (압축 여부와 무관하게 같은 값)"""
+    digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더에 현재 ETag가 있는지 (약한 비교)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+건강검진 수치 규칙 판정
+
+"혈압 145/90, 콜레스테롤 230mg/dL, 혈당 115mg/dL" 같은 검진 텍스트에서 주요 지표를 뽑아
+참고 범위로 정상/주의/위험을 판정합니다 (LLM 호출 없이 결정적으로 계산).
+- 혈압, 공복혈당(식후/무작위 혈당 제외), 총/LDL/HDL 콜레스테롤, 골밀도 T-score, AST/ALT, BMI(키/체중으로 계산)
+- 참고 범위: 국가건강검진 판정 기준 및 대한비만학회 BMI 기준을 3단계로 단순화
+"""
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+STATUS_ORDER = ("정상", "주의", "위험")
+
+
+class Metric(NamedTuple):
+    name: str                 # 화면 표시 이름
+    unit: str
+    aliases: str              # 공백/기호를 지운 소문자 라벨에서 찾을 정규식
+    # (상한, 상태, 설명) — 값이 상한 미만이면 해당 상태 (마지막 항목은 상한 없음)
+    ranges: Tuple[Tuple[Optional[float], str, str], ...]
+
+
+# 우선순위 순서 (LDL/HDL 콜레스테롤이 총콜레스테롤보다, 수축기/이완기가 혈압보다 먼저)
+METRICS: Dict[str, Metric] = {
+    "ldl": Metric("LDL 콜레스테롤", "mg/dL", r"ldl|저밀도", (
+        (130, "정상", "적정"), (160, "주의", "경계"), (None, "위험", "높음"),
+    )),
+    "hdl": Metric("HDL 콜레스테롤", "mg/dL", r"hdl|고밀도", (
+        (40, "주의", "낮음"), (None, "정상", "적정"),
+    )),
+    "total_cholesterol": Metric("총콜레스테롤", "mg/dL", r"콜레스테롤|cholesterol|(^|[^a-z])tc$", (
+        (200, "정상", "적정"), (240, "주의", "경계"), (None, "위험", "고콜레스테롤혈증 의심"),
+    )),
+    "systolic": Metric("수축기 혈압", "mmHg", r"수축기|(^|[^a-z])sbp", ()),
+    "diastolic": Metric("이완기 혈압", "mmHg", r"이완기|(^|[^a-z])dbp", ()),
+    "blood_pressure": Metric("혈압", "mmHg", r"혈압|(^|[^a-z])bp$", ()),
+    "fasting_glucose": Metric("공복혈당", "mg/dL", r"혈당|glucose|(^|[^a-z])(fbs|fpg)$", (
+        (100, "정상", "정상"), (126, "주의", "공복혈당장애"), (None, "위험", "당뇨병 의심"),
+    )),
+    "t_score": Metric("골밀도 T-score", "", r"tscore|t점수|골밀도", (
+        (-2.5, "위험", "골다공증"), (-1.0, "주의", "골감소증"), (None, "정상", "정상"),
+    )),
+    "ast": Metric("AST", "IU/L", r"(^|[^a-z])ast|sgot|(^|[^a-z])got$", (
+        (41, "정상", "정상"), (101, "주의", "경도 상승"), (None, "위험", "간 기능 이상 의심"),
+    )),
+    "alt": Metric("ALT", "IU/L", r"(^|[^a-z])alt|sgpt|(^|[^a-z])gpt$", (
+        (36, "정상", "정상"), (101, "주의", "경도 상승"), (None, "위험", "간 기능 이상 의심"),
+    )),
+    "bmi": Metric("BMI", "kg/m²", r"bmi|체질량", (
+        (18.5, "주의", "저체중"), (23, "정상", "정상"), (30, "주의", "과체중/비만"), (None, "위험", "고도 비만"),
+    )),
+}
+
+# 혈압은 수축기/이완기 중 나쁜 쪽으로 판정
+BLOOD_PRESSURE_RANGES = (
+    ((130, 85), "정상", "정상"),
+    ((160, 100), "주의", "고혈압 전단계/1기"),
+    ((None, None), "위험", "고혈압 2기"),
+)
+
+# 판정된 지표별 권장 영양소와 생활 습관 (가장 나쁜 지표 기준)
+METRIC_ADVICE = {
+    "blood_pressure": ("칼륨 (채소·과일)", "국물과 짠 음식을 줄이고 하루 30분 걷기"),
+    "fasting_glucose": ("식이섬유", "흰쌀밥 대신 잡곡밥을 먹고 식후 10분 걷기"),
+    "total_cholesterol": ("오메가3", "튀김과 기름진 고기를 줄이고 생선을 주 2회 먹기"),
+    "ldl": ("오메가3", "튀김과 기름진 고기를 줄이고 생선을 주 2회 먹기"),
+    "hdl": ("오메가3", "주 5일 30분 이상 유산소 운동하기"),
+    "t_score": ("칼슘과 비타민 D", "매일 10분 햇볕 쬐며 걷기"),
+    "ast": ("", "술을 줄이고 약·건강기능식품은 의사와 상담 후 복용하기"),
+    "alt": ("", "술을 줄이고 약·건강기능식품은 의사와 상담 후 복용하기"),
+    "bmi": ("단백질", "저녁 식사량을 줄이고 하루 30분 걷기"),
+}
+UNDERWEIGHT_ADVICE = ("단백질", "끼니마다 고기·생선·두부 반찬 챙기기")
+NORMAL_ADVICE = ("비타민 D", "지금처럼 규칙적인 식사와 운동을 유지하기")
+
+# 라벨 + 값(혈압은 값/값). 라벨은 글자로 시작하고 쉼표/숫자 전까지
+_VALUE_PATTERN = re.compile(
+    r"(?P<label>[A-Za-z가-힣][A-Za-z가-힣\s\-()]*?)\s*[:：=]?\s*"
+    r"(?P<value>-?\d+(?:\.\d+)?)(?:\s*/\s*(?P<second>\d+(?:\.\d+)?))?"
+)
+_LABEL_CLEANUP = re.compile(r"[\s\-()]+")
+_ALIASES = [(key, re.compile(metric.aliases)) for key, metric in METRICS.items()]
+# 검사 수치가 아닌 라벨 (날짜, 나이, 키/체중 등) — 판정하지 못한 수치로 세지 않음
+_IGNORED_LABELS = re.compile(r"(검진|검사|측정)?(일|일자|날짜|연도)$|나이|연령|^(키|신장|체중|몸무게)$|date|age|height|weight")
+# 공복이 아닌 혈당 (식후/무작위/식후 2시간) — 공복혈당 기준으로 판정하지 않음
+_NON_FASTING_GLUCOSE = re.compile(r"식후|무작위|수시|시간|random|casual|postprandial|(^|[^a-z])pp")
+# 지표가 아닌 서술이 남았는지 판단할 때 지우는 단위/연결어 (그 외 글자가 한 단어라도 남으면 서술)
+_NOISE = re.compile(r"mg/dl|mmhg|iu/l|u/l|kg/m2|kg/m²|kg|cm|mg|정상|주의|위험|이고|이며|및|그리고|[^a-z가-힣]+")
+
+
+def _short_label(label: str) -> str:
+    # 라벨의 마지막 두 단어만 사용 ("결과는 다음과 같습니다 혈압" → "같습니다 혈압")
+    return " ".join(label.split()[-2:]).strip(" -()")
+
+def _metric_key(label: str) -> Optional[str]:
+    normalized = _LABEL_CLEANUP.sub("", _short_label(label)).lower()
+    for key, pattern in _ALIASES:
+        if pattern.search(normalized):
+            if key == "fasting_glucose" and _NON_FASTING_GLUCOSE.search(normalized):
+                return None
+            return key
+    return None
+
+def _classify(key: str, value: float) -> Tuple[str, str]:
+    for upper, status, note in METRICS[key].ranges:
+        if upper is None or value < upper:
+            return status, note
+    return METRICS[key].ranges[-1][1:]
+
+def _classify_blood_pressure(systolic: Optional[float], diastolic: Optional[float]) -> Tuple[str, str]:
+    for (systolic_upper, diastolic_upper), status, note in BLOOD_PRESSURE_RANGES:
+        if systolic_upper is None:
+            return status, note
+        if (systolic is None or systolic < systolic_upper) and (diastolic is None or diastolic < diastolic_upper):
+            return status, note
+    return BLOOD_PRESSURE_RANGES[-1][1:]
+
+def _format_number(value: float) -> str:
+    return f"{value:g}"
+
+def worse(first: Optional[str], second: Optional[str]) -> Optional[str]:
+    """두 상태 중 더 나쁜 쪽"""
+    if first not in STATUS_ORDER:
+        return second
+    if second not in STATUS_ORDER:
+        return first
+    return max(first, second, key=STATUS_ORDER.index)
+
+def parse_values(text: str) -> Tuple[Dict[str, tuple], List[Tuple[int, int]], List[str]]:
+    """텍스트에서 지표 값 추출 → ({지표: 값 튜플}, 읽은 구간 목록, 판정 기준이 없는 수치 라벨 목록)
+
+    읽은 구간에는 판정하지 못한 수치와 날짜/나이/키/체중도 들어갑니다 (서술 판단에서 제외).
+    """
+    values, spans, unrecognized = {}, [], []
+    for match in _VALUE_PATTERN.finditer(text or ""):
+        key = _metric_key(match.group("label"))
+        if key is None:
+            # 중성지방, 당화혈색소, 식후 혈당 등 규칙에 없는 수치는 버리지 않고 기록 (LLM 해석 필요)
+            label = _short_label(match.group("label"))
+            if not _IGNORED_LABELS.search(_LABEL_CLEANUP.sub("", label).lower()) and label not in unrecognized:
+                unrecognized.append(label)
+            spans.append(match.span())
+            continue
+        first = float(match.group("value"))
+        second = float(match.group("second")) if match.group("second") else None
+        if key == "blood_pressure" and second is None:
+            continue
+        if key != "blood_pressure" and second is not None:
+            continue  # 날짜나 비율 같은 다른 값
+        values.setdefault(key, (first, second))
+        spans.append(match.span())
+    return values, spans, unrecognized
+
+def interpret_checkup(text: str, height_cm: Optional[float] = None, weight_kg: Optional[float] = None) -> dict:
+    """검진 텍스트의 지표별 판정과 전체 상태 (정상/주의/위험, 인식한 지표가 없으면 None)
+    
+    narrative는 수치 외의 서술(의사 소견 등)이 있어 LLM 해석이 필요한지 여부,
+    unrecognized는 규칙에 판정 기준이 없어 건너뛴 수치 라벨입니다 (있으면 LLM 해석 필요).
+    """
+    values, spans, unrecognized = parse_values(text)
+    recognized = len(values)  # 텍스트에서 읽은 지표 수 (키/체중으로 계산한 BMI 제외)
+
+    # 수축기/이완기를 따로 적은 경우 혈압으로 합침
+    systolic = values.pop("systolic", (None,))[0]
+    diastolic = values.pop("diastolic", (None,))[0]
+    if "blood_pressure" not in values and (systolic is not None or diastolic is not None):
+        values["blood_pressure"] = (systolic, diastolic)
+    if "bmi" not in values and height_cm and weight_kg:
+        values["bmi"] = (round(float(weight_kg) / (float(height_cm) / 100) ** 2, 1), None)
+
+    metrics = {}
+    for key in METRICS:
+        if key not in values:
+            continue
+        first, second = values[key]
+        if key == "blood_pressure":
+            status, note = _classify_blood_pressure(first, second)
+            display = "/".join("-" if value is None else _format_number(value) for value in (first, second))
+        else:
+            status, note = _classify(key, first)
+            display = _format_number(first)
+        metrics[key] = {
+            "name": METRICS[key].name,
+            "value": display,
+            "unit": METRICS[key].unit,
+            "status": status,
+            "note": note,
+        }
+
+    overall = None
+    for metric in metrics.values():
+        overall = worse(overall, metric["status"])
+
+    # 읽은 구간을 지우고 단위/연결어 외의 단어가 남으면 소견 등 서술이 있는 것으로 판단
+    # ("요단백 양성", "지방간", "고혈압약 복용중"처럼 짧은 소견도 수치 판정만으로는 놓침)
+    residual = text or ""
+    for start, end in reversed(spans):
+        residual = residual[:start] + " " + residual[end:]
+    narrative = bool(_NOISE.sub("", residual.lower()))
+
+    return {
+        "status": overall,
+        "metrics": metrics,
+        "recognized": recognized,
+        "unrecognized": unrecognized,
+        "narrative": narrative,
+    }
+
+def format_metrics(metrics: dict) -> str:
+    """지표 판정을 한 줄 요약으로 (프롬프트/추천 입력용)"""
+    return ", ".join(
+        f"{metric.get('name', key)} {metric.get('value', '')}{metric.get('unit', '')}"
+        f"({metric.get('status', '')}, {metric.get('note', '')})"
+        for key, metric in metrics.items() if isinstance(metric, dict)
+    )
+
+def build_checkup_result(interpretation: dict, name: str) -> dict:
+    """규칙 판정만으로 만든 검진 분석 결과 (checkup_expert.txt 응답과 같은 필드)
+
+    skipped_values에는 판정 기준이 없어 건너뛴 수치 라벨이 들어가고, 서술 소견이 있으면 반영하지 않았다고
+    안내합니다 (fast_mode에서만 이 결과를 그대로 사용).
+    """
+    metrics = interpretation["metrics"]
+    skipped = interpretation.get("unrecognized", [])
+    skipped_note = f" {', '.join(skipped)} 수치는 판정하지 못했으니 의사와 상담하세요." if skipped else ""
+    if interpretation.get("narrative"):
+        skipped_note += " 수치 외의 검진 소견은 반영하지 않았으니 의사와 상담하세요."
+    if not metrics:
+        return {
+            "analysis_logic": "인식한 검진 수치 없음",
+            "status": "Unknown",
+            "content": f"{name}님, 검진 결과에서 혈압·혈당·콜레스테롤 같은 수치를 찾지 못했어요. 수치를 직접 입력해 주세요." + skipped_note,
+            "recommended_nutrient": "",
+            "action_plan": "",
+            "metrics": {},
+            "skipped_values": skipped,
+        }
+
+    status = interpretation["status"]
+    flagged = [(key, metric) for key, metric in metrics.items() if metric["status"] != "정상"]
+    if flagged:
+        # 위험 지표 우선, 같은 단계면 METRICS 순서
+        key, worst = max(flagged, key=lambda item: STATUS_ORDER.index(item[1]["status"]))
+        nutrient, action = UNDERWEIGHT_ADVICE if worst["note"] == "저체중" else METRIC_ADVICE[key]
+        names = ", ".join(metric["name"] for _, metric in flagged)
+        content = f"{name}님, {names} 수치가 정상 범위를 벗어났어요. 특히 {worst['name']}은(는) {worst['note']} 단계입니다."
+    else:
+        nutrient, action = NORMAL_ADVICE
+        content = f"{name}님, 확인한 검진 수치가 모두 정상 범위예요."
+    content += skipped_note
+
+    return {
+        "analysis_logic": format_metrics(metrics),
+        "status": status,
+        "content": content,
+        "recommended_nutrient": nutrient,
+        "action_plan": action,
+        "metrics": metrics,
+        "skipped_values": skipped,
+    }
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+외부 의존성(Bedrock converse, Titan 임베딩, STS, 유튜브 자막)별 서킷 브레이커
+
+장애 중에도 요청마다 boto3 타임아웃까지 기다린 뒤 기본 응답을 돌려주던 문제를 막기 위해,
+연속 실패가 기준을 넘으면 일정 시간 호출을 바로 거절(CircuitOpenError)해 호출부가
+즉시 폴백 경로를 타도록 합니다. 대기 시간이 지나면 한 번의 시험 호출(half-open)로 복구를 확인합니다.
+"""
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+RECOVERY_SECONDS = float(os.getenv("CIRCUIT_RECOVERY_SECONDS", "30"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# 서비스 장애로 보는 AWS 오류 코드 (그 외 4xx는 요청 문제라 브레이커에 반영하지 않음)
+OUTAGE_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ServiceUnavailable",
+    "InternalServerException",
+    "InternalFailure",
+    "ModelTimeoutException",
+    "ModelNotReadyException",
+    "RequestTimeout",
+    "RequestTimeoutException",
+}
+
+# 영상별 오류 (자막 없음 등) — 유튜브 서비스 장애가 아님
+YOUTUBE_VIDEO_ERRORS = {
+    "TranscriptsDisabled",
+    "NoTranscriptFound",
+    "NoTranscriptAvailable",
+    "VideoUnavailable",
+    "InvalidVideoId",
+    "AgeRestricted",
+    "VideoUnplayable",
+}
+
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어 호출하지 않음"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} 호출 차단 중 ({retry_after:.0f}초 후 재시도)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def is_outage(error: Exception) -> bool:
+    """AWS 호출 오류가 서비스 장애(스로틀링, 5xx, 연결/타임아웃)인지 판단"""
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        code = response.get("Error", {}).get("Code", "")
+        status = response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0) or 0
+        return code in OUTAGE_ERROR_CODES or status >= 500 or status == 429
+    # ClientError가 아닌 오류 (연결 실패, 타임아웃, 자격 증명 없음 등)
+    return True
+
+def is_youtube_outage(error: Exception) -> bool:
+    return type(error).__name__ not in YOUTUBE_VIDEO_ERRORS
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD,
+                 recovery_seconds: float = RECOVERY_SECONDS,
+                 is_failure: Callable[[Exception], bool] = is_outage,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.is_failure = is_failure
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0            # 연속 실패 수
+        self.opened_at: Optional[float] = None
+        self.trips = 0               # 열린 횟수
+        self.rejected = 0            # 열려 있어 거절한 호출 수
+        self.last_error = ""
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _retry_after(self, now: float) -> float:
+        return max(0.0, self.opened_at + self.recovery_seconds - now) if self.opened_at is not None else 0.0
+
+    def allow(self) -> bool:
+        """지금 호출해도 되는지 (열린 상태에서 대기 시간이 지나면 시험 호출 1건만 허용)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = self.clock()
+            if self.state == OPEN and self._retry_after(now) <= 0:
+                self.state = HALF_OPEN
+                self._probe_started = None
+            if self.state == HALF_OPEN:
+                # 시험 호출이 응답 없이 오래 걸리면 다음 요청이 다시 시험
+                if self._probe_started is None or now - self._probe_started >= self.recovery_seconds:
+                    self._probe_started = now
+                    return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._probe_started = None
+
+    def record_failure(self, error: Optional[Exception] = None):
+        with self._lock:
+            self.failures += 1
+            if error is not None:
+                self.last_error = f"{type(error).__name__}: {error}"[:200]
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                    print(f"🚫 {self.name} 서킷 열림 ({self.recovery_seconds:.0f}초 동안 호출 차단): {self.last_error}")
+                self.state = OPEN
+                self.opened_at = self.clock()
+                self._probe_started = None
+
+    def call(self, func: Callable, *args, **kwargs):
+        """브레이커를 거쳐 호출 (열려 있으면 CircuitOpenError)"""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self._retry_after(self.clock()))
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if self.is_failure(e):
+                self.record_failure(e)
+            else:
+                self.record_success()  # 서비스는 응답함 (요청/영상별 오류)
+            raise
+        self.record_success()
+        return result
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "retry_after_seconds": round(self._retry_after(self.clock()), 1) if self.state == OPEN else 0.0,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "last_error": self.last_error,
+            }
+
+
+# 의존성별 브레이커 (프로세스 전체에서 공유)
+converse_breaker = CircuitBreaker("bedrock_converse")
+embedding_breaker = CircuitBreaker("titan_embeddings")
+sts_breaker = CircuitBreaker("sts", failure_threshold=2)
+youtube_breaker = CircuitBreaker("youtube_transcripts", is_failure=is_youtube_outage)
+
+BREAKERS = (converse_breaker, embedding_breaker, sts_breaker, youtube_breaker)
+
+def breaker_status() -> dict:
+    """/api/health용 브레이커 상태"""
+    return {breaker.name: breaker.stats for breaker in BREAKERS}
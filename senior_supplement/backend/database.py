@@ -1,17 +1,108 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, JSON, Float, Boolean
+from sqlalchemy import create_engine, event, text, Column, Integer, String, Date, DateTime, Text, JSON, Float, Boolean, Index
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, deferred
 from datetime import datetime
+import json
 import os
 from dotenv import load_dotenv
+from db_migrations import run_migrations
 
 load_dotenv()
 
 # 데이터베이스 URL 설정 (환경변수에서 가져오기)
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./health_app.db")
 
-engine = create_engine(DATABASE_URL)
+# 연결 풀 / SQLite 설정 (환경변수로 조정)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # RDS 유휴 연결 정리 전에 재연결
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+def engine_options(database_url: str) -> dict:
+    """DB 종류별 create_engine 옵션"""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return {
+            # FastAPI 스레드풀에서 연결을 공유하므로 같은 스레드 검사 해제
+            "connect_args": {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+        }
+    
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+    if url.get_backend_name() == "postgresql":
+        options["connect_args"] = {
+            "connect_timeout": DB_CONNECT_TIMEOUT,
+            "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}",
+            "application_name": "senior-supplement-api",
+        }
+    return options
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """SQLite 연결마다 WAL 및 성능 관련 PRAGMA 적용"""
+    cursor = dbapi_connection.cursor()
+    # WAL: 읽기가 쓰기를 막지 않음 (메모리 DB는 지원하지 않아 memory 모드로 남음)
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def _json_serializer(value) -> str:
+    # 한글을 \uXXXX로 바꾸지 않고 저장 (JSON 컬럼을 그대로 응답에 쓸 때 크기가 작음)
+    return json.dumps(value, ensure_ascii=False)
+
+def create_db_engine(database_url: str):
+    """환경변수 설정을 반영한 엔진 생성"""
+    db_engine = create_engine(database_url, json_serializer=_json_serializer, **engine_options(database_url))
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+def async_database_url(database_url: str) -> str:
+    """비동기 드라이버 URL (SQLite → aiosqlite, PostgreSQL → asyncpg)"""
+    url = make_url(database_url)
+    driver = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"비동기 연결을 지원하지 않는 데이터베이스입니다: {url.get_backend_name()}")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+def create_async_db_engine(database_url: str):
+    """create_db_engine과 같은 설정의 비동기 엔진 생성"""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        options = {"connect_args": {"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}}
+    else:
+        options = engine_options(database_url)
+        # asyncpg는 서버 설정을 server_settings로 전달
+        options["connect_args"] = {
+            "timeout": DB_CONNECT_TIMEOUT,
+            "server_settings": {
+                "statement_timeout": str(DB_STATEMENT_TIMEOUT_MS),
+                "application_name": "senior-supplement-api",
+            },
+        }
+    db_engine = create_async_engine(async_database_url(database_url), json_serializer=_json_serializer, **options)
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+engine = create_db_engine(DATABASE_URL)
+async_engine = create_async_db_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 # 사용자 정보 테이블
@@ -36,13 +127,24 @@ class MealRecord(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String, index=True)
     date = Column(String)  # YYYY-MM-DD 형식
+    record_date = Column(Date, nullable=True)  # date를 날짜 타입으로 저장 (범위 조회용)
     meal_type = Column(String)  # 아침, 점심, 저녁
     foods = Column(JSON)  # 음식 리스트
     nutrients = Column(JSON)  # 영양소 정보
     calories = Column(Float)
     image_path = Column(String, nullable=True)
-    ai_analysis = Column(JSON, nullable=True)  # AI 분석 결과
+    ai_analysis = deferred(Column(JSON, nullable=True), group='details')  # AI 분석 결과 (목록 조회 시 제외)
     created_at = Column(DateTime, default=datetime.utcnow)
+    client_id = Column(String, nullable=True)  # 앱 레코드 ID (없으면 내용 해시)
+    content_hash = Column(String, nullable=True)  # 동기화된 내용의 해시
+    updated_seq = Column(Integer, nullable=True)  # 사용자별 변경 순번 (델타 동기화 커서)
+    
+    __table_args__ = (
+        Index('uq_meal_records_user_client', 'user_id', 'client_id', unique=True),
+        Index('ix_meal_records_user_seq', 'user_id', 'updated_seq'),
+        Index('ix_meal_records_user_date', 'user_id', 'record_date'),
+        Index('ix_meal_records_user_created', user_id, created_at.desc()),
+    )
 
 # 영양제 분석 기록 테이블
 class SupplementAnalysis(Base):
@@ -50,10 +152,19 @@ class SupplementAnalysis(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String, index=True)
-    analysis_result = Column(JSON)  # AI 분석 결과
+    analysis_result = deferred(Column(JSON), group='details')  # AI 분석 결과 (목록 조회 시 제외)
     recommended_supplements = Column(JSON)  # 추천 영양제 리스트
     deficient_nutrients = Column(JSON)  # 부족한 영양소
     created_at = Column(DateTime, default=datetime.utcnow)
+    client_id = Column(String, nullable=True)  # 앱 레코드 ID (없으면 내용 해시)
+    content_hash = Column(String, nullable=True)  # 동기화된 내용의 해시
+    updated_seq = Column(Integer, nullable=True)  # 사용자별 변경 순번 (델타 동기화 커서)
+    
+    __table_args__ = (
+        Index('uq_supplement_analyses_user_client', 'user_id', 'client_id', unique=True),
+        Index('ix_supplement_analyses_user_seq', 'user_id', 'updated_seq'),
+        Index('ix_supplement_analyses_user_created', user_id, created_at.desc()),
+    )
 
 # 건강검진 기록 테이블
 class HealthCheckup(Base):
@@ -62,11 +173,20 @@ class HealthCheckup(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String, index=True)
     checkup_date = Column(String)  # 검진 날짜
-    checkup_data = Column(JSON)  # 검진 수치들
-    ai_analysis = Column(JSON)  # AI 분석 결과
+    checkup_data = deferred(Column(JSON), group='details')  # 검진 수치들 (목록 조회 시 제외)
+    ai_analysis = deferred(Column(JSON), group='details')  # AI 분석 결과 (목록 조회 시 제외)
     status = Column(String)  # 건강 상태 (정상, 주의, 위험)
     image_path = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    client_id = Column(String, nullable=True)  # 앱 레코드 ID (없으면 내용 해시)
+    content_hash = Column(String, nullable=True)  # 동기화된 내용의 해시
+    updated_seq = Column(Integer, nullable=True)  # 사용자별 변경 순번 (델타 동기화 커서)
+    
+    __table_args__ = (
+        Index('uq_health_checkups_user_client', 'user_id', 'client_id', unique=True),
+        Index('ix_health_checkups_user_seq', 'user_id', 'updated_seq'),
+        Index('ix_health_checkups_user_created', user_id, created_at.desc()),
+    )
 
 # 팩트체크 기록 테이블
 class FactCheck(Base):
@@ -77,8 +197,17 @@ class FactCheck(Base):
     query = Column(Text)  # 사용자 질문
     source_type = Column(String)  # text, youtube_url 등
     credibility_score = Column(Float)  # 신뢰도 점수
-    fact_check_result = Column(JSON)  # 팩트체크 결과
+    fact_check_result = deferred(Column(JSON), group='details')  # 팩트체크 결과 (목록 조회 시 제외)
     created_at = Column(DateTime, default=datetime.utcnow)
+    client_id = Column(String, nullable=True)  # 앱 레코드 ID (없으면 내용 해시)
+    content_hash = Column(String, nullable=True)  # 동기화된 내용의 해시
+    updated_seq = Column(Integer, nullable=True)  # 사용자별 변경 순번 (델타 동기화 커서)
+    
+    __table_args__ = (
+        Index('uq_fact_checks_user_client', 'user_id', 'client_id', unique=True),
+        Index('ix_fact_checks_user_seq', 'user_id', 'updated_seq'),
+        Index('ix_fact_checks_user_created', user_id, created_at.desc()),
+    )
 
 # 복용 기록 테이블
 class MedicationRecord(Base):
@@ -87,15 +216,85 @@ class MedicationRecord(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String, index=True)
     date = Column(String)  # YYYY-MM-DD 형식
+    record_date = Column(Date, nullable=True)  # date를 날짜 타입으로 저장
     medication_name = Column(String)
     dosage = Column(String)
     taken = Column(Boolean, default=False)  # 복용 여부
     taken_time = Column(DateTime, nullable=True)  # 복용 시간
     created_at = Column(DateTime, default=datetime.utcnow)
+    client_id = Column(String, nullable=True)  # 앱 레코드 ID (없으면 내용 해시)
+    content_hash = Column(String, nullable=True)  # 동기화된 내용의 해시
+    updated_seq = Column(Integer, nullable=True)  # 사용자별 변경 순번 (델타 동기화 커서)
+    
+    __table_args__ = (
+        Index('uq_medication_records_user_client', 'user_id', 'client_id', unique=True),
+        Index('ix_medication_records_user_seq', 'user_id', 'updated_seq'),
+        Index('ix_medication_records_user_date_name', 'user_id', 'record_date', 'medication_name'),
+        Index('ix_medication_records_user_created', user_id, created_at.desc()),
+    )
+
+# 일별 요약 (식사/복용 기록이 바뀐 날짜만 다시 계산)
+class DailyUserSummary(Base):
+    __tablename__ = "daily_user_summary"
+    
+    user_id = Column(String, primary_key=True)
+    summary_date = Column(Date, primary_key=True)
+    calories = Column(Float, default=0)
+    nutrients = Column(JSON)  # 영양소별 하루 합계
+    meal_count = Column(Integer, default=0)
+    medication_total = Column(Integer, default=0)  # 복용 예정 건수
+    medication_taken = Column(Integer, default=0)  # 복용 완료 건수
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# 사용자별 변경 순번 및 기록 수 (기록 추가/삭제와 같은 트랜잭션에서 갱신)
+class UserSyncState(Base):
+    __tablename__ = "user_sync_state"
+    
+    user_id = Column(String, primary_key=True)
+    last_seq = Column(Integer, default=0, nullable=False)  # 마지막으로 할당한 변경 순번
+    # info['counts']: 개수를 세는 테이블 (기존 DB는 마이그레이션에서 채움)
+    meal_count = Column(Integer, nullable=True, info={'counts': 'meal_records'})
+    supplement_analysis_count = Column(Integer, nullable=True, info={'counts': 'supplement_analyses'})
+    checkup_count = Column(Integer, nullable=True, info={'counts': 'health_checkups'})
+    fact_check_count = Column(Integer, nullable=True, info={'counts': 'fact_checks'})
+    medication_count = Column(Integer, nullable=True, info={'counts': 'medication_records'})
+
+# 삭제된 레코드 기록 (델타 동기화용 툼스톤)
+class DeletedRecord(Base):
+    __tablename__ = "deleted_records"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String)
+    table_name = Column(String)  # meals, health_checkups 등 동기화 키
+    record_id = Column(Integer)
+    client_id = Column(String, nullable=True)
+    deleted_seq = Column(Integer)
+    deleted_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('ix_deleted_records_user_seq', 'user_id', 'deleted_seq'),
+    )
 
 # 데이터베이스 테이블 생성
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine, Base.metadata)
+
+# 연결 풀 상태 (헬스 체크용)
+def pool_status(db_engine=None) -> dict:
+    pool = (db_engine or engine).pool
+    status = {"class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            status[name] = method()
+    return status
+
+# 연결 확인 (readiness 점검용)
+def ping_database(db_engine=None) -> dict:
+    with (db_engine or engine).connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return {"dialect": (db_engine or engine).dialect.name}
 
 # 데이터베이스 세션 의존성
 def get_db():
@@ -103,4 +302,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# 비동기 데이터베이스 세션 의존성
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
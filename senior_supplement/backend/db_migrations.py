@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+기존 데이터베이스 스키마 보정
+
+create_all은 이미 있는 테이블을 변경하지 않으므로, 모델에 새로 추가된
+컬럼과 인덱스를 기존 DB(SQLite/PostgreSQL)에 반영합니다.
+여러 번 실행해도 안전합니다.
+"""
+from datetime import datetime
+from sqlalchemy import bindparam, func, inspect, select, text, update
+
+
+def _add_missing_columns(conn, table, existing_columns):
+    """모델에는 있고 DB에는 없는 컬럼 추가 (NULL 허용 컬럼만)"""
+    added = []
+    for column in table.columns:
+        if column.name in existing_columns:
+            continue
+        if not column.nullable or column.primary_key:
+            print(f"⚠️ {table.name}.{column.name} 컬럼은 자동으로 추가할 수 없습니다.")
+            continue
+        column_type = column.type.compile(dialect=conn.dialect)
+        conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+        added.append(column.name)
+    return added
+
+
+def backfill_updated_seq(conn, metadata):
+    """updated_seq가 없는 기존 행에 사용자별 변경 순번 부여"""
+    state = metadata.tables.get('user_sync_state')
+    if state is None:
+        return
+
+    last_seqs = {user_id: last_seq for user_id, last_seq in conn.execute(select(state.c.user_id, state.c.last_seq))}
+    known_users = set(last_seqs)
+    for table in metadata.sorted_tables:
+        if 'updated_seq' not in table.c or 'user_id' not in table.c:
+            continue
+
+        rows = conn.execute(
+            select(table.c.id, table.c.user_id).where(table.c.updated_seq.is_(None)).order_by(table.c.id)
+        ).all()
+        if not rows:
+            continue
+
+        params = []
+        for row_id, user_id in rows:
+            last_seqs[user_id] = last_seqs.get(user_id, 0) + 1
+            params.append({'row_id': row_id, 'seq': last_seqs[user_id]})
+        conn.execute(
+            update(table).where(table.c.id == bindparam('row_id')).values(updated_seq=bindparam('seq')),
+            params
+        )
+        print(f"🔧 {table.name} 변경 순번 부여: {len(params)}건")
+
+    for user_id, last_seq in last_seqs.items():
+        if user_id in known_users:
+            conn.execute(update(state).where(state.c.user_id == user_id).values(last_seq=last_seq))
+        else:
+            conn.execute(state.insert().values(user_id=user_id, last_seq=last_seq))
+
+
+def backfill_record_date(conn, metadata):
+    """문자열 date 컬럼을 날짜 타입 record_date 컬럼으로 복사"""
+    for table in metadata.sorted_tables:
+        if 'record_date' not in table.c or 'date' not in table.c:
+            continue
+
+        rows = conn.execute(
+            select(table.c.id, table.c.date).where(table.c.record_date.is_(None), table.c.date.is_not(None))
+        ).all()
+        params, invalid = [], 0
+        for row_id, value in rows:
+            try:
+                params.append({'row_id': row_id, 'parsed': datetime.strptime(value, '%Y-%m-%d').date()})
+            except (TypeError, ValueError):
+                invalid += 1
+        if params:
+            conn.execute(
+                update(table).where(table.c.id == bindparam('row_id')).values(record_date=bindparam('parsed')),
+                params
+            )
+            print(f"🔧 {table.name} 날짜 변환: {len(params)}건")
+        if invalid:
+            print(f"⚠️ {table.name} 날짜 형식 오류로 변환하지 못한 행: {invalid}건")
+
+
+def backfill_record_counts(conn, metadata):
+    """기록 수 컬럼이 비어 있는 사용자의 테이블별 행 수 계산"""
+    state = metadata.tables.get('user_sync_state')
+    if state is None:
+        return
+
+    counters = [column for column in state.columns if 'counts' in column.info]
+    if not counters:
+        return
+    user_ids = conn.execute(select(state.c.user_id).where(counters[0].is_(None))).scalars().all()
+    if not user_ids:
+        return
+
+    values = {user_id: {column.name: 0 for column in counters} for user_id in user_ids}
+    for column in counters:
+        table = metadata.tables[column.info['counts']]
+        rows = conn.execute(
+            select(table.c.user_id, func.count()).where(table.c.user_id.in_(user_ids)).group_by(table.c.user_id)
+        )
+        for user_id, count in rows:
+            values[user_id][column.name] = count
+
+    for user_id, counts in values.items():
+        conn.execute(update(state).where(state.c.user_id == user_id).values(**counts))
+    print(f"🔧 사용자별 기록 수 계산: {len(values)}명")
+
+
+def backfill_daily_summaries(conn, metadata):
+    """일별 요약 테이블이 비어 있으면 기존 식사/복용 기록으로 채움"""
+    summary = metadata.tables.get('daily_user_summary')
+    if summary is None or conn.execute(select(summary.c.user_id).limit(1)).first() is not None:
+        return
+
+    # 요약 계산은 서비스 코드와 같은 로직을 사용 (database ↔ db_service 순환 import 방지를 위해 지연 import)
+    from sqlalchemy.orm import Session
+    from db_service import DatabaseService
+
+    with Session(bind=conn) as db:
+        users = DatabaseService.rebuild_daily_summaries(db)
+        db.flush()
+    if users:
+        print(f"🔧 일별 요약 계산: {users}명")
+
+
+def backfill_client_id(conn, metadata):
+    """단건 API로 저장되어 client_id가 없는 행에 동기화와 같은 내용 해시 ID 부여"""
+    from db_service import _hash_client_id
+
+    for table in metadata.sorted_tables:
+        if 'client_id' not in table.c or 'content_hash' not in table.c:
+            continue
+
+        rows = conn.execute(
+            select(table.c.id, table.c.user_id, table.c.content_hash)
+            .where(table.c.client_id.is_(None), table.c.content_hash.is_not(None))
+            .order_by(table.c.id)
+        ).all()
+        if not rows:
+            continue
+
+        taken = {
+            (user_id, client_id)
+            for user_id, client_id in conn.execute(
+                select(table.c.user_id, table.c.client_id).where(table.c.client_id.is_not(None))
+            )
+        }
+        params = []
+        for row_id, user_id, content_hash in rows:
+            occurrence = 1
+            while (user_id, _hash_client_id(content_hash, occurrence)) in taken:
+                occurrence += 1
+            client_id = _hash_client_id(content_hash, occurrence)
+            taken.add((user_id, client_id))
+            params.append({'row_id': row_id, 'client': client_id})
+        conn.execute(
+            update(table).where(table.c.id == bindparam('row_id')).values(client_id=bindparam('client')),
+            params
+        )
+        print(f"🔧 {table.name} 레코드 ID 부여: {len(params)}건")
+
+
+# 스키마 보정 후 순서대로 실행하는 데이터 마이그레이션 (모두 재실행 가능해야 함)
+DATA_MIGRATIONS = [
+    backfill_updated_seq,
+    backfill_record_date,
+    backfill_record_counts,
+    backfill_daily_summaries,
+    backfill_client_id,
+]
+
+
+def run_migrations(engine, metadata):
+    """누락된 컬럼/인덱스 추가 후 데이터 마이그레이션 실행"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            added = _add_missing_columns(conn, table, existing_columns)
+            if added:
+                print(f"🔧 {table.name} 컬럼 추가: {', '.join(added)}")
+
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+        for migration in DATA_MIGRATIONS:
+            migration(conn, metadata)
@@ -1,11 +1,221 @@
-from sqlalchemy.orm import Session
-from database import User, MealRecord, SupplementAnalysis, HealthCheckup, FactCheck, MedicationRecord
-from datetime import datetime
+from sqlalchemy import JSON, Text, and_, case, cast, delete, func, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer_group
+from database import (
+    User, MealRecord, SupplementAnalysis, HealthCheckup, FactCheck, MedicationRecord,
+    UserSyncState, DeletedRecord, DailyUserSummary
+)
+from food_nutrition_db import nutrition_db
+from cache import ReadThroughCache, TTLCache
+from datetime import date, datetime
+import base64
+import hashlib
+import json
+import orjson
+import os
 import uuid
+from datetime import timedelta
 from typing import List, Optional
 
+def _require(data: dict, key: str):
+    """필수 값 확인"""
+    value = data.get(key)
+    if value is None or value == '':
+        raise ValueError(f"{key} 값이 필요합니다.")
+    return value
+
+def _parse_date(value) -> date:
+    """YYYY-MM-DD 문자열을 날짜로 변환"""
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value), '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"날짜 형식이 올바르지 않습니다: {value}")
+
+def _json_value(data: dict, key: str, expected_type, default):
+    """JSON 컬럼 값의 타입 확인"""
+    value = data.get(key)
+    if value is None:
+        return default
+    if not isinstance(value, expected_type):
+        raise ValueError(f"{key} 값의 형식이 올바르지 않습니다.")
+    return value
+
+# 응답에 포함하지 않는 내부 컬럼
+INTERNAL_COLUMNS = ('user_id', 'content_hash')
+
+def _json_ready(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+def _raw_json(value: Optional[str]):
+    # DB에 저장된 JSON 문자열을 파싱하지 않고 orjson 응답에 그대로 삽입
+    return orjson.Fragment(value) if value is not None else None
+
+def record_to_dict(record, exclude: tuple = INTERNAL_COLUMNS) -> dict:
+    """레코드를 응답용 dict로 변환 (내부 컬럼 제외)"""
+    return {
+        column.name: _json_ready(getattr(record, column.name))
+        for column in record.__table__.columns
+        if column.name not in exclude
+    }
+
+def _encode_cursor(created_at: datetime, record_id: int) -> str:
+    """목록 다음 페이지 커서 (created_at, id)"""
+    raw = f"{created_at.isoformat()}|{record_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        created_at, record_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+        return datetime.fromisoformat(created_at), int(record_id)
+    except (ValueError, UnicodeError):
+        raise ValueError("cursor 값이 올바르지 않습니다.")
+
+def _content_hash(data: dict) -> str:
+    """앱에서 보낸 레코드 내용의 해시 (ID 키 제외)"""
+    content = {key: value for key, value in data.items() if key not in ('id', 'client_id')}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+def _client_id(data: dict) -> Optional[str]:
+    """앱에서 보낸 레코드 ID"""
+    value = data.get('client_id', data.get('id'))
+    return str(value) if value not in (None, '') else None
+
+def _hash_client_id(content_hash: str, occurrence: int) -> str:
+    """ID 없는 레코드의 ID (같은 내용의 n번째 레코드는 "해시#n")
+    
+    같은 날 같은 식사를 두 번 기록한 경우처럼 내용이 완전히 같은 레코드도 하나로 합치지 않습니다.
+    """
+    return content_hash if occurrence == 1 else f"{content_hash}#{occurrence}"
+
+# 테이블 이름 -> UserSyncState의 기록 수 컬럼
+COUNTER_COLUMNS = {
+    column.info['counts']: column.name
+    for column in UserSyncState.__table__.columns
+    if 'counts' in column.info
+}
+
+# 홈 화면 통계 캐시 ({사용자: (데이터 버전, 통계)}, 이 프로세스의 쓰기 시 무효화)
+statistics_cache = TTLCache(ttl=10.0, maxsize=4096)
+
+# 최신 영양제 분석/건강검진 응답 캐시 (직렬화된 JSON bytes)
+# 키에 데이터 버전이 들어 있어 다른 워커/인스턴스에서 저장해도 버전이 바뀌면 새 키로 조회
+latest_record_cache = ReadThroughCache(
+    "latest",
+    ttl=float(os.getenv("LATEST_CACHE_TTL", "300")),
+    redis_url=os.getenv("REDIS_URL")
+)
+
+def latest_cache_key(table: str, user_id: str, version: int) -> str:
+    return f"{table}:{user_id}:{version}"
+
+# 방언별 INSERT ... ON CONFLICT 지원
+UPSERT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
 class DatabaseService:
     
+    # 레코드 값 검증/변환 (단건 추가와 일괄 동기화에서 공통 사용)
+    @staticmethod
+    def _meal_values(user_id: str, meal_data: dict) -> dict:
+        foods = _json_value(meal_data, 'foods', list, [])
+        nutrients = _json_value(meal_data, 'nutrients', dict, {})
+        calories = float(meal_data.get('calories', 0) or 0)
+        if not nutrients and foods:
+            # 영양소 정보가 없으면 로컬 영양성분 DB로 계산
+            totals = nutrition_db.compute_meal_totals(foods)
+            if totals['matched_foods']:
+                nutrients = totals['nutrients']
+                calories = calories or totals['calories']
+
+        record_date = _parse_date(_require(meal_data, 'date'))
+        return {
+            'user_id': user_id,
+            'client_id': _client_id(meal_data),
+            'content_hash': _content_hash(meal_data),
+            'date': record_date.isoformat(),
+            'record_date': record_date,
+            'meal_type': meal_data.get('meal_type'),
+            'foods': foods,
+            'nutrients': nutrients,
+            'calories': calories,
+            'image_path': meal_data.get('image_path'),
+            'ai_analysis': _json_value(meal_data, 'ai_analysis', dict, {})
+        }
+    
+    @staticmethod
+    def _supplement_analysis_values(user_id: str, analysis_data: dict) -> dict:
+        return {
+            'user_id': user_id,
+            'client_id': _client_id(analysis_data),
+            'content_hash': _content_hash(analysis_data),
+            'analysis_result': _json_value(analysis_data, 'analysis_result', dict, {}),
+            'recommended_supplements': _json_value(analysis_data, 'recommended_supplements', list, []),
+            'deficient_nutrients': _json_value(analysis_data, 'deficient_nutrients', list, [])
+        }
+    
+    @staticmethod
+    def _health_checkup_values(user_id: str, checkup_data: dict) -> dict:
+        return {
+            'user_id': user_id,
+            'client_id': _client_id(checkup_data),
+            'content_hash': _content_hash(checkup_data),
+            'checkup_date': _require(checkup_data, 'checkup_date'),
+            'checkup_data': _json_value(checkup_data, 'checkup_data', dict, {}),
+            'ai_analysis': _json_value(checkup_data, 'ai_analysis', dict, {}),
+            'status': checkup_data.get('status', ''),
+            'image_path': checkup_data.get('image_path')
+        }
+    
+    @staticmethod
+    def _fact_check_values(user_id: str, fact_check_data: dict) -> dict:
+        return {
+            'user_id': user_id,
+            'client_id': _client_id(fact_check_data),
+            'content_hash': _content_hash(fact_check_data),
+            'query': fact_check_data.get('query', ''),
+            'source_type': fact_check_data.get('source_type', 'text'),
+            'credibility_score': float(fact_check_data.get('credibility_score', 0) or 0),
+            'fact_check_result': _json_value(fact_check_data, 'fact_check_result', dict, {})
+        }
+    
+    @staticmethod
+    def _medication_values(user_id: str, medication_data: dict) -> dict:
+        record_date = _parse_date(_require(medication_data, 'date'))
+        return {
+            'user_id': user_id,
+            'client_id': _client_id(medication_data),
+            'content_hash': _content_hash(medication_data),
+            'date': record_date.isoformat(),
+            'record_date': record_date,
+            'medication_name': _require(medication_data, 'medication_name'),
+            'dosage': medication_data.get('dosage'),
+            'taken': bool(medication_data.get('taken', False)),
+            'taken_time': medication_data.get('taken_time')
+        }
+    
+    @staticmethod
+    def _assign_client_id(db: Session, model, values: dict) -> dict:
+        """단건 추가 레코드의 client_id (없으면 동기화와 같은 내용 해시 ID, 같은 내용이 있으면 다음 번호)"""
+        if values['client_id'] is None:
+            content_hash = values['content_hash']
+            taken = set(db.scalars(
+                select(model.client_id).where(
+                    model.user_id == values['user_id'],
+                    or_(model.client_id == content_hash, model.client_id.like(f"{content_hash}#%"))
+                )
+            ))
+            occurrence = 1
+            while _hash_client_id(content_hash, occurrence) in taken:
+                occurrence += 1
+            values['client_id'] = _hash_client_id(content_hash, occurrence)
+        return values
+    
     # 사용자 관련 메서드
     @staticmethod
     def create_user(db: Session, user_data: dict) -> User:
@@ -47,18 +257,14 @@ class DatabaseService:
     @staticmethod
     def add_meal_record(db: Session, user_id: str, meal_data: dict) -> MealRecord:
         """식사 기록 추가"""
-        db_meal = MealRecord(
-            user_id=user_id,
-            date=meal_data.get('date'),
-            meal_type=meal_data.get('meal_type'),
-            foods=meal_data.get('foods', []),
-            nutrients=meal_data.get('nutrients', {}),
-            calories=float(meal_data.get('calories', 0)),
-            image_path=meal_data.get('image_path'),
-            ai_analysis=meal_data.get('ai_analysis', {})
-        )
+        db_meal = MealRecord(**DatabaseService._assign_client_id(
+            db, MealRecord, DatabaseService._meal_values(user_id, meal_data)
+        ))
+        db_meal.updated_seq = DatabaseService._allocate_seq(db, user_id, counts={MealRecord: 1})
         db.add(db_meal)
+        DatabaseService._refresh_daily_summaries(db, user_id, {db_meal.record_date})
         db.commit()
+        statistics_cache.invalidate(user_id)
         db.refresh(db_meal)
         return db_meal
     
@@ -67,44 +273,43 @@ class DatabaseService:
         """특정 날짜의 식사 기록 조회"""
         return db.query(MealRecord).filter(
             MealRecord.user_id == user_id,
-            MealRecord.date == date
-        ).all()
+            MealRecord.record_date == _parse_date(date)
+        ).order_by(MealRecord.id).all()
     
     @staticmethod
     def get_meals_by_date_range(db: Session, user_id: str, start_date: str, end_date: str) -> List[MealRecord]:
         """날짜 범위의 식사 기록 조회"""
         return db.query(MealRecord).filter(
             MealRecord.user_id == user_id,
-            MealRecord.date >= start_date,
-            MealRecord.date <= end_date
-        ).all()
+            MealRecord.record_date >= _parse_date(start_date),
+            MealRecord.record_date <= _parse_date(end_date)
+        ).order_by(MealRecord.record_date, MealRecord.id).all()
     
     # 영양제 분석 관련 메서드
     @staticmethod
     def save_supplement_analysis(db: Session, user_id: str, analysis_data: dict) -> SupplementAnalysis:
         """영양제 분석 결과 저장"""
-        db_analysis = SupplementAnalysis(
-            user_id=user_id,
-            analysis_result=analysis_data.get('analysis_result', {}),
-            recommended_supplements=analysis_data.get('recommended_supplements', []),
-            deficient_nutrients=analysis_data.get('deficient_nutrients', [])
-        )
+        db_analysis = SupplementAnalysis(**DatabaseService._assign_client_id(
+            db, SupplementAnalysis, DatabaseService._supplement_analysis_values(user_id, analysis_data)
+        ))
+        db_analysis.updated_seq = DatabaseService._allocate_seq(db, user_id, counts={SupplementAnalysis: 1})
         db.add(db_analysis)
         db.commit()
+        statistics_cache.invalidate(user_id)
         db.refresh(db_analysis)
         return db_analysis
     
     @staticmethod
     def get_latest_supplement_analysis(db: Session, user_id: str) -> Optional[SupplementAnalysis]:
         """최신 영양제 분석 결과 조회"""
-        return db.query(SupplementAnalysis).filter(
+        return db.query(SupplementAnalysis).options(undefer_group('details')).filter(
             SupplementAnalysis.user_id == user_id
         ).order_by(SupplementAnalysis.created_at.desc()).first()
     
     @staticmethod
     def get_supplement_analysis_history(db: Session, user_id: str, limit: int = 10) -> List[SupplementAnalysis]:
         """영양제 분석 기록 조회"""
-        return db.query(SupplementAnalysis).filter(
+        return db.query(SupplementAnalysis).options(undefer_group('details')).filter(
             SupplementAnalysis.user_id == user_id
         ).order_by(SupplementAnalysis.created_at.desc()).limit(limit).all()
     
@@ -112,30 +317,27 @@ class DatabaseService:
     @staticmethod
     def save_health_checkup(db: Session, user_id: str, checkup_data: dict) -> HealthCheckup:
         """건강검진 결과 저장"""
-        db_checkup = HealthCheckup(
-            user_id=user_id,
-            checkup_date=checkup_data.get('checkup_date'),
-            checkup_data=checkup_data.get('checkup_data', {}),
-            ai_analysis=checkup_data.get('ai_analysis', {}),
-            status=checkup_data.get('status', ''),
-            image_path=checkup_data.get('image_path')
-        )
+        db_checkup = HealthCheckup(**DatabaseService._assign_client_id(
+            db, HealthCheckup, DatabaseService._health_checkup_values(user_id, checkup_data)
+        ))
+        db_checkup.updated_seq = DatabaseService._allocate_seq(db, user_id, counts={HealthCheckup: 1})
         db.add(db_checkup)
         db.commit()
+        statistics_cache.invalidate(user_id)
         db.refresh(db_checkup)
         return db_checkup
     
     @staticmethod
     def get_latest_health_checkup(db: Session, user_id: str) -> Optional[HealthCheckup]:
         """최신 건강검진 결과 조회"""
-        return db.query(HealthCheckup).filter(
+        return db.query(HealthCheckup).options(undefer_group('details')).filter(
             HealthCheckup.user_id == user_id
         ).order_by(HealthCheckup.created_at.desc()).first()
     
     @staticmethod
     def get_health_checkup_history(db: Session, user_id: str, limit: int = 10) -> List[HealthCheckup]:
         """건강검진 기록 조회"""
-        return db.query(HealthCheckup).filter(
+        return db.query(HealthCheckup).options(undefer_group('details')).filter(
             HealthCheckup.user_id == user_id
         ).order_by(HealthCheckup.created_at.desc()).limit(limit).all()
     
@@ -143,22 +345,20 @@ class DatabaseService:
     @staticmethod
     def save_fact_check(db: Session, user_id: str, fact_check_data: dict) -> FactCheck:
         """팩트체크 결과 저장"""
-        db_fact_check = FactCheck(
-            user_id=user_id,
-            query=fact_check_data.get('query', ''),
-            source_type=fact_check_data.get('source_type', 'text'),
-            credibility_score=float(fact_check_data.get('credibility_score', 0)),
-            fact_check_result=fact_check_data.get('fact_check_result', {})
-        )
+        db_fact_check = FactCheck(**DatabaseService._assign_client_id(
+            db, FactCheck, DatabaseService._fact_check_values(user_id, fact_check_data)
+        ))
+        db_fact_check.updated_seq = DatabaseService._allocate_seq(db, user_id, counts={FactCheck: 1})
         db.add(db_fact_check)
         db.commit()
+        statistics_cache.invalidate(user_id)
         db.refresh(db_fact_check)
         return db_fact_check
     
     @staticmethod
     def get_fact_check_history(db: Session, user_id: str, limit: int = 15) -> List[FactCheck]:
         """팩트체크 기록 조회"""
-        return db.query(FactCheck).filter(
+        return db.query(FactCheck).options(undefer_group('details')).filter(
             FactCheck.user_id == user_id
         ).order_by(FactCheck.created_at.desc()).limit(limit).all()
     
@@ -166,16 +366,14 @@ class DatabaseService:
     @staticmethod
     def add_medication_record(db: Session, user_id: str, medication_data: dict) -> MedicationRecord:
         """복용 기록 추가"""
-        db_medication = MedicationRecord(
-            user_id=user_id,
-            date=medication_data.get('date'),
-            medication_name=medication_data.get('medication_name'),
-            dosage=medication_data.get('dosage'),
-            taken=medication_data.get('taken', False),
-            taken_time=medication_data.get('taken_time')
-        )
+        db_medication = MedicationRecord(**DatabaseService._assign_client_id(
+            db, MedicationRecord, DatabaseService._medication_values(user_id, medication_data)
+        ))
+        db_medication.updated_seq = DatabaseService._allocate_seq(db, user_id, counts={MedicationRecord: 1})
         db.add(db_medication)
+        DatabaseService._refresh_daily_summaries(db, user_id, {db_medication.record_date})
         db.commit()
+        statistics_cache.invalidate(user_id)
         db.refresh(db_medication)
         return db_medication
     
@@ -184,13 +382,15 @@ class DatabaseService:
         """복용 상태 업데이트"""
         db_medication = db.query(MedicationRecord).filter(
             MedicationRecord.user_id == user_id,
-            MedicationRecord.date == date,
+            MedicationRecord.record_date == _parse_date(date),
             MedicationRecord.medication_name == medication_name
         ).first()
         
         if db_medication:
             db_medication.taken = taken
             db_medication.taken_time = datetime.utcnow() if taken else None
+            db_medication.updated_seq = DatabaseService._allocate_seq(db, user_id)
+            DatabaseService._refresh_daily_summaries(db, user_id, {db_medication.record_date})
             db.commit()
             db.refresh(db_medication)
         return db_medication
@@ -200,67 +400,506 @@ class DatabaseService:
         """특정 날짜의 복용 기록 조회"""
         return db.query(MedicationRecord).filter(
             MedicationRecord.user_id == user_id,
-            MedicationRecord.date == date
+            MedicationRecord.record_date == _parse_date(date)
+        ).order_by(MedicationRecord.id).all()
+    
+    # 목록 조회 (키셋 페이지네이션 + 필드 선택)
+    # 필드를 지정하지 않았을 때 기존 응답과 같은 필드
+    DEFAULT_LIST_FIELDS = {
+        MealRecord: ('id', 'date', 'meal_type', 'foods', 'nutrients', 'calories', 'image_path', 'ai_analysis', 'created_at'),
+        FactCheck: ('id', 'query', 'source_type', 'credibility_score', 'fact_check_result', 'created_at'),
+        MedicationRecord: ('id', 'date', 'medication_name', 'dosage', 'taken', 'taken_time', 'created_at'),
+    }
+    
+    @staticmethod
+    def _list_records(db: Session, model, user_id: str, criteria: tuple = (), fields=None,
+                      cursor: Optional[str] = None, limit: int = 20, raw_json: bool = False) -> dict:
+        """(created_at, id) 내림차순 키셋 페이지네이션, 요청한 컬럼만 SELECT
+        
+        raw_json=True이면 JSON 컬럼을 텍스트로 읽어 orjson.Fragment로 반환합니다 (ORJSONResponse 전용).
+        """
+        if isinstance(fields, str):
+            fields = [field.strip() for field in fields.split(',') if field.strip()]
+        fields = list(fields or DatabaseService.DEFAULT_LIST_FIELDS[model])
+        
+        available = {column.name for column in model.__table__.columns} - set(INTERNAL_COLUMNS)
+        unknown = [field for field in fields if field not in available]
+        if unknown:
+            raise ValueError(f"알 수 없는 필드입니다: {', '.join(unknown)}")
+        # 다음 페이지 커서를 만들기 위해 id, created_at은 항상 포함
+        for required in ('id', 'created_at'):
+            if required not in fields:
+                fields.append(required)
+        
+        columns = [model.__table__.c[field] for field in fields]
+        raw_fields = {column.name for column in columns if raw_json and isinstance(column.type, JSON)}
+        stmt = select(*(
+            cast(column, Text).label(column.name) if column.name in raw_fields else column
+            for column in columns
+        )).where(model.user_id == user_id, *criteria)
+        if cursor:
+            created_at, record_id = _decode_cursor(cursor)
+            stmt = stmt.where(or_(
+                model.created_at < created_at,
+                and_(model.created_at == created_at, model.id < record_id)
+            ))
+        rows = db.execute(
+            stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+        ).mappings().all()
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            'items': [
+                {field: _raw_json(row[field]) if field in raw_fields else _json_ready(row[field]) for field in fields}
+                for row in rows
+            ],
+            'next_cursor': _encode_cursor(rows[-1]['created_at'], rows[-1]['id']) if has_more else None
+        }
+    
+    @staticmethod
+    def list_meals(db: Session, user_id: str, date: Optional[str] = None, start_date: Optional[str] = None,
+                   end_date: Optional[str] = None, fields=None, cursor: Optional[str] = None, limit: int = 100,
+                   raw_json: bool = False) -> dict:
+        """식사 기록 목록 (날짜 또는 날짜 범위)"""
+        if date:
+            criteria = (MealRecord.record_date == _parse_date(date),)
+        else:
+            criteria = (
+                MealRecord.record_date >= _parse_date(start_date),
+                MealRecord.record_date <= _parse_date(end_date)
+            )
+        return DatabaseService._list_records(db, MealRecord, user_id, criteria, fields, cursor, limit, raw_json)
+    
+    @staticmethod
+    def list_fact_checks(db: Session, user_id: str, fields=None, cursor: Optional[str] = None, limit: int = 15,
+                         raw_json: bool = False) -> dict:
+        """팩트체크 기록 목록"""
+        return DatabaseService._list_records(db, FactCheck, user_id, (), fields, cursor, limit, raw_json)
+    
+    @staticmethod
+    def list_medications(db: Session, user_id: str, date: str, fields=None,
+                         cursor: Optional[str] = None, limit: int = 100, raw_json: bool = False) -> dict:
+        """특정 날짜의 복용 기록 목록"""
+        criteria = (MedicationRecord.record_date == _parse_date(date),)
+        return DatabaseService._list_records(db, MedicationRecord, user_id, criteria, fields, cursor, limit, raw_json)
+    
+    # 일별 요약 관련 메서드
+    @staticmethod
+    def _refresh_daily_summaries(db: Session, user_id: str, dates) -> None:
+        """해당 날짜들의 일별 요약을 원본 기록으로 다시 계산 (커밋은 호출한 쪽에서)"""
+        dates = sorted({day for day in dates if day is not None})
+        if not dates:
+            return
+        db.flush()
+        
+        summaries = {
+            day: {'calories': 0.0, 'nutrients': {}, 'meal_count': 0, 'medication_total': 0, 'medication_taken': 0}
+            for day in dates
+        }
+        meals = db.execute(
+            select(MealRecord.record_date, MealRecord.calories, MealRecord.nutrients)
+            .where(MealRecord.user_id == user_id, MealRecord.record_date.in_(dates))
+        )
+        for record_date, calories, nutrients in meals:
+            summary = summaries[record_date]
+            summary['meal_count'] += 1
+            summary['calories'] += calories or 0
+            for name, value in (nutrients or {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    summary['nutrients'][name] = summary['nutrients'].get(name, 0) + value
+        
+        medications = db.execute(
+            select(
+                MedicationRecord.record_date,
+                func.count(),
+                func.sum(case((MedicationRecord.taken.is_(True), 1), else_=0))
+            )
+            .where(MedicationRecord.user_id == user_id, MedicationRecord.record_date.in_(dates))
+            .group_by(MedicationRecord.record_date)
+        )
+        for record_date, total, taken in medications:
+            summaries[record_date]['medication_total'] = total
+            summaries[record_date]['medication_taken'] = taken or 0
+        
+        db.execute(
+            delete(DailyUserSummary)
+            .where(DailyUserSummary.user_id == user_id, DailyUserSummary.summary_date.in_(dates))
+        )
+        rows = []
+        for day, summary in summaries.items():
+            if not summary['meal_count'] and not summary['medication_total']:
+                continue
+            rows.append({
+                'user_id': user_id,
+                'summary_date': day,
+                'calories': round(summary['calories'], 1),
+                'nutrients': {name: round(value, 1) for name, value in summary['nutrients'].items()},
+                'meal_count': summary['meal_count'],
+                'medication_total': summary['medication_total'],
+                'medication_taken': summary['medication_taken'],
+                'updated_at': datetime.utcnow()
+            })
+        if rows:
+            db.execute(insert(DailyUserSummary), rows)
+    
+    @staticmethod
+    def rebuild_daily_summaries(db: Session) -> int:
+        """전체 사용자의 일별 요약 재계산 (기존 DB 마이그레이션용), 계산한 사용자 수 반환"""
+        days = {}
+        for model in (MealRecord, MedicationRecord):
+            for user_id, record_date in db.execute(
+                select(model.user_id, model.record_date).where(model.record_date.is_not(None)).distinct()
+            ):
+                days.setdefault(user_id, set()).add(record_date)
+        for user_id, dates in days.items():
+            DatabaseService._refresh_daily_summaries(db, user_id, dates)
+        return len(days)
+    
+    @staticmethod
+    def get_daily_summaries(db: Session, user_id: str, start_date: str, end_date: str) -> List[dict]:
+        """기간별 일별 요약 조회 (최대 366일)"""
+        start, end = _parse_date(start_date), _parse_date(end_date)
+        if start > end:
+            raise ValueError("시작 날짜가 종료 날짜보다 늦습니다.")
+        if end - start > timedelta(days=366):
+            raise ValueError("조회 기간은 366일을 넘을 수 없습니다.")
+        
+        summaries = db.scalars(
+            select(DailyUserSummary)
+            .where(
+                DailyUserSummary.user_id == user_id,
+                DailyUserSummary.summary_date >= start,
+                DailyUserSummary.summary_date <= end
+            )
+            .order_by(DailyUserSummary.summary_date)
         ).all()
+        return [
+            {
+                'date': summary.summary_date.isoformat(),
+                'calories': summary.calories,
+                'nutrients': summary.nutrients or {},
+                'meal_count': summary.meal_count,
+                'medication_total': summary.medication_total,
+                'medication_taken': summary.medication_taken,
+                'adherence_rate': (
+                    round(summary.medication_taken / summary.medication_total, 2)
+                    if summary.medication_total else None
+                )
+            }
+            for summary in summaries
+        ]
     
     # 통계 관련 메서드
     @staticmethod
-    def get_user_statistics(db: Session, user_id: str) -> dict:
-        """사용자 데이터 통계"""
-        meal_count = db.query(MealRecord).filter(MealRecord.user_id == user_id).count()
-        supplement_count = db.query(SupplementAnalysis).filter(SupplementAnalysis.user_id == user_id).count()
-        checkup_count = db.query(HealthCheckup).filter(HealthCheckup.user_id == user_id).count()
-        fact_check_count = db.query(FactCheck).filter(FactCheck.user_id == user_id).count()
-        medication_count = db.query(MedicationRecord).filter(MedicationRecord.user_id == user_id).count()
+    def get_user_statistics(db: Session, user_id: str, version: Optional[int] = None) -> dict:
+        """사용자 데이터 통계 (기록 수 컬럼 한 행 조회 + TTL 캐시)
         
-        return {
-            'meals': meal_count,
-            'supplement_analyses': supplement_count,
-            'health_checkups': checkup_count,
-            'fact_checks': fact_check_count,
-            'medication_records': medication_count
+        version(get_data_version 결과)을 주면 같은 버전에서 만든 캐시만 사용합니다
+        (다른 워커에서 저장해 버전이 바뀌었으면 다시 조회).
+        """
+        cached = statistics_cache.get(user_id)
+        if cached is not None and (version is None or cached[0] == version):
+            return dict(cached[1])
+        
+        state = db.get(UserSyncState, user_id)
+        stats = {
+            key: (getattr(state, COUNTER_COLUMNS[model.__tablename__]) or 0) if state else 0
+            for key, _, model, _ in DatabaseService.SYNC_TABLES
         }
+        statistics_cache.set(user_id, ((state.last_seq or 0) if state else 0, stats))
+        return dict(stats)
+    
+    # 변경 순번 관련 메서드
+    @staticmethod
+    def get_data_version(db: Session, user_id: str) -> int:
+        """사용자 데이터 버전 (기록이 바뀔 때마다 증가하는 마지막 변경 순번, ETag용)"""
+        return db.execute(
+            select(UserSyncState.last_seq).where(UserSyncState.user_id == user_id)
+        ).scalar() or 0
+    
+    @staticmethod
+    def _allocate_seq(db: Session, user_id: str, count: int = 1, counts: Optional[dict] = None) -> int:
+        """사용자별 변경 순번 count개를 할당하고 첫 번호 반환 (커밋은 호출한 쪽에서)
+        
+        counts({모델: 증감})가 있으면 같은 UPDATE에서 사용자별 기록 수도 갱신합니다.
+        """
+        initial = {'user_id': user_id, 'last_seq': 0, **{name: 0 for name in COUNTER_COLUMNS.values()}}
+        insert_fn = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+        if insert_fn is not None:
+            db.execute(
+                insert_fn(UserSyncState).values(**initial)
+                .on_conflict_do_nothing(index_elements=[UserSyncState.user_id])
+            )
+        elif db.get(UserSyncState, user_id) is None:
+            db.add(UserSyncState(**initial))
+            db.flush()
+        
+        values = {'last_seq': UserSyncState.last_seq + count}
+        for model, delta in (counts or {}).items():
+            if delta:
+                column = getattr(UserSyncState, COUNTER_COLUMNS[model.__tablename__])
+                values[column.key] = column + delta
+        
+        # UPDATE ... RETURNING으로 증가시켜 동시 요청에서도 번호가 겹치지 않음
+        last_seq = db.execute(
+            update(UserSyncState)
+            .where(UserSyncState.user_id == user_id)
+            .values(**values)
+            .returning(UserSyncState.last_seq)
+        ).scalar_one()
+        return last_seq - count + 1
     
     # 데이터 동기화 관련 메서드
+    # (요청 키, 결과 키, 모델, 값 변환 함수)
+    SYNC_TABLES = [
+        ('meals', 'synced_meals', MealRecord, '_meal_values'),
+        ('supplement_analyses', 'synced_analyses', SupplementAnalysis, '_supplement_analysis_values'),
+        ('health_checkups', 'synced_checkups', HealthCheckup, '_health_checkup_values'),
+        ('fact_checks', 'synced_fact_checks', FactCheck, '_fact_check_values'),
+        ('medication_records', 'synced_medications', MedicationRecord, '_medication_values'),
+    ]
+    
+    @staticmethod
+    def _upsert_rows(db: Session, model, rows: List[dict]) -> List[int]:
+        """(user_id, client_id) 기준 INSERT ... ON CONFLICT DO UPDATE 후 id 반환"""
+        insert_fn = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+        if insert_fn is None:
+            # ON CONFLICT를 지원하지 않는 DB는 미리 분류한 신규 행만 들어오므로 일반 INSERT
+            stmt = insert(model)
+        else:
+            stmt = insert_fn(model)
+            update_columns = [key for key in rows[0] if key not in ('user_id', 'client_id')]
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[model.user_id, model.client_id],
+                set_={key: stmt.excluded[key] for key in update_columns}
+            )
+        return list(db.scalars(stmt.returning(model.id, sort_by_parameter_order=True), rows).all())
+    
     @staticmethod
     def sync_user_data(db: Session, user_id: str, sync_data: dict) -> dict:
-        """클라이언트와 서버 데이터 동기화"""
-        result = {
-            'synced_meals': 0,
-            'synced_analyses': 0,
-            'synced_checkups': 0,
-            'synced_fact_checks': 0,
-            'synced_medications': 0
-        }
+        """클라이언트와 서버 데이터 동기화 (중복 없는 일괄 UPSERT, 단일 트랜잭션)
+        
+        레코드는 앱이 보낸 client_id(또는 id)로 식별하고, 없으면 내용 해시를 ID로 사용합니다
+        (단건 추가 API와 같은 ID라 POST로 저장한 레코드를 다시 동기화해도 중복되지 않음).
+        내용이 같은 레코드가 여러 개면 순서대로 "해시#2", "해시#3"을 붙여 별도 레코드로 저장하고,
+        이미 같은 내용이 저장된 레코드는 건너뛰므로 재시도해도 행이 늘어나지 않습니다.
+        """
+        result = {result_key: 0 for _, result_key, _, _ in DatabaseService.SYNC_TABLES}
+        result.update({'inserted': 0, 'updated': 0, 'skipped': 0, 'tables': {}, 'ids': {}, 'errors': []})
         
-        # 식사 기록 동기화
-        if 'meals' in sync_data:
-            for meal_data in sync_data['meals']:
-                DatabaseService.add_meal_record(db, user_id, meal_data)
-                result['synced_meals'] += 1
+        # 1. 전체 페이로드 검증 (잘못된 항목은 건너뛰고 위치와 사유를 보고)
+        prepared = []
+        for key, result_key, model, values_fn in DatabaseService.SYNC_TABLES:
+            rows = {}
+            duplicates = 0
+            occurrences = {}  # 내용 해시별 등장 횟수 (ID 없는 레코드)
+            for index, item in enumerate(sync_data.get(key) or []):
+                try:
+                    if not isinstance(item, dict):
+                        raise ValueError("레코드 형식이 올바르지 않습니다.")
+                    values = getattr(DatabaseService, values_fn)(user_id, item)
+                except (TypeError, ValueError) as e:
+                    result['errors'].append({'table': key, 'index': index, 'error': str(e)})
+                    continue
+                if values['client_id'] is None:
+                    occurrence = occurrences[values['content_hash']] = occurrences.get(values['content_hash'], 0) + 1
+                    values['client_id'] = _hash_client_id(values['content_hash'], occurrence)
+                if values['client_id'] in rows:
+                    # 같은 요청 안의 중복은 마지막 항목만 반영
+                    duplicates += 1
+                rows[values['client_id']] = values
+            prepared.append((key, result_key, model, list(rows.values()), duplicates))
         
-        # 영양제 분석 동기화
-        if 'supplement_analyses' in sync_data:
-            for analysis_data in sync_data['supplement_analyses']:
-                DatabaseService.save_supplement_analysis(db, user_id, analysis_data)
-                result['synced_analyses'] += 1
+        # 2. 테이블별로 기존 행과 비교 후 변경분만 UPSERT, 마지막에 한 번만 커밋
+        summary_dates = set()
+        try:
+            for key, result_key, model, rows, duplicates in prepared:
+                counts = {'inserted': 0, 'updated': 0, 'skipped': duplicates}
+                ids = {}
+                if rows:
+                    # 날짜가 바뀐 레코드는 이전 날짜의 일별 요약도 다시 계산해야 하므로 함께 조회
+                    columns = [model.id, model.client_id, model.content_hash]
+                    if 'record_date' in model.__table__.c:
+                        columns.append(model.record_date)
+                    existing = {
+                        row.client_id: row
+                        for row in db.execute(
+                            select(*columns).where(
+                                model.user_id == user_id,
+                                model.client_id.in_([row['client_id'] for row in rows])
+                            )
+                        )
+                    }
+                    
+                    changed = []
+                    for row in rows:
+                        current = existing.get(row['client_id'])
+                        if current is None:
+                            counts['inserted'] += 1
+                            changed.append(row)
+                        elif current.content_hash != row['content_hash']:
+                            counts['updated'] += 1
+                            changed.append(row)
+                            summary_dates.add(getattr(current, 'record_date', None))
+                        else:
+                            counts['skipped'] += 1
+                            ids[row['client_id']] = current.id
+                            continue
+                        summary_dates.add(row.get('record_date'))
+                    
+                    if changed:
+                        first_seq = DatabaseService._allocate_seq(
+                            db, user_id, len(changed), counts={model: counts['inserted']}
+                        )
+                        for seq, row in enumerate(changed, start=first_seq):
+                            row['updated_seq'] = seq
+                        upserted = DatabaseService._upsert_rows(db, model, changed)
+                        ids.update(zip((row['client_id'] for row in changed), upserted))
+                
+                result[result_key] = counts['inserted'] + counts['updated']
+                result['tables'][key] = counts
+                result['ids'][key] = ids
+                for name, count in counts.items():
+                    result[name] += count
+            DatabaseService._refresh_daily_summaries(db, user_id, summary_dates)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        statistics_cache.invalidate(user_id)
+        result['failed'] = len(result['errors'])
+        return result
+    
+    @staticmethod
+    def delete_record(db: Session, user_id: str, table: str, record_id: int) -> bool:
+        """레코드 삭제 후 툼스톤 기록"""
+        models = {key: model for key, _, model, _ in DatabaseService.SYNC_TABLES}
+        if table not in models:
+            raise ValueError(f"알 수 없는 테이블입니다: {table}")
+        model = models[table]
         
-        # 건강검진 동기화
-        if 'health_checkups' in sync_data:
-            for checkup_data in sync_data['health_checkups']:
-                DatabaseService.save_health_checkup(db, user_id, checkup_data)
-                result['synced_checkups'] += 1
+        returning = [model.client_id]
+        if 'record_date' in model.__table__.c:
+            returning.append(model.record_date)
+        deleted = db.execute(
+            delete(model).where(model.id == record_id, model.user_id == user_id).returning(*returning)
+        ).first()
+        if deleted is None:
+            db.rollback()
+            return False
+        
+        DatabaseService._refresh_daily_summaries(db, user_id, {getattr(deleted, 'record_date', None)})
+        
+        db.add(DeletedRecord(
+            user_id=user_id,
+            table_name=table,
+            record_id=record_id,
+            client_id=deleted.client_id,
+            deleted_seq=DatabaseService._allocate_seq(db, user_id, counts={model: -1})
+        ))
+        db.commit()
+        statistics_cache.invalidate(user_id)
+        return True
+    
+    @staticmethod
+    def get_changes(db: Session, user_id: str, since: int = 0, limit: int = 500) -> dict:
+        """since 순번 이후 변경된 레코드와 삭제 기록 조회 (순번 오름차순, 최대 limit건)"""
+        entries = []
+        for key, _, model, _ in DatabaseService.SYNC_TABLES:
+            records = db.scalars(
+                select(model)
+                .options(undefer_group('details'))
+                .where(model.user_id == user_id, model.updated_seq > since)
+                .order_by(model.updated_seq)
+                .limit(limit)
+            ).all()
+            entries.extend((record.updated_seq, 'changes', key, record_to_dict(record)) for record in records)
         
-        # 팩트체크 동기화
-        if 'fact_checks' in sync_data:
-            for fact_check_data in sync_data['fact_checks']:
-                DatabaseService.save_fact_check(db, user_id, fact_check_data)
-                result['synced_fact_checks'] += 1
+        tombstones = db.scalars(
+            select(DeletedRecord)
+            .where(DeletedRecord.user_id == user_id, DeletedRecord.deleted_seq > since)
+            .order_by(DeletedRecord.deleted_seq)
+            .limit(limit)
+        ).all()
+        entries.extend(
+            (t.deleted_seq, 'deleted', t.table_name, {'id': t.record_id, 'client_id': t.client_id, 'seq': t.deleted_seq})
+            for t in tombstones
+        )
         
-        # 복용 기록 동기화
-        if 'medication_records' in sync_data:
-            for medication_data in sync_data['medication_records']:
-                DatabaseService.add_medication_record(db, user_id, medication_data)
-                result['synced_medications'] += 1
+        # 테이블별로 limit건씩 읽었으므로 전체 순번 기준 앞의 limit건은 모두 포함됨
+        entries.sort(key=lambda entry: entry[0])
+        has_more = len(entries) > limit
+        entries = entries[:limit]
         
-        return result
\ No newline at end of file
+        result = {
+            'changes': {key: [] for key, _, _, _ in DatabaseService.SYNC_TABLES},
+            'deleted': {key: [] for key, _, _, _ in DatabaseService.SYNC_TABLES},
+            'cursor': entries[-1][0] if entries else since,
+            'has_more': has_more
+        }
+        for _, kind, key, data in entries:
+            result[kind].setdefault(key, []).append(data)
+        return result
+
+
+def _record_id(record) -> int:
+    return record.id
+
+def _optional_dict(record) -> Optional[dict]:
+    return record_to_dict(record) if record is not None else None
+
+def _user_dict(user) -> Optional[dict]:
+    # 사용자 테이블의 user_id는 앱에 돌려주는 값이므로 포함
+    return record_to_dict(user, exclude=()) if user is not None else None
+
+def _run_in_session(name: str, serialize=None):
+    """DatabaseService 메서드를 AsyncSession.run_sync로 실행하는 비동기 메서드 생성
+    
+    ORM 객체는 세션 밖에서 지연 로딩할 수 없으므로 결과 변환도 run_sync 안에서 끝냅니다.
+    """
+    method = getattr(DatabaseService, name)
+    
+    async def run(db: AsyncSession, *args, **kwargs):
+        def call(session: Session):
+            result = method(session, *args, **kwargs)
+            return serialize(result) if serialize else result
+        return await db.run_sync(call)
+    
+    run.__name__ = name
+    run.__doc__ = method.__doc__
+    return staticmethod(run)
+
+
+class AsyncDatabaseService:
+    """비동기 엔드포인트용 DatabaseService (쿼리 동안 이벤트 루프를 막지 않음)
+    
+    ORM 객체 대신 id 또는 dict를 반환합니다.
+    """
+    create_user = _run_in_session('create_user', _user_dict)
+    get_user_by_id = _run_in_session('get_user_by_id', _user_dict)
+    update_user = _run_in_session('update_user', _user_dict)
+    
+    add_meal_record = _run_in_session('add_meal_record', _record_id)
+    list_meals = _run_in_session('list_meals')
+    
+    save_supplement_analysis = _run_in_session('save_supplement_analysis', _record_id)
+    get_latest_supplement_analysis = _run_in_session('get_latest_supplement_analysis', _optional_dict)
+    
+    save_health_checkup = _run_in_session('save_health_checkup', _record_id)
+    get_latest_health_checkup = _run_in_session('get_latest_health_checkup', _optional_dict)
+    
+    save_fact_check = _run_in_session('save_fact_check', _record_id)
+    list_fact_checks = _run_in_session('list_fact_checks')
+    
+    add_medication_record = _run_in_session('add_medication_record', _record_id)
+    update_medication_taken = _run_in_session('update_medication_taken', _optional_dict)
+    list_medications = _run_in_session('list_medications')
+    
+    get_daily_summaries = _run_in_session('get_daily_summaries')
+    get_user_statistics = _run_in_session('get_user_statistics')
+    get_data_version = _run_in_session('get_data_version')
+    sync_user_data = _run_in_session('sync_user_data')
+    get_changes = _run_in_session('get_changes')
+    delete_record = _run_in_session('delete_record')
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+음식명 정규화 인덱스
+
+AI가 자유 텍스트로 돌려준 음식 라벨("김치", "배추 김치", "kimchi" 등)을
+KoreanFoodClassifier.food_database의 표준 음식명(음식 ID)으로 변환합니다.
+
+1. 정확히 일치: 공백/대소문자를 정규화한 키(앞뒤 분량 단어를 뗀 키 포함)를 트라이에서 조회
+2. 부분 일치: Aho-Corasick으로 라벨 안에 포함된 가장 긴 음식명 탐색
+   (나머지가 분량/수식어뿐일 때만 인정 — "김치볶음밥"은 "배추김치"가 아님)
+3. 유사 일치: 자모 단위 편집 거리로 BK-트리 검색 (부분 일치를 거절한 라벨은 오타 수준만)
+"""
+import re
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from korean_food_classifier import korean_classifier
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+_STRIP_PATTERN = re.compile(r"[\s\-_.,·()\[\]/]+")
+
+# 부분 일치에 사용할 최소 키 길이 ("밥"이 "볶음밥"에 걸리지 않도록)
+MIN_SUBSTRING_KEY_LENGTH = 2
+
+# 부분 일치 후 남은 부분이 이 단어들로만 이루어져야 같은 음식으로 봄 ("배추김치 한 접시", "1인분")
+_PORTION_WORDS = (
+    r"(?:\d+|한|두|세|반|약간|조금|소량|접시|그릇|공기|인분|조각|개|컵|잔|"
+    r"a|an|one|some|bowl|plate|serving|piece|cup|side|of)"
+)
+_PORTION_PATTERN = re.compile(_PORTION_WORDS + "*")
+# 라벨 앞뒤의 분량 단어 ("밥 한 공기" → "밥")
+_PORTION_EDGES = re.compile(f"^{_PORTION_WORDS}+|{_PORTION_WORDS}+$")
+# 나머지가 분량 단어가 아니어도 음식명이 라벨의 이만큼을 덮으면 같은 음식으로 봄
+MIN_SUBSTRING_COVERAGE = 0.9
+# 다른 음식의 재료로 보이는 라벨("김치찌게" ⊃ "김치")은 오타 정도의 거리만 유사 일치로 인정
+# ("김치볶음밥"이 다른 음식으로 매칭되지 않도록)
+MAX_DISTANCE_AFTER_SUBSTRING = 1
+
+
+class FoodMatch(NamedTuple):
+    food_id: str      # 표준 음식명
+    category: str     # 김치류, 국물류 등
+    method: str       # exact / substring / fuzzy
+    distance: int     # 유사 일치일 때 자모 편집 거리
+
+
+def normalize_label(label: str) -> str:
+    """비교용 키로 정규화 (NFC, 소문자, 공백/구두점 제거)"""
+    text = unicodedata.normalize("NFC", label).lower()
+    return _STRIP_PATTERN.sub("", text)
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 분해"""
+    result = []
+    for char in text:
+        code = ord(char) - 0xAC00
+        if 0 <= code < 11172:
+            result.append(_CHOSEONG[code // 588])
+            result.append(_JUNGSEONG[(code % 588) // 28])
+            if code % 28:
+                result.append(_JONGSEONG[code % 28])
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """레벤슈타인 거리 (max_distance를 넘으면 조기 종료)"""
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class _AhoCorasick:
+    """여러 음식명을 한 번에 찾는 Aho-Corasick 오토마톤 (트라이 + 실패 링크)"""
+
+    def __init__(self, keys: Dict[str, str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[Tuple[str, str]]] = [[]]
+
+        for key, value in keys.items():
+            node = 0
+            for char in key:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node].append((key, value))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                candidate = self.goto[fallback].get(char, 0)
+                self.fail[child] = candidate if candidate != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def exact(self, text: str) -> Optional[str]:
+        """트라이에서 정확히 일치하는 키 조회"""
+        node = 0
+        for char in text:
+            node = self.goto[node].get(char)
+            if node is None:
+                return None
+        for key, value in self.output[node]:
+            if key == text:
+                return value
+        return None
+
+    def longest_match(self, text: str) -> Optional[Tuple[str, str]]:
+        """텍스트에 포함된 가장 긴 키 탐색"""
+        node, best = 0, None
+        for char in text:
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for key, value in self.output[node]:
+                if best is None or len(key) > len(best[0]):
+                    best = (key, value)
+        return best
+
+
+class _BKTree:
+    """자모 편집 거리 기반 BK-트리"""
+
+    def __init__(self):
+        self.root: Optional[Tuple[str, str, Dict[int, tuple]]] = None
+
+    def add(self, key: str, value: str):
+        if self.root is None:
+            self.root = (key, value, {})
+            return
+        node = self.root
+        while True:
+            distance = edit_distance(key, node[0])
+            if distance == 0:
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (key, value, {})
+                return
+            node = child
+
+    def search(self, key: str, max_distance: int) -> Optional[Tuple[str, int]]:
+        """max_distance 이내에서 가장 가까운 값 탐색"""
+        if self.root is None:
+            return None
+        best = None
+        stack = [self.root]
+        while stack:
+            node_key, value, children = stack.pop()
+            distance = edit_distance(key, node_key)
+            if distance <= max_distance and (best is None or distance < best[1]):
+                best = (value, distance)
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return best
+
+
+class FoodNameIndex:
+    def __init__(self, classifier=korean_classifier, cache_size: int = 4096):
+        self.categories: Dict[str, str] = {}
+        keys: Dict[str, str] = {}
+
+        for category, foods in classifier.food_database.items():
+            for food_name in foods:
+                self.categories[food_name] = category
+                keys[normalize_label(food_name)] = food_name
+
+        aliases = getattr(classifier, "food_aliases", {})
+        for food_name, names in aliases.items():
+            if food_name not in self.categories:
+                raise ValueError(f"분류 데이터베이스에 없는 음식의 별칭입니다: {food_name}")
+            for alias in names:
+                keys.setdefault(normalize_label(alias), food_name)
+
+        self.generic_terms = {normalize_label(term) for term in getattr(classifier, "generic_terms", [])}
+
+        self._trie = _AhoCorasick(keys)
+        self._substring = _AhoCorasick({
+            key: value for key, value in keys.items() if len(key) >= MIN_SUBSTRING_KEY_LENGTH
+        })
+        self._bk_tree = _BKTree()
+        for key, value in keys.items():
+            self._bk_tree.add(to_jamo(key), value)
+
+        self._match_cached = lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, key: str) -> Optional[FoodMatch]:
+        if not key or key in self.generic_terms:
+            return None
+
+        # 분량 단어를 뗀 이름으로도 정확히 일치하는지 ("밥 한 공기"의 한 글자 별칭 "밥")
+        core = _PORTION_EDGES.sub("", key) or key
+        for candidate in dict.fromkeys((key, core)):
+            food_id = self._trie.exact(candidate)
+            if food_id:
+                return FoodMatch(food_id, self.categories[food_id], "exact", 0)
+
+        max_distance = None
+        found = self._substring.longest_match(key)
+        if found:
+            matched, food_id = found
+            rest = key.replace(matched, "", 1)
+            if _PORTION_PATTERN.fullmatch(rest) or len(matched) / len(key) >= MIN_SUBSTRING_COVERAGE:
+                return FoodMatch(food_id, self.categories[food_id], "substring", 0)
+            # 다른 음식의 재료일 수 있음 ("김치볶음밥", "미역국밥") — 오타("김치찌게")만 유사 일치로 인정
+            max_distance = MAX_DISTANCE_AFTER_SUBSTRING
+
+        jamo = to_jamo(core)
+        if max_distance is None:
+            max_distance = max(1, len(jamo) // 4)
+        found = self._bk_tree.search(jamo, max_distance)
+        if found:
+            food_id, distance = found
+            return FoodMatch(food_id, self.categories[food_id], "fuzzy", distance)
+        return None
+
+    def match(self, label: str) -> Optional[FoodMatch]:
+        """라벨을 표준 음식명으로 매칭 (매칭 실패 시 None)"""
+        if not isinstance(label, str):
+            return None
+        return self._match_cached(normalize_label(label))
+
+    def resolve(self, label: str) -> Optional[str]:
+        """라벨의 표준 음식 ID 반환"""
+        found = self.match(label)
+        return found.food_id if found else None
+
+    def is_generic(self, label: str) -> bool:
+        """"음식", "Food"처럼 구체적이지 않은 라벨인지 확인"""
+        if not isinstance(label, str):
+            return True
+        key = normalize_label(label)
+        return not key or key in self.generic_terms
+
+
+# 전역 인스턴스
+food_name_index = FoodNameIndex()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+한국 음식 영양성분 로컬 데이터베이스
+
+KoreanFoodClassifier.food_database의 음식명을 키로 1인분 기준 영양성분을 보관하고,
+식사별 영양소 합계를 LLM 추정 없이 결정적으로 계산합니다.
+"""
+from array import array
+from typing import Dict, List, Optional, Union
+
+from food_name_index import food_name_index
+
+# 영양소 필드 순서 (값 배열의 열 순서와 동일)
+NUTRIENT_FIELDS = ("calories", "carbs", "protein", "fat", "fiber", "sodium", "calcium", "iron")
+
+NUTRIENT_UNITS = {
+    "calories": "kcal",
+    "carbs": "g",
+    "protein": "g",
+    "fat": "g",
+    "fiber": "g",
+    "sodium": "mg",
+    "calcium": "mg",
+    "iron": "mg",
+}
+
+# 1인분 기준 영양성분 (식품의약품안전처 식품영양성분 DB 대표값 기준 근사치)
+# 음식명: (1인분 g, (calories, carbs, protein, fat, fiber, sodium, calcium, iron))
+FOOD_NUTRIENTS = {
+    # 김치류
+    "배추김치": (50, (16, 2.7, 1.0, 0.3, 1.2, 500, 24, 0.3)),
+    "깍두기": (50, (17, 3.0, 0.8, 0.2, 1.0, 380, 20, 0.2)),
+    "총각김치": (50, (18, 3.2, 1.0, 0.2, 1.3, 420, 30, 0.3)),
+    "오이소박이": (50, (12, 2.2, 0.7, 0.2, 0.8, 330, 14, 0.2)),
+    # 국물류
+    "된장국": (250, (60, 6.0, 5.0, 2.0, 2.0, 900, 60, 1.2)),
+    "미역국": (250, (70, 3.0, 7.0, 3.5, 1.5, 850, 70, 1.5)),
+    "김치찌개": (300, (180, 9.0, 13.0, 10.0, 2.5, 1500, 70, 1.5)),
+    "순두부찌개": (300, (190, 7.0, 14.0, 12.0, 1.5, 1300, 110, 2.0)),
+    "콩나물국": (250, (30, 3.0, 3.0, 1.0, 1.2, 700, 25, 0.5)),
+    # 볶음류
+    "오징어콩나물볶음": (120, (140, 9.0, 15.0, 5.0, 1.5, 650, 40, 1.0)),
+    "콩나물볶음": (70, (50, 4.0, 3.0, 2.5, 1.5, 300, 20, 0.5)),
+    "오징어볶음": (150, (220, 14.0, 24.0, 7.0, 2.0, 900, 40, 1.2)),
+    "제육볶음": (150, (350, 12.0, 24.0, 22.0, 1.5, 900, 25, 1.5)),
+    # 나물류
+    "시금치나물": (70, (40, 3.5, 2.5, 2.0, 2.0, 320, 60, 1.8)),
+    "콩나물무침": (70, (35, 3.0, 2.8, 1.8, 1.5, 280, 20, 0.4)),
+    "도라지무침": (70, (60, 11.0, 1.5, 1.2, 2.5, 350, 30, 0.6)),
+    "미역줄기볶음": (70, (45, 4.0, 1.0, 3.0, 2.0, 600, 80, 0.8)),
+    # 밥류
+    "흰밥": (210, (310, 68.0, 5.5, 0.6, 0.6, 5, 6, 0.4)),
+    "현미밥": (210, (300, 64.0, 6.5, 2.0, 3.0, 5, 12, 1.0)),
+    "잡곡밥": (210, (305, 65.0, 7.0, 1.5, 3.5, 5, 15, 1.2)),
+    # 반찬류
+    "계란말이": (60, (110, 2.0, 8.0, 7.5, 0.2, 280, 35, 1.0)),
+    "멸치볶음": (25, (80, 7.0, 8.0, 2.5, 0.5, 450, 300, 1.0)),
+    "어묵볶음": (60, (110, 12.0, 6.0, 4.5, 0.5, 550, 30, 0.5)),
+}
+
+# 65세 이상 1일 섭취기준 (한국인 영양소 섭취기준 2020), 끼니당 목표는 1/3
+DAILY_TARGETS = {
+    "남성": {"protein": 60, "calcium": 700, "fiber": 25, "iron": 9},
+    "여성": {"protein": 50, "calcium": 800, "fiber": 20, "iron": 8},
+}
+
+# 부족 영양소 판정 대상과 안내 문구
+LACKING_NUTRIENT_GUIDE = {
+    "protein": ("단백질", "다음 식사에 계란말이 1개 또는 두부 반 모 추가"),
+    "calcium": ("칼슘", "다음 식사에 멸치볶음 한 접시 또는 우유 한 잔 추가"),
+    "fiber": ("식이섬유", "다음 식사에 나물 반찬 한 가지 추가 또는 잡곡밥으로 변경"),
+    "iron": ("철분", "다음 식사에 시금치나물 또는 살코기 반찬 추가"),
+}
+
+MealItem = Union[str, dict]
+
+
+class FoodNutritionDB:
+    def __init__(self, table: Dict[str, tuple] = FOOD_NUTRIENTS, name_index=None):
+        self.name_index = name_index
+        width = len(NUTRIENT_FIELDS)
+        self._index: Dict[str, int] = {}
+        self._serving_grams = array("f")
+        self._values = array("d")
+
+        for name, (grams, values) in table.items():
+            if len(values) != width:
+                raise ValueError(f"{name}: 영양소 값 개수가 {width}개가 아닙니다.")
+            self._index[self._key(name)] = len(self._serving_grams)
+            self._serving_grams.append(grams)
+            self._values.extend(values)
+
+        self._names = list(table.keys())
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return "".join(name.split())
+
+    def __contains__(self, food_name: str) -> bool:
+        return self.resolve(food_name) is not None
+
+    @property
+    def food_names(self) -> List[str]:
+        return list(self._names)
+
+    def resolve(self, food_name: str) -> Optional[str]:
+        """음식명을 데이터베이스의 표준 음식명으로 변환"""
+        if not isinstance(food_name, str):
+            return None
+        row = self._index.get(self._key(food_name))
+        if row is None and self.name_index is not None:
+            # 별칭/오타는 음식명 정규화 인덱스로 표준 음식 ID로 변환
+            food_id = self.name_index.resolve(food_name)
+            row = self._index.get(self._key(food_id)) if food_id else None
+        return self._names[row] if row is not None else None
+
+    def lookup(self, food_name: str, portion: float = 1.0) -> Optional[dict]:
+        """음식 1개의 영양성분 조회 (portion: 인분 단위)"""
+        canonical = self.resolve(food_name)
+        if canonical is None:
+            return None
+
+        row = self._index[self._key(canonical)]
+        width = len(NUTRIENT_FIELDS)
+        values = self._values[row * width:(row + 1) * width]
+        return {
+            "name": canonical,
+            "portion": portion,
+            "grams": round(self._serving_grams[row] * portion, 1),
+            "nutrients": {field: round(v * portion, 1) for field, v in zip(NUTRIENT_FIELDS, values)},
+        }
+
+    def compute_meal_totals(self, items: List[MealItem]) -> dict:
+        """식사 한 끼의 영양소 합계 계산
+
+        items는 음식명 문자열 또는 {"name": ..., "portion": ...} 딕셔너리 리스트입니다.
+        """
+        width = len(NUTRIENT_FIELDS)
+        totals = [0.0] * width
+        matched, unmatched = [], []
+
+        for item in items or []:
+            if isinstance(item, dict):
+                name = item.get("name", "")
+                portion = _parse_portion(item.get("portion"))
+            else:
+                name, portion = item, 1.0
+
+            canonical = self.resolve(name)
+            if canonical is None:
+                if name:
+                    unmatched.append(name)
+                continue
+
+            offset = self._index[self._key(canonical)] * width
+            for i in range(width):
+                totals[i] += self._values[offset + i] * portion
+            matched.append({"name": canonical, "portion": portion})
+
+        nutrients = {field: round(total, 1) for field, total in zip(NUTRIENT_FIELDS, totals)}
+        return {
+            "calories": nutrients["calories"],
+            "nutrients": nutrients,
+            "matched_foods": matched,
+            "unmatched_foods": unmatched,
+        }
+
+    def find_lacking_nutrient(self, nutrients: dict, gender: str = "") -> Optional[dict]:
+        """끼니당 섭취기준 대비 가장 부족한 영양소 판정"""
+        targets = DAILY_TARGETS.get(gender) or DAILY_TARGETS["여성"]
+
+        lacking_key, lowest_ratio = None, None
+        for key, daily in targets.items():
+            ratio = float(nutrients.get(key, 0) or 0) / (daily / 3)
+            if lowest_ratio is None or ratio < lowest_ratio:
+                lacking_key, lowest_ratio = key, ratio
+
+        if lacking_key is None or lowest_ratio >= 1.0:
+            return None
+
+        label, action_plan = LACKING_NUTRIENT_GUIDE[lacking_key]
+        return {
+            "nutrient": lacking_key,
+            "name": label,
+            "ratio": round(lowest_ratio, 2),
+            "action_plan": action_plan,
+        }
+
+
+def _parse_portion(value) -> float:
+    """인분 값을 양수 실수로 변환 (잘못된 값은 1인분)"""
+    try:
+        portion = float(value)
+    except (TypeError, ValueError):
+        return 1.0
+    return portion if portion > 0 else 1.0
+
+
+# 전역 인스턴스
+nutrition_db = FoodNutritionDB(name_index=food_name_index)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+백그라운드 의존성 점검 (readiness)
+
+/readyz와 /api/health는 요청마다 STS/Bedrock/DB를 호출하지 않고, 백그라운드 스레드가
+HEALTH_PROBE_INTERVAL초마다 갱신한 점검 결과를 그대로 돌려줍니다.
+필수 점검(required)이 실패하면 준비되지 않은 상태, 선택 점검만 실패하면 degraded입니다.
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "30"))
+
+
+class Probe(NamedTuple):
+    check: Callable[[], Optional[dict]]   # 실패하면 예외, 성공하면 추가 정보(dict) 또는 None
+    required: bool = False                # 실패 시 트래픽을 받지 않아야 하는지
+
+
+class HealthMonitor:
+    def __init__(self, interval: float = HEALTH_PROBE_INTERVAL):
+        self.interval = interval
+        self.probes: Dict[str, Probe] = {}
+        self.results: Dict[str, dict] = {}
+        self.refreshed_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, check: Callable[[], Optional[dict]], required: bool = False):
+        self.probes[name] = Probe(check, required)
+
+    def refresh(self):
+        """모든 점검을 한 번 실행하고 결과를 교체"""
+        results = {}
+        for name, probe in self.probes.items():
+            start = time.perf_counter()
+            try:
+                detail = probe.check()
+                result = {"ok": True}
+                if detail:
+                    result.update(detail)
+            except Exception as e:
+                result = {"ok": False, "error": f"{type(e).__name__}: {e}"[:200]}
+            result["required"] = probe.required
+            result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            results[name] = result
+        self.results = results
+        self.refreshed_at = time.time()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ 헬스 점검 갱신 실패: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """백그라운드 점검 시작 (이미 실행 중이면 무시)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def status(self) -> str:
+        """starting (아직 점검 전) / not_ready (필수 실패) / degraded (선택 실패) / ready"""
+        if self.refreshed_at is None:
+            return "starting"
+        results = self.results.values()
+        if any(result["required"] and not result["ok"] for result in results):
+            return "not_ready"
+        if not all(result["ok"] for result in results):
+            return "degraded"
+        return "ready"
+
+    @property
+    def ready(self) -> bool:
+        return self.status in ("ready", "degraded")
+
+    def snapshot(self) -> dict:
+        return {
+            "status": self.status,
+            "checked_at": self.refreshed_at,
+            "age_seconds": round(time.time() - self.refreshed_at, 1) if self.refreshed_at else None,
+            "checks": self.results,
+        }
+
+
+# 전역 점검기 (점검 항목은 api_server에서 등록)
+health_monitor = HealthMonitor()
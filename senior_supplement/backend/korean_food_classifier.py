@@ -122,7 +122,37 @@ class KoreanFoodClassifier:
                 }
             }
         }
-    
+
+        # 표준 음식명별 별칭 (AI 응답에 자주 나오는 표기, 영문명 포함)
+        self.food_aliases = {
+            "배추김치": ["김치", "포기김치", "kimchi", "napa cabbage kimchi"],
+            "깍두기": ["무김치", "kkakdugi", "radish kimchi"],
+            "총각김치": ["알타리김치", "chonggak kimchi"],
+            "오이소박이": ["오이김치", "cucumber kimchi"],
+            "된장국": ["된장찌개", "시래기된장국", "doenjang soup", "soybean paste soup"],  # 영양성분 유사
+            "미역국": ["seaweed soup", "miyeokguk"],
+            "김치찌개": ["kimchi stew", "kimchi jjigae"],
+            "순두부찌개": ["순두부", "soft tofu stew", "sundubu jjigae"],
+            "콩나물국": ["bean sprout soup", "kongnamul guk"],
+            "오징어콩나물볶음": ["콩나물오징어볶음"],
+            "콩나물볶음": [],
+            "오징어볶음": ["stir-fried squid", "ojingeo bokkeum"],
+            "제육볶음": ["제육", "돼지고기볶음", "spicy pork", "jeyuk bokkeum"],
+            "시금치나물": ["시금치", "시금치무침", "spinach namul"],
+            "콩나물무침": ["콩나물", "콩나물나물", "bean sprout salad", "kongnamul muchim"],
+            "도라지무침": ["도라지", "도라지나물", "bellflower root"],
+            "미역줄기볶음": ["미역줄기"],
+            "흰밥": ["밥", "쌀밥", "흰쌀밥", "백미밥", "공기밥", "rice", "white rice", "steamed rice"],
+            "현미밥": ["brown rice"],
+            "잡곡밥": ["오곡밥", "콩밥", "mixed grain rice"],
+            "계란말이": ["달걀말이", "rolled omelette", "egg roll"],
+            "멸치볶음": ["잔멸치볶음", "stir-fried anchovies"],
+            "어묵볶음": ["오뎅볶음", "fish cake"],
+        }
+
+        # 구체적인 음식명이 아닌 일반적인 라벨
+        self.generic_terms = ["Food", "Meal", "Dish", "음식", "식사", "요리", "반찬", "한식"]
+
     def get_detailed_classification_prompt(self):
         """상세한 한국 음식 분류 프롬프트 생성"""
         prompt = """
@@ -175,5 +205,25 @@ class KoreanFoodClassifier:
             "조리 방법은 무엇으로 보이나요? (볶음, 무침, 끓임 등)"
         ]
 
+    def get_item_verification_prompt(self, candidate_name):
+        """잘라낸 음식 영역 하나를 재검증하는 짧은 프롬프트"""
+        questions = "\n".join(
+            f"{i+1}. {q}" for i, q in enumerate(self.get_verification_questions())
+        )
+        return f"""
+사진은 식단 이미지에서 음식 하나만 잘라낸 영역입니다.
+1차 분석에서는 "{candidate_name or '알 수 없음'}"(으)로 분류되었지만 확신도가 낮았습니다.
+
+다음 검증 질문에 답하면서 이 음식 하나만 정확히 다시 분류해주세요:
+{questions}
+
+JSON 형식으로 응답:
+{{
+  "verification_answers": ["각 질문에 대한 짧은 답변"],
+  "food_name": "재검증된 정확한 한국 음식명",
+  "confidence": 0.0
+}}
+"""
+
 # 전역 인스턴스
 korean_classifier = KoreanFoodClassifier()
\ No newline at end of file
@@ -6,6 +6,7 @@ import json
 import requests
 import uuid
 from datetime import datetime
+from food_nutrition_db import nutrition_db
 
 # API 서버 URL
 BASE_URL = "http://localhost:8000"
@@ -134,21 +135,19 @@ def migrate_sample_meal_data(user_id):
         for meal in meals:
             total_count += 1
             
-            # 영양소 정보 생성 (샘플)
-            nutrients = {
-                "protein": round(meal['calories'] * 0.15 / 4, 1),  # 단백질 15%
-                "carbs": round(meal['calories'] * 0.55 / 4, 1),    # 탄수화물 55%
-                "fat": round(meal['calories'] * 0.30 / 9, 1),      # 지방 30%
-                "fiber": round(meal['calories'] * 0.02, 1),        # 식이섬유
-                "sodium": round(meal['calories'] * 2, 1),          # 나트륨
-            }
+            # 영양소 정보는 로컬 영양성분 DB에서 계산 (DB에 없는 음식은 제외)
+            totals = nutrition_db.compute_meal_totals(meal['foods'])
+            nutrients = totals['nutrients'] if totals['matched_foods'] else {}
+            calories = totals['calories'] if totals['matched_foods'] else meal['calories']
+            if totals['unmatched_foods']:
+                print(f"  ℹ️ 영양성분 DB에 없는 음식: {', '.join(totals['unmatched_foods'])}")
             
             meal_data = {
                 "date": date,
                 "meal_type": meal['type'],
                 "foods": meal['foods'],
                 "nutrients": nutrients,
-                "calories": float(meal['calories']),
+                "calories": float(calories),
                 "image_path": meal['image'],
                 "ai_analysis": {
                     "detected_foods": meal['foods'],
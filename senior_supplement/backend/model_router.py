@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+작업별 Bedrock 모델 선택 (작은 모델 우선 + 큰 모델 재시도)
+
+짧은 텍스트 작업(검진 수치 해석, 텍스트 팩트체크)은 빠른 소형 모델로 처리하고,
+이미지/RAG 종합 작업은 기존 대형 모델을 사용합니다.
+소형 모델의 응답이 형식에 맞지 않거나 확신도가 낮으면 대형 모델로 한 번 더 호출합니다.
+작업별 지연 시간, 토큰, 예상 비용을 기록해 /api/health에서 확인할 수 있습니다.
+"""
+import os
+import threading
+from collections import deque
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+FAST_MODEL_ID = os.getenv("BEDROCK_FAST_MODEL_ID", "us.anthropic.claude-3-5-haiku-20241022-v1:0")
+MODEL_ROUTING_ENABLED = os.getenv("MODEL_ROUTING", "on").lower() not in ("off", "false", "0")
+ESCALATION_CONFIDENCE = float(os.getenv("MODEL_ESCALATION_CONFIDENCE", "0.6"))
+
+# 이미지 입력을 받지 못하는 모델
+TEXT_ONLY_MODELS = ("claude-3-5-haiku",)
+
+# 100만 토큰당 달러 (입력, 출력). 캐시 읽기는 입력의 10%, 캐시 쓰기는 125%로 계산
+MODEL_PRICES = (
+    ("claude-3-5-haiku", (0.8, 4.0)),
+    ("claude-haiku-4-5", (1.0, 5.0)),
+    ("claude-3-haiku", (0.25, 1.25)),
+    ("claude-3-5-sonnet", (3.0, 15.0)),
+    ("claude-3-7-sonnet", (3.0, 15.0)),
+    ("claude-sonnet-4", (3.0, 15.0)),
+    ("claude-opus-4", (15.0, 75.0)),
+)
+
+
+def _confident(result: dict) -> bool:
+    # 모델이 직접 답한 확신도가 있으면 기준 이상인지 확인 (없으면 통과)
+    confidence = result.get("confidence")
+    return confidence is None or confidence >= ESCALATION_CONFIDENCE
+
+def _checkup_ok(result: dict) -> bool:
+    return result.get("status") in ("정상", "주의", "위험") and bool(result.get("content")) and _confident(result)
+
+def _fact_check_ok(result: dict) -> bool:
+    return (result.get("overall_credibility") in ("높음", "보통", "낮음")
+            and bool(result.get("fact_check_result")) and _confident(result))
+
+def _verification_ok(result: dict) -> bool:
+    return bool(result.get("food_name")) and _confident(result)
+
+
+class Route(NamedTuple):
+    tier: str                                   # fast: 소형 모델 우선 / large: 대형 모델만
+    max_fast_chars: int = 0                     # 이보다 긴 입력은 바로 대형 모델
+    accept: Optional[Callable[[dict], bool]] = None  # 소형 모델 결과를 그대로 쓸지 판단
+
+
+ROUTES: Dict[str, Route] = {
+    "checkup_text": Route("fast", max_fast_chars=2000, accept=_checkup_ok),
+    "text_fact_check": Route("fast", max_fast_chars=1500, accept=_fact_check_ok),
+    "food_verification": Route("fast", max_fast_chars=1000, accept=_verification_ok),
+    "checkup_image": Route("large"),
+    "meal_vision": Route("large"),
+    "supplement_plan": Route("large"),
+    "video_fact_check": Route("large"),
+    "default": Route("large"),
+}
+
+
+def estimate_cost(model_id: str, usage: dict) -> float:
+    """converse usage로 예상 비용(달러) 계산 (가격표에 없는 모델은 0)"""
+    for name, (input_price, output_price) in MODEL_PRICES:
+        if name in model_id:
+            input_tokens = (usage.get("inputTokens", 0)
+                            + usage.get("cacheReadInputTokens", 0) * 0.1
+                            + usage.get("cacheWriteInputTokens", 0) * 1.25)
+            return (input_tokens * input_price + usage.get("outputTokens", 0) * output_price) / 1_000_000
+    return 0.0
+
+
+class RouteStats:
+    def __init__(self, window: int = 500):
+        self.calls = 0
+        self.escalations = 0
+        self.errors = 0
+        self.models: Dict[str, int] = {}
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost_usd = 0.0
+        self.latencies_ms = deque(maxlen=window)
+
+    def snapshot(self) -> dict:
+        latencies = sorted(self.latencies_ms)
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 1) if latencies else None
+
+        return {
+            "calls": self.calls,
+            "escalations": self.escalations,
+            "errors": self.errors,
+            "models": dict(self.models),
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+        }
+
+
+class ModelRouter:
+    def __init__(self, large_model_id: str, fast_model_id: str = FAST_MODEL_ID,
+                 routes: Dict[str, Route] = ROUTES, enabled: bool = MODEL_ROUTING_ENABLED):
+        self.large_model_id = large_model_id
+        self.fast_model_id = fast_model_id
+        self.routes = routes
+        self.enabled = enabled
+        self._stats: Dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def route(self, task: str) -> Route:
+        return self.routes.get(task, self.routes["default"])
+
+    def candidates(self, task: str, input_chars: int = 0, has_image: bool = False) -> List[str]:
+        """호출할 모델 순서 (소형 모델 → 대형 모델, 또는 대형 모델만)"""
+        route = self.route(task)
+        use_fast = (
+            self.enabled
+            and route.tier == "fast"
+            and input_chars <= route.max_fast_chars
+            and not (has_image and any(name in self.fast_model_id for name in TEXT_ONLY_MODELS))
+        )
+        return [self.fast_model_id, self.large_model_id] if use_fast else [self.large_model_id]
+
+    def accepts(self, task: str, result: dict) -> bool:
+        """소형 모델 결과를 그대로 사용할지 (아니면 대형 모델로 재시도)"""
+        accept = self.route(task).accept
+        return isinstance(result, dict) and (accept is None or accept(result))
+
+    def _task_stats(self, task: str) -> RouteStats:
+        stats = self._stats.get(task)
+        if stats is None:
+            stats = self._stats.setdefault(task, RouteStats())
+        return stats
+
+    def record(self, task: str, model_id: str, elapsed: float, usage: Optional[dict] = None):
+        """한 번의 모델 호출 기록 (지연 시간은 초 단위)"""
+        usage = usage or {}
+        with self._lock:
+            stats = self._task_stats(task)
+            stats.calls += 1
+            stats.models[model_id] = stats.models.get(model_id, 0) + 1
+            stats.latencies_ms.append(elapsed * 1000)
+            stats.input_tokens += usage.get("inputTokens", 0)
+            stats.output_tokens += usage.get("outputTokens", 0)
+            stats.cost_usd += estimate_cost(model_id, usage)
+
+    def record_escalation(self, task: str):
+        with self._lock:
+            self._task_stats(task).escalations += 1
+
+    def record_error(self, task: str):
+        with self._lock:
+            self._task_stats(task).errors += 1
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            routes = {task: stats.snapshot() for task, stats in self._stats.items()}
+        return {
+            "enabled": self.enabled,
+            "fast_model": self.fast_model_id,
+            "large_model": self.large_model_id,
+            "routes": routes,
+        }
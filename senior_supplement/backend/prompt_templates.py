@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+프롬프트 템플릿 레지스트리
+
+prompts 폴더의 모든 템플릿을 시작 시 한 번 읽어 고정 문자열/변수 조각 목록으로 컴파일하고,
+요청마다 디스크를 읽지 않고 한 번의 join으로 렌더링합니다.
+파일 수정 시간(mtime)이 바뀐 경우에만 다시 로드합니다.
+"""
+import os
+import re
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+VARIABLE_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+DEFAULT_PROMPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts")
+
+
+class PromptTemplateError(ValueError):
+    """템플릿 변수가 누락되었거나 알 수 없는 변수가 전달된 경우"""
+
+
+class PromptParts(NamedTuple):
+    """캐시 가능한 고정 앞부분과 사용자별 뒷부분으로 나눈 시스템 프롬프트"""
+    static: Tuple[str, ...]
+    dynamic: str
+
+    def __str__(self):
+        return "".join(self.static) + self.dynamic
+
+
+class PromptTemplate:
+    def __init__(self, name: str, source: str, mtime: float = 0.0):
+        self.name = name
+        self.mtime = mtime
+
+        # literals[0] + vars[0] + literals[1] + ... + literals[-1]
+        literals, variables = [], []
+        position = 0
+        for match in VARIABLE_PATTERN.finditer(source):
+            literals.append(source[position:match.start()])
+            variables.append(match.group(1))
+            position = match.end()
+        literals.append(source[position:])
+
+        self.literals: Tuple[str, ...] = tuple(literals)
+        self.variables: Tuple[str, ...] = tuple(variables)
+        self.variable_names = frozenset(variables)
+
+    def validate(self, variables: dict):
+        """누락되었거나 알 수 없는 변수 확인"""
+        missing = self.variable_names - variables.keys()
+        unknown = variables.keys() - self.variable_names
+        if missing or unknown:
+            details = []
+            if missing:
+                details.append(f"누락된 변수: {', '.join(sorted(missing))}")
+            if unknown:
+                details.append(f"알 수 없는 변수: {', '.join(sorted(unknown))}")
+            raise PromptTemplateError(f"{self.name} 템플릿 오류 ({'; '.join(details)})")
+
+    @property
+    def static_prefix(self) -> str:
+        """첫 변수 앞까지의 고정 문자열 (프롬프트 캐시 대상)"""
+        return self.literals[0]
+
+    def _render_suffix(self, variables: dict) -> str:
+        self.validate(variables)
+        values = {key: str(value) for key, value in variables.items()}
+
+        parts = []
+        for name, literal in zip(self.variables, self.literals[1:]):
+            parts.append(values[name])
+            parts.append(literal)
+        return "".join(parts)
+
+    def render(self, variables: dict) -> str:
+        """변수를 치환한 프롬프트 문자열 반환"""
+        return self.literals[0] + self._render_suffix(variables)
+
+    def render_parts(self, variables: dict, extra_static: Tuple[str, ...] = ()) -> PromptParts:
+        """고정 앞부분(+추가 고정 블록)과 변수가 들어간 뒷부분으로 나눠 렌더링"""
+        suffix = self._render_suffix(variables)
+        return PromptParts((self.literals[0],) + tuple(extra_static), suffix)
+
+
+class PromptRegistry:
+    def __init__(self, prompts_dir: str = DEFAULT_PROMPTS_DIR, check_interval: float = 2.0):
+        self.prompts_dir = prompts_dir
+        self.check_interval = check_interval
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def _scan(self) -> Dict[str, float]:
+        """템플릿 파일별 mtime 조회"""
+        if not os.path.isdir(self.prompts_dir):
+            return {}
+        return {
+            entry.name: entry.stat().st_mtime
+            for entry in os.scandir(self.prompts_dir)
+            if entry.is_file() and entry.name.endswith(".txt")
+        }
+
+    def reload(self, force: bool = True):
+        """변경된 템플릿만 다시 읽어 컴파일"""
+        with self._lock:
+            mtimes = self._scan()
+            templates = {}
+            for name, mtime in mtimes.items():
+                current = self._templates.get(name)
+                if not force and current is not None and current.mtime == mtime:
+                    templates[name] = current
+                    continue
+                with open(os.path.join(self.prompts_dir, name), "r", encoding="utf-8") as f:
+                    templates[name] = PromptTemplate(name, f.read(), mtime)
+            self._templates = templates
+            self._last_check = time.monotonic()
+
+    def _refresh_if_stale(self):
+        if time.monotonic() - self._last_check >= self.check_interval:
+            self.reload(force=False)
+
+    def get(self, filename: str) -> PromptTemplate:
+        """컴파일된 템플릿 조회"""
+        self._refresh_if_stale()
+        template = self._templates.get(filename)
+        if template is None:
+            raise FileNotFoundError(
+                f"파일을 찾을 수 없습니다: {os.path.abspath(os.path.join(self.prompts_dir, filename))}"
+            )
+        return template
+
+    def render(self, filename: str, variables: Optional[dict] = None) -> str:
+        """템플릿을 렌더링한 프롬프트 반환"""
+        return self.get(filename).render(variables or {})
+
+    def render_parts(self, filename: str, variables: Optional[dict] = None,
+                     extra_static: Tuple[str, ...] = ()) -> PromptParts:
+        """템플릿을 캐시 가능한 고정 부분과 사용자별 부분으로 나눠 렌더링"""
+        return self.get(filename).render_parts(variables or {}, extra_static)
+
+
+# 전역 인스턴스 (서버 시작 시 모든 템플릿 컴파일)
+prompt_registry = PromptRegistry()
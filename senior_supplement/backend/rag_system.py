@@ -1,35 +1,72 @@
 #!/usr/bin/env python3
+import importlib.util
 import os
 import sqlite3
+import time
 import pickle
 import numpy as np
 from typing import List, Dict, Any
-import boto3
 import json
+from aws_clients import get_client, get_session
+from circuit_breaker import CircuitOpenError, embedding_breaker
 
-try:
-    import faiss
-    FAISS_AVAILABLE = True
-except ImportError:
-    FAISS_AVAILABLE = False
+# faiss import는 느려서(numpy/distutils 로드) 인덱스를 읽을 때 처음 import
+faiss = None
+FAISS_AVAILABLE = importlib.util.find_spec("faiss") is not None
+if not FAISS_AVAILABLE:
     print("⚠️ FAISS가 설치되지 않았습니다. pip install faiss-cpu 를 실행해주세요.")
 
+def _import_faiss():
+    global faiss
+    if faiss is None:
+        import faiss as faiss_module
+        faiss = faiss_module
+    return faiss
+
 class RAGSystem:
-    def __init__(self, data_path="../data"):
+    def __init__(self, data_path="../data", lazy=False):
+        """lazy=True면 인덱스를 바로 읽지 않음 (load()를 백그라운드에서 호출, 그동안 검색은 SQLite 폴백)"""
         self.data_path = data_path
         self.db_path = os.path.join(data_path, "medicines.db")
         self.faiss_index_path = os.path.join(data_path, "mfds_faiss_index", "index.faiss")
         self.faiss_pkl_path = os.path.join(data_path, "mfds_faiss_index", "index.pkl")
         self.clean_pkl_path = os.path.join(data_path, "mfds_faiss_index", "index_clean.pkl")  # 깨끗한 메타데이터
         
-        # AWS Bedrock 클라이언트
-        self.session = boto3.Session()
-        self.bedrock = self.session.client(service_name='bedrock-runtime', region_name='us-east-1')
+        # AWS Bedrock 클라이언트 (임베딩용 짧은 타임아웃 프로필, 처음 사용할 때 생성)
+        self._bedrock = None
         
-        # FAISS 인덱스와 메타데이터 로드
+        # FAISS 인덱스와 메타데이터 (not_loaded → loading → loaded / unavailable)
         self.index = None
         self.metadata = None
+        self.state = "not_loaded"
+        if not lazy:
+            self.load()
+    
+    @property
+    def session(self):
+        return get_session()
+    
+    @property
+    def bedrock(self):
+        if self._bedrock is None:
+            self._bedrock = get_client("embeddings")
+        return self._bedrock
+    
+    @bedrock.setter
+    def bedrock(self, client):
+        self._bedrock = client
+    
+    @property
+    def is_ready(self) -> bool:
+        return self.index is not None and self.metadata is not None
+    
+    def load(self):
+        """FAISS 인덱스와 메타데이터 로드 (검색은 둘 다 준비된 뒤에만 FAISS 사용)"""
+        self.state = "loading"
+        start = time.time()
         self._load_faiss_index()
+        self.state = "loaded" if self.is_ready else "unavailable"
+        print(f"📚 RAG 시스템 {self.state} ({time.time() - start:.1f}초)")
         
     def _load_faiss_index(self):
         """FAISS 인덱스와 메타데이터를 로드합니다."""
@@ -40,7 +77,7 @@ class RAGSystem:
         try:
             if os.path.exists(self.faiss_index_path):
                 # FAISS 인덱스 로드
-                self.index = faiss.read_index(self.faiss_index_path)
+                self.index = _import_faiss().read_index(self.faiss_index_path)
                 print(f"✅ FAISS 인덱스 로드 완료: {self.index.ntotal}개 문서")
                 
                 # 깨끗한 메타데이터 우선 시도
@@ -64,7 +101,7 @@ class RAGSystem:
                             docstore = original_data[0]
                             if hasattr(docstore, '_dict'):
                                 documents = docstore._dict
-                                self.metadata = []
+                                metadata = []
                                 
                                 for doc_id, document in documents.items():
                                     clean_item = {
@@ -74,8 +111,10 @@ class RAGSystem:
                                         'name': getattr(document, 'metadata', {}).get('name', ''),
                                         'full_text': getattr(document, 'page_content', '')
                                     }
-                                    self.metadata.append(clean_item)
+                                    metadata.append(clean_item)
                                 
+                                # 변환이 끝난 뒤에 공개 (로드 중 검색이 일부 목록을 보지 않도록)
+                                self.metadata = metadata
                                 print(f"✅ 원본 메타데이터 변환 완료: {len(self.metadata)}개 항목")
                                 return
                                 
@@ -94,10 +133,14 @@ class RAGSystem:
             self.metadata = None
     
     def get_text_embedding(self, text: str) -> np.ndarray:
-        """텍스트를 임베딩 벡터로 변환합니다."""
+        """텍스트를 임베딩 벡터로 변환합니다.
+        
+        Titan 호출이 실패하거나 서킷이 열려 있으면 예외를 올려 호출부가 키워드 검색으로 넘어가게 합니다.
+        """
         try:
             # Amazon Titan Embeddings 사용
-            response = self.bedrock.invoke_model(
+            response = embedding_breaker.call(
+                self.bedrock.invoke_model,
                 modelId="amazon.titan-embed-text-v1",
                 body=json.dumps({
                     "inputText": text
@@ -118,10 +161,11 @@ class RAGSystem:
             
             return embedding
             
+        except CircuitOpenError:
+            raise
         except Exception as e:
             print(f"❌ 임베딩 생성 실패: {str(e)}")
-            # 임베딩 실패 시 더미 벡터 반환 (768차원에 맞춤)
-            return np.random.rand(768).astype(np.float32)
+            raise
     
     def search_similar_documents(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """쿼리와 유사한 문서들을 검색합니다."""
@@ -147,6 +191,9 @@ class RAGSystem:
             
             return results
             
+        except CircuitOpenError:
+            # 임베딩 장애 중에는 Titan을 기다리지 않고 바로 키워드 검색
+            return self._fallback_search(query, top_k)
         except Exception as e:
             print(f"❌ FAISS 검색 실패: {str(e)}")
             return self._fallback_search(query, top_k)
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Claude 응답 구조화 (JSON 추출/복구 + 프롬프트별 pydantic 스키마)
+
+- tool_config: 스키마를 Bedrock converse 도구로 등록하고 toolChoice로 강제해 JSON 입력으로 받음
+- extract_json: 코드블록/설명 문장이 섞인 응답이나 중간에 잘린 응답에서 JSON 객체 복구
+- parse_converse_response: converse 응답(toolUse 또는 텍스트)을 dict로 변환하고 스키마 검증
+형식이 틀린 응답 때문에 같은 요청을 다시 보내지 않도록 최대한 살려서 사용합니다.
+"""
+import json
+import re
+from typing import List, Optional, Type
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, ValidationError
+from typing_extensions import Annotated
+
+# converse toolChoice(특정 도구 강제)를 지원하는 모델
+TOOL_USE_MODELS = (
+    "claude-3",
+    "claude-sonnet-4",
+    "claude-opus-4",
+    "claude-haiku-4",
+)
+
+
+class StructuredOutputError(ValueError):
+    """응답에서 스키마에 맞는 JSON을 얻지 못함 (raw_text에 원문 보관)"""
+
+    def __init__(self, message: str, raw_text: str = ""):
+        super().__init__(message)
+        self.raw_text = raw_text
+
+
+# ==================== 스키마 ====================
+
+def _to_text(value):
+    # 숫자/불리언으로 온 문자열 필드도 허용 (예: "total_safety_level": 1)
+    if value is None:
+        return ""
+    if isinstance(value, (int, float, bool)):
+        return str(value)
+    return value
+
+def _to_score(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+Text = Annotated[str, BeforeValidator(_to_text)]
+Score = Annotated[Optional[float], BeforeValidator(_to_score)]
+# 소형 모델 결과를 그대로 쓸지 판단하는 자기 평가 확신도 (model_router)
+Confidence = Annotated[Score, Field(description="답변에 대한 확신도 (0~1)")]
+
+
+class OutputSchema(BaseModel):
+    # 스키마에 없는 필드도 그대로 전달 (프롬프트에 필드가 추가돼도 버리지 않음)
+    model_config = ConfigDict(extra="allow")
+
+
+class CheckupAnalysis(OutputSchema):
+    """건강검진 분석 결과"""
+    analysis_logic: Text = ""
+    status: Text
+    content: Text
+    recommended_nutrient: Text = ""
+    action_plan: Text = ""
+    confidence: Confidence = None
+
+
+class CheckupImageAnalysis(CheckupAnalysis):
+    """건강검진 이미지 분석 결과 (이미지에서 읽은 수치 포함)"""
+    extracted_values: dict = {}
+
+
+class FoodItem(OutputSchema):
+    name: Text
+    bbox: Optional[list] = None
+    confidence: Score = None
+    portion: Score = 1.0
+
+
+class MealVisionResult(OutputSchema):
+    """식단 사진 음식 인식 결과"""
+    analysis_logic: Text = ""
+    food_items: List[FoodItem] = []
+    detected_foods: List[Text] = []
+    content: Text = ""
+
+
+class FoodVerification(OutputSchema):
+    """잘라낸 영역의 음식 재검증 결과"""
+    food_name: Text
+    confidence: Confidence = None
+
+
+class SupplementSchedule(OutputSchema):
+    time: Text = ""
+    timing: Text = ""
+
+
+class SupplementItem(OutputSchema):
+    name: Text
+    reason: Text = ""
+    schedule: SupplementSchedule = SupplementSchedule()
+    dosage: Text = ""
+
+
+class SupplementPlan(OutputSchema):
+    """최종 영양제 스케줄"""
+    safety_logic: Text = ""
+    total_safety_level: Text = ""
+    content: Text
+    supplement_list: List[SupplementItem] = []
+    special_caution: Text = ""
+
+
+class TextFactCheck(OutputSchema):
+    """텍스트 건강 정보 팩트체크 결과"""
+    overall_credibility: Text
+    fact_check_result: Text
+    key_claims: List[Text] = []
+    verification_status: Text = ""
+    confidence: Confidence = None
+
+
+class VideoFactCheck(OutputSchema):
+    """유튜브 영상 팩트체크 결과"""
+    overall_credibility: Text
+    fact_check_result: Text
+    verified_claims: List[Text] = []
+    questionable_claims: List[Text] = []
+    recommendations: Text = ""
+    medical_disclaimer: Text = ""
+    confidence: Confidence = None
+
+
+# ==================== tool use ====================
+
+def supports_tool_use(model_id: str) -> bool:
+    """모델이 converse toolChoice를 지원하는지 확인"""
+    return any(name in model_id for name in TOOL_USE_MODELS)
+
+def _inline_refs(node, defs: dict):
+    """pydantic JSON 스키마의 $ref를 펼침 (도구 입력 스키마는 단일 객체로 전달)"""
+    if isinstance(node, dict):
+        if "$ref" in node:
+            return _inline_refs(defs[node["$ref"].rsplit("/", 1)[-1]], defs)
+        if len(node.get("allOf", ())) == 1:
+            # 기본값이 있는 중첩 모델은 {"allOf": [{"$ref"}], "default"} 형태로 나옴
+            rest = {key: value for key, value in node.items() if key != "allOf"}
+            return {**_inline_refs(node["allOf"][0], defs), **_inline_refs(rest, defs)}
+        return {key: _inline_refs(value, defs) for key, value in node.items() if key != "$defs"}
+    if isinstance(node, list):
+        return [_inline_refs(value, defs) for value in node]
+    return node
+
+def tool_name(schema: Type[BaseModel]) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", schema.__name__).lower()
+
+def tool_config(schema: Type[BaseModel]) -> dict:
+    """스키마 하나를 도구로 등록하고 그 도구로만 답하도록 강제하는 converse toolConfig"""
+    json_schema = schema.model_json_schema()
+    return {
+        "tools": [{
+            "toolSpec": {
+                "name": tool_name(schema),
+                "description": (schema.__doc__ or schema.__name__).strip() + " (JSON으로 기록)",
+                "inputSchema": {"json": _inline_refs(json_schema, json_schema.get("$defs", {}))},
+            }
+        }],
+        "toolChoice": {"tool": {"name": tool_name(schema)}},
+    }
+
+
+# ==================== JSON 추출/복구 ====================
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)(?:```|$)", re.DOTALL)
+_CLOSERS = {"{": "}", "[": "]"}
+
+def _scan(text: str, start: int):
+    """start의 '{'부터 문자열/괄호 상태를 따라가며 (끝 위치, 닫히지 않은 괄호, 문자열 안 여부, 쉼표 위치) 반환"""
+    stack, in_string, escaped = [], False, False
+    commas = []  # (위치, 그 시점의 괄호 스택)
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(char)
+        elif char in "}]":
+            if not stack or _CLOSERS[stack[-1]] != char:
+                break
+            stack.pop()
+            if not stack:
+                return i + 1, [], False, commas
+        elif char == ",":
+            commas.append((i, list(stack)))
+    return len(text), stack, in_string, commas
+
+def _strip_trailing_commas(text: str) -> str:
+    """문자열 밖의 ,} ,] 제거"""
+    result, in_string, escaped = [], False, False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "}]":
+            while result and result[-1].isspace():
+                result.pop()
+            if result and result[-1] == ",":
+                result.pop()
+        result.append(char)
+    return "".join(result)
+
+def _loads_object(text: str) -> Optional[dict]:
+    for candidate in (text, _strip_trailing_commas(text)):
+        try:
+            value = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(value, dict):
+            return value
+    return None
+
+def _close(text: str, stack: list) -> str:
+    return text + "".join(_CLOSERS[opener] for opener in reversed(stack))
+
+def _repair_truncated(text: str, stack: list, in_string: bool, commas: list) -> Optional[dict]:
+    """잘린 JSON을 닫아서 복구 (안 되면 마지막 완결된 항목까지 잘라냄)"""
+    if in_string:
+        body = text[:-1] if text.endswith("\\") and not text.endswith("\\\\") else text
+        repaired = _loads_object(_close(body + '"', stack))
+        if repaired is not None:
+            return repaired
+    else:
+        repaired = _loads_object(_close(text.rstrip().rstrip(","), stack))
+        if repaired is not None:
+            return repaired
+    for position, comma_stack in reversed(commas):
+        repaired = _loads_object(_close(text[:position], comma_stack))
+        if repaired is not None:
+            return repaired
+    return None
+
+def extract_json(text: str) -> Optional[dict]:
+    """응답 텍스트에서 첫 JSON 객체 추출 (코드블록, 앞뒤 설명, 끝 쉼표, 잘린 응답 허용)"""
+    if not text:
+        return None
+    candidates = [match.group(1) for match in _FENCE.finditer(text)] + [text]
+    for candidate in candidates:
+        start = candidate.find("{")
+        while start != -1:
+            end, stack, in_string, commas = _scan(candidate, start)
+            if not stack and not in_string:
+                value = _loads_object(candidate[start:end])
+            else:
+                value = _repair_truncated(candidate[start:end], stack, in_string, commas)
+            if value is not None:
+                return value
+            start = candidate.find("{", start + 1)
+    return None
+
+
+# ==================== converse 응답 처리 ====================
+
+def validate(data: dict, schema: Optional[Type[BaseModel]] = None) -> dict:
+    """스키마로 검증/형 변환한 dict 반환 (schema가 없으면 그대로)"""
+    if schema is None:
+        return data
+    try:
+        return schema.model_validate(data).model_dump()
+    except ValidationError as e:
+        raise StructuredOutputError(
+            f"{schema.__name__} 스키마 불일치: {e.error_count()}개 오류", json.dumps(data, ensure_ascii=False)
+        )
+
+def parse_converse_response(response: dict, schema: Optional[Type[BaseModel]] = None) -> dict:
+    """converse 응답을 dict로 변환 (toolUse 입력 우선, 없으면 텍스트에서 JSON 추출)"""
+    content = response.get("output", {}).get("message", {}).get("content", [])
+    for block in content:
+        tool_use = block.get("toolUse")
+        if tool_use and isinstance(tool_use.get("input"), dict):
+            return validate(tool_use["input"], schema)
+
+    raw_text = "".join(block.get("text", "") for block in content)
+    data = extract_json(raw_text)
+    if data is None:
+        raise StructuredOutputError("응답에서 JSON을 찾을 수 없습니다.", raw_text)
+    if response.get("stopReason") == "max_tokens":
+        print("⚠️ 응답이 최대 토큰에서 잘려 JSON을 복구했습니다.")
+    try:
+        return validate(data, schema)
+    except StructuredOutputError as e:
+        e.raw_text = raw_text
+        raise
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+연령대/성별/권장 영양소 버킷별 기본 영양제 추천과 RAG 컨텍스트 캐시
+
+- 기본 영양제 목록은 (연령대, 성별, 권장 영양소) 조합마다 모듈 로드 시 미리 계산해
+  /api/recommend-supplements-fast가 표 조회만으로 응답합니다.
+- RAG 검색 결과(버킷 검색어, 고정 안전성/상호작용 정보)는 RecommendationContextCache에
+  보관하고 precompute()로 서버 시작 시 미리 채워 /api/recommend-supplements가 재사용합니다.
+"""
+import re
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# (상한 나이, 라벨, RAG 검색어) — 나이가 상한 미만이면 해당 연령대 (마지막 항목은 상한 없음)
+AGE_BANDS = (
+    (50, "50세 미만", "성인 영양제 추천"),
+    (65, "50~64세", "중년 영양제 추천"),
+    (75, "65~74세", "시니어 노인 영양제 추천"),
+    (None, "75세 이상", "고령 노인 영양제 추천"),
+)
+GENDERS = ("남성", "여성", "")  # "": 성별 미입력
+
+# 영양제 정보 (용량, 복용 시간)
+SUPPLEMENTS = {
+    "비타민D": ("1000IU", {"time": "아침", "timing": "식후"}),
+    "칼슘": ("500mg", {"time": "저녁", "timing": "식후"}),
+    "오메가3": ("1000mg", {"time": "저녁", "timing": "식후"}),
+    "철분": ("18mg", {"time": "아침", "timing": "식후"}),
+    "마그네슘": ("300mg", {"time": "저녁", "timing": "식후"}),
+    "식이섬유": ("5g", {"time": "아침", "timing": "식전"}),
+    "단백질": ("20g", {"time": "아침", "timing": "식후"}),
+}
+
+# 연령대/성별 기본 추천 (영양제, 이유)
+AGE_SUPPLEMENTS = {
+    "50세 미만": (("비타민D", "면역력 강화를 위해 필요합니다"),),
+    "50~64세": (("비타민D", "면역력 강화를 위해 필요합니다"),),
+    "65~74세": (("비타민D", "뼈 건강과 면역력 강화를 위해 필요합니다"), ("칼슘", "골다공증 예방을 위해 필요합니다")),
+    "75세 이상": (("비타민D", "뼈 건강과 면역력 강화를 위해 필요합니다"), ("칼슘", "골다공증 예방을 위해 필요합니다")),
+}
+GENDER_SUPPLEMENTS = {
+    "남성": (("오메가3", "심혈관 건강을 위해 필요합니다"),),
+    "여성": (("철분", "빈혈 예방을 위해 필요합니다"),),
+    "": (),
+}
+
+# 권장 영양소 (검진/식단 분석의 recommended_nutrient) → 표준 이름
+# (표준 이름, 정규화된 텍스트에서 찾을 정규식, 추가할 영양제와 이유 또는 주의 문구)
+NUTRIENTS = (
+    ("칼슘", r"칼슘|calcium", ("칼슘", "검진 결과 뼈 건강 관리가 필요합니다")),
+    ("비타민D", r"비타민d|vitamind", ("비타민D", "검진 결과 비타민 D 보충이 필요합니다")),
+    ("오메가3", r"오메가|omega|epa|dha", ("오메가3", "혈중 지질 관리를 위해 필요합니다")),
+    ("식이섬유", r"식이섬유|섬유질|fiber", ("식이섬유", "혈당 관리를 위해 필요합니다")),
+    ("단백질", r"단백질|protein", ("단백질", "근육량 유지를 위해 필요합니다")),
+    ("마그네슘", r"마그네슘|magnesium", ("마그네슘", "근육 경련과 수면 개선에 도움이 됩니다")),
+    ("철분", r"철분|iron", ("철분", "빈혈 예방을 위해 필요합니다")),
+    ("칼륨", r"칼륨|potassium", "칼륨은 보충제 대신 채소·과일로 섭취하세요 (신장 질환이 있으면 의사와 상담)."),
+)
+_NUTRIENT_PATTERNS = [(name, re.compile(pattern)) for name, pattern, _ in NUTRIENTS]
+_NUTRIENT_CLEANUP = re.compile(r"[\s\-_.()·]+")
+
+MAX_BUCKET_SUPPLEMENTS = 4
+BASE_CAUTION = "현재 복용 중인 약물이 있다면 의사와 상담 후 복용하세요."
+
+# 모든 요청에 공통인 RAG 검색 대상
+GENERAL_QUERY = "영양제 추천"
+SAFETY_SUPPLEMENTS = ["비타민D", "칼슘", "오메가3", "마그네슘"]
+
+
+class Bucket(NamedTuple):
+    age_band: str
+    gender: str
+    nutrient: str                 # 표준 영양소 이름 ("": 없음/인식 실패)
+    supplement_list: List[dict]   # 모든 요청이 공유하므로 수정하지 말 것
+    special_caution: str
+    queries: Tuple[str, ...]      # 이 버킷의 RAG 검색어
+
+
+def age_band(age: int) -> str:
+    for upper, label, _ in AGE_BANDS:
+        if upper is None or age < upper:
+            return label
+    return AGE_BANDS[-1][1]
+
+def normalize_gender(gender: str) -> str:
+    text = (gender or "").strip().lower()
+    if text in ("남성", "남", "남자", "male", "m"):
+        return "남성"
+    if text in ("여성", "여", "여자", "female", "f"):
+        return "여성"
+    return ""
+
+def normalize_nutrient(*texts: str) -> str:
+    """자유 텍스트 권장 영양소 중 텍스트에서 가장 먼저 나오는 표준 이름
+    ("오메가3, 칼슘" → "오메가3"; 여러 텍스트면 인식되는 첫 텍스트 기준)"""
+    for text in texts:
+        normalized = _NUTRIENT_CLEANUP.sub("", text or "").lower()
+        if not normalized:
+            continue
+        best = None  # (위치, 표준 이름)
+        for name, pattern in _NUTRIENT_PATTERNS:
+            match = pattern.search(normalized)
+            if match and (best is None or match.start() < best[0]):
+                best = (match.start(), name)
+        if best:
+            return best[1]
+    return ""
+
+def _supplement(name: str, reason: str) -> dict:
+    dosage, schedule = SUPPLEMENTS[name]
+    return {"name": name, "reason": reason, "dosage": dosage, "schedule": dict(schedule)}
+
+def _build_bucket(band: str, gender: str, nutrient: str) -> Bucket:
+    items: Dict[str, dict] = {}
+    cautions = [BASE_CAUTION]
+    extra = next((value for name, _, value in NUTRIENTS if name == nutrient), None)
+    # 검진에서 필요하다고 나온 영양소를 먼저
+    if isinstance(extra, tuple):
+        items[extra[0]] = _supplement(*extra)
+    elif extra:
+        cautions.append(extra)
+    for name, reason in AGE_SUPPLEMENTS[band] + GENDER_SUPPLEMENTS[gender]:
+        items.setdefault(name, _supplement(name, reason))
+
+    age_query = next(query for _, label, query in AGE_BANDS if label == band)
+    queries = [nutrient] if nutrient else []
+    queries += [f"{gender} {age_query}" if gender else age_query, GENERAL_QUERY]
+    return Bucket(band, gender, nutrient, list(items.values())[:MAX_BUCKET_SUPPLEMENTS], " ".join(cautions), tuple(queries))
+
+def build_buckets() -> Dict[Tuple[str, str, str], Bucket]:
+    """모든 (연령대, 성별, 영양소) 조합의 기본 추천"""
+    nutrients = [""] + [name for name, _, _ in NUTRIENTS]
+    return {
+        (label, gender, nutrient): _build_bucket(label, gender, nutrient)
+        for _, label, _ in AGE_BANDS
+        for gender in GENDERS
+        for nutrient in nutrients
+    }
+
+BUCKETS = build_buckets()
+
+def find_bucket(age: int, gender: str, *nutrient_texts: str) -> Bucket:
+    """사용자 정보와 검진/식단 권장 영양소로 버킷 조회"""
+    return BUCKETS[(age_band(age), normalize_gender(gender), normalize_nutrient(*nutrient_texts))]
+
+
+class RecommendationContextCache:
+    """RAG 검색 결과 캐시 (검색어별 결과와 고정 안전성/상호작용 정보)
+
+    빈 결과와 RAG 로드 전 SQLite 폴백 결과는 저장하지 않아 RAG 인덱스가 로드되면 다시 검색하고,
+    clear() 전에 시작한 검색 결과는 clear() 뒤에 끝나도 저장하지 않습니다 (세대 번호 비교).
+    """
+
+    def __init__(self, rag_system, top_k: int = 3, max_queries: int = 256):
+        self.rag_system = rag_system
+        self.top_k = top_k
+        self.max_queries = max_queries
+        self._queries: Dict[str, List[str]] = {}
+        self._safety: Optional[Tuple[str, list]] = None
+        self._generation = 0     # clear()마다 증가
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.precomputed_at: Optional[float] = None
+
+    def search(self, query: str) -> List[str]:
+        """검색어의 RAG 문서 요약 줄 목록"""
+        query = query.strip()
+        if not query:
+            return []
+        lines = self._queries.get(query)
+        if lines is not None:
+            self.hits += 1
+            return lines
+        self.misses += 1
+        generation = self._generation
+        lines, degraded = [], False
+        for doc in self.rag_system.search_similar_documents(query, top_k=self.top_k):
+            degraded = degraded or doc.get('source') == 'sqlite_fallback'
+            content = doc.get('content', doc.get('full_text', ''))
+            if content:
+                lines.append(f"[{doc.get('name', 'Unknown')}] {content[:200]}...")
+        # 폴백 결과는 RAG를 쓸 수 없는 환경(unavailable)에서만 저장 (로드 중/임베딩 장애 중에는 저장하지 않음)
+        if lines and (not degraded or self._rag_state() == "unavailable"):
+            with self._lock:
+                if self._generation != generation:
+                    return lines
+                if len(self._queries) >= self.max_queries:
+                    self._queries.pop(next(iter(self._queries)))  # 가장 오래된 검색어 제거
+                self._queries[query] = lines
+        return lines
+
+    def safety(self) -> Tuple[str, list]:
+        """고정 영양제 목록의 (안전성 정보, 상호작용 정보)"""
+        if self._safety is not None:
+            return self._safety
+        generation = self._generation
+        settled = self._rag_state() not in ("not_loaded", "loading")
+        safety_info = self.rag_system.get_safety_information(SAFETY_SUPPLEMENTS)
+        interaction_info = self.rag_system.get_supplement_interactions(SAFETY_SUPPLEMENTS)
+        if (safety_info or interaction_info) and settled:
+            with self._lock:
+                if self._generation == generation:
+                    self._safety = (safety_info, interaction_info)
+        return safety_info, interaction_info
+
+    def _rag_state(self) -> str:
+        return getattr(self.rag_system, "state", "loaded")
+
+    def context(self, bucket: Bucket, *extra_queries: str) -> Tuple[str, int, int]:
+        """버킷의 종합 RAG 컨텍스트 → (컨텍스트, 문서 줄 수, 상호작용 수)
+
+        extra_queries는 검진/식단의 권장 영양소 원문입니다 (인식되면 표준 이름으로 검색).
+        """
+        extra = [normalize_nutrient(query) or query.strip() for query in extra_queries if query and query.strip()]
+        queries = extra + list(bucket.queries)
+        lines = []
+        for query in dict.fromkeys(queries):
+            lines.extend(self.search(query))
+        safety_info, interaction_info = self.safety()
+        interactions = '; '.join(f"{item['supplement']}: {item['interaction_info']}" for item in interaction_info[:3])
+        context = f"""
+=== 영양제 추천 데이터베이스 정보 ===
+{chr(10).join(lines)}
+
+=== 안전성 정보 ===
+{safety_info}
+
+=== 상호작용 정보 ===
+{interactions}
+"""
+        return context, len(lines), len(interaction_info)
+
+    def clear(self):
+        """캐시 비우기 (RAG 인덱스가 새로 로드된 경우)"""
+        with self._lock:
+            self._queries = {}
+            self._safety = None
+            self._generation += 1
+
+    def is_ready(self, bucket: Bucket) -> bool:
+        """버킷 검색어가 모두 캐시되어 있는지"""
+        return all(query in self._queries for query in bucket.queries)
+
+    def precompute(self, buckets=None):
+        """모든 버킷의 검색어와 안전성 정보를 미리 검색 (서버 시작 시 백그라운드 실행)"""
+        start = time.time()
+        queries = dict.fromkeys(query for bucket in (buckets or BUCKETS).values() for query in bucket.queries)
+        for query in queries:
+            try:
+                self.search(query)
+            except Exception as e:
+                print(f"⚠️ 추천 컨텍스트 미리 계산 실패 ({query}): {str(e)}")
+        try:
+            self.safety()
+        except Exception as e:
+            print(f"⚠️ 안전성 정보 미리 계산 실패: {str(e)}")
+        self.precomputed_at = time.time()
+        print(f"✅ 추천 컨텍스트 미리 계산 완료: 검색어 {len(self._queries)}/{len(queries)}개 ({time.time() - start:.1f}초)")
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "buckets": len(BUCKETS),
+            "cached_queries": len(self._queries),
+            "safety_cached": self._safety is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "precomputed": self.precomputed_at is not None,
+        }
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+공유 boto3 클라이언트 설정 테스트
+"""
+from aws_clients import MAX_POOL_CONNECTIONS, client_status, get_client
+
+def test_shared_clients():
+    """같은 프로필은 모듈이 달라도 같은 클라이언트를 재사용"""
+    from rag_system import RAGSystem
+    from app_core import NutriScanApp
+
+    converse = get_client("converse")
+    assert NutriScanApp().bedrock is converse
+    assert RAGSystem().bedrock is get_client("embeddings") is not converse
+    assert get_client("converse", "us-west-2") is not converse
+    assert "converse@us-east-1" in client_status()["clients"]
+
+def test_client_config():
+    """연결 풀, adaptive 재시도, 프로필별 타임아웃 확인"""
+    config = get_client("converse").meta.config
+    assert config.max_pool_connections == MAX_POOL_CONNECTIONS >= 32
+    assert config.retries == {"mode": "adaptive", "total_max_attempts": 2}
+    assert (config.connect_timeout, config.read_timeout) == (3, 60)
+
+    sts = get_client("sts").meta.config
+    assert sts.read_timeout == 5 and sts.retries["total_max_attempts"] == 1
+    assert get_client("embeddings").meta.config.read_timeout == 10
+    print(f"클라이언트 설정: {client_status()}")
+
+if __name__ == "__main__":
+    print("🧪 boto3 클라이언트 설정 테스트")
+    print("=" * 50)
+    test_shared_clients()
+    test_client_config()
+    print("\n✅ boto3 클라이언트 설정 테스트 완료!")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+데이터 동기화 일괄 저장 테스트
+"""
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database import Base, MealRecord, MedicationRecord
+from db_service import DatabaseService, statistics_cache
+
+def make_session():
+    """테스트용 메모리 DB 세션 (커밋 횟수 기록)"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    session.info["commits"] = 0
+    statistics_cache.clear()
+
+    @event.listens_for(session, "after_commit")
+    def count_commit(sess):
+        sess.info["commits"] += 1
+
+    return session
+
+def make_payload(count):
+    return {
+        "meals": [
+            {"id": f"meal-{i}", "date": "2026-10-19", "meal_type": "점심", "foods": ["흰밥", "배추김치"], "calories": 400}
+            for i in range(count)
+        ],
+        "supplement_analyses": [{"analysis_result": {"content": "비타민 D 부족"}}],
+        "health_checkups": [{"checkup_date": "2026-10-01", "status": "주의"}],
+        "fact_checks": [{"query": "홍삼이 혈압에 좋나요?", "credibility_score": 0.6}],
+        "medication_records": [
+            {"date": "2026-10-19", "medication_name": f"영양제{i}", "taken": True}
+            for i in range(count)
+        ],
+    }
+
+def test_bulk_sync_single_commit():
+    """전체 동기화가 한 번의 커밋으로 끝나고 id가 입력 순서대로 반환되는지 확인"""
+    db = make_session()
+    payload = make_payload(500)
+
+    start = time.perf_counter()
+    result = DatabaseService.sync_user_data(db, "user-1", payload)
+    elapsed = time.perf_counter() - start
+    print(f"1002건 동기화: {elapsed * 1000:.1f}ms")
+
+    assert db.info["commits"] == 1
+    assert result["synced_meals"] == 500
+    assert result["synced_medications"] == 500
+    assert result["synced_analyses"] == result["synced_checkups"] == result["synced_fact_checks"] == 1
+    assert result["failed"] == 0 and result["errors"] == []
+
+    meal_ids = result["ids"]["meals"]
+    assert len(set(meal_ids.values())) == 500
+    assert db.get(MealRecord, meal_ids["meal-3"]).client_id == "meal-3"
+    medications = db.query(MedicationRecord).order_by(MedicationRecord.id).all()
+    assert sorted(m.id for m in medications) == sorted(result["ids"]["medication_records"].values())
+    assert medications[3].medication_name == "영양제3"
+
+    # 영양소가 없으면 영양성분 DB로 채워짐
+    meal = db.get(MealRecord, meal_ids["meal-0"])
+    assert meal.nutrients and meal.calories == 400
+
+def test_sync_is_idempotent():
+    """같은 데이터를 다시 보내면 행이 늘지 않고, 바뀐 레코드만 갱신되는지 확인"""
+    db = make_session()
+    payload = make_payload(50)
+    first = DatabaseService.sync_user_data(db, "user-1", payload)
+    assert first["inserted"] == 103 and first["updated"] == 0
+
+    # 재시도: 모두 건너뜀
+    retry = DatabaseService.sync_user_data(db, "user-1", payload)
+    assert retry["inserted"] == retry["updated"] == 0 and retry["skipped"] == 103
+    assert retry["ids"] == first["ids"]
+    assert db.query(MealRecord).count() == 50
+    assert db.query(MedicationRecord).count() == 50
+
+    # ID가 있는 레코드는 내용이 바뀌면 갱신, ID가 없는 레코드는 내용 해시로 식별
+    payload["meals"][0] = {**payload["meals"][0], "meal_type": "저녁"}
+    payload["medication_records"].append(dict(payload["medication_records"][0]))
+    changed = DatabaseService.sync_user_data(db, "user-1", payload)
+    print(f"재동기화 결과: {changed['tables']['meals']}, {changed['tables']['medication_records']}")
+    assert changed["tables"]["meals"] == {"inserted": 0, "updated": 1, "skipped": 49}
+    # 내용이 완전히 같은 기록도 합치지 않음 (같은 약을 두 번 기록)
+    assert changed["tables"]["medication_records"] == {"inserted": 1, "updated": 0, "skipped": 50}
+    assert db.get(MealRecord, first["ids"]["meals"]["meal-0"]).meal_type == "저녁"
+    assert db.query(MealRecord).count() == 50
+    again = DatabaseService.sync_user_data(db, "user-1", payload)
+    assert again["tables"]["medication_records"] == {"inserted": 0, "updated": 0, "skipped": 51}
+    assert db.query(MedicationRecord).count() == 51
+
+    # 다른 사용자의 같은 ID는 별도 레코드
+    other = DatabaseService.sync_user_data(db, "user-2", {"meals": payload["meals"][:1]})
+    assert other["inserted"] == 1
+
+def test_single_add_then_sync():
+    """단건 API로 저장한 레코드를 다시 동기화해도 중복되지 않고, 같은 내용의 두 기록은 따로 저장"""
+    db = make_session()
+    meal = {"date": "2026-10-19", "meal_type": "점심", "foods": ["흰밥"], "calories": 300}
+    first = DatabaseService.add_meal_record(db, "user-1", meal)
+    second = DatabaseService.add_meal_record(db, "user-1", dict(meal))  # 같은 식사를 한 번 더 기록
+    assert first.client_id != second.client_id and second.client_id == f"{first.client_id}#2"
+
+    result = DatabaseService.sync_user_data(db, "user-1", {"meals": [meal, dict(meal)]})
+    assert result["tables"]["meals"] == {"inserted": 0, "updated": 0, "skipped": 2}
+    assert result["ids"]["meals"] == {first.client_id: first.id, second.client_id: second.id}
+    assert db.query(MealRecord).count() == 2
+
+def test_bulk_sync_partial_failure():
+    """잘못된 항목만 건너뛰고 위치와 사유를 보고하는지 확인"""
+    db = make_session()
+    payload = {
+        "meals": [
+            {"date": "2026-10-19", "foods": ["흰밥"]},
+            {"meal_type": "저녁"},
+            {"date": "19/10/2026"},
+            {"date": "2026-10-20", "foods": "흰밥"},
+        ],
+        "medication_records": [{"date": "2026-10-19"}, "잘못된 항목"],
+    }
+
+    result = DatabaseService.sync_user_data(db, "user-1", payload)
+    print(f"오류 보고: {result['errors']}")
+
+    assert result["synced_meals"] == 1
+    assert result["synced_medications"] == 0
+    assert result["failed"] == 5
+    assert [(e["table"], e["index"]) for e in result["errors"]] == [
+        ("meals", 1), ("meals", 2), ("meals", 3),
+        ("medication_records", 0), ("medication_records", 1),
+    ]
+    assert db.query(MealRecord).count() == 1
+
+def test_changes_since_cursor():
+    """커서 이후 변경분과 삭제 기록만 순번 순서대로 내려주는지 확인"""
+    db = make_session()
+    DatabaseService.sync_user_data(db, "user-1", make_payload(3))
+    DatabaseService.sync_user_data(db, "user-2", make_payload(2))
+
+    full = DatabaseService.get_changes(db, "user-1", since=0)
+    assert full["cursor"] == 9 and not full["has_more"]
+    assert len(full["changes"]["meals"]) == 3 and len(full["changes"]["medication_records"]) == 3
+    assert "user_id" not in full["changes"]["meals"][0]
+
+    # 커서 이후 아무것도 없음
+    empty = DatabaseService.get_changes(db, "user-1", since=full["cursor"])
+    assert empty["cursor"] == full["cursor"] and not any(empty["changes"].values())
+
+    # 단건 추가, 복용 체크, 삭제가 순서대로 반영됨
+    meal = DatabaseService.add_meal_record(db, "user-1", {"date": "2026-10-20", "foods": ["된장국"]})
+    DatabaseService.update_medication_taken(db, "user-1", "2026-10-19", "영양제1", False)
+    assert DatabaseService.delete_record(db, "user-1", "meals", full["changes"]["meals"][0]["id"])
+    assert not DatabaseService.delete_record(db, "user-2", "meals", meal.id)
+
+    delta = DatabaseService.get_changes(db, "user-1", since=full["cursor"])
+    print(f"변경분: 커서 {full['cursor']} → {delta['cursor']}")
+    assert delta["cursor"] == 12
+    assert [m["id"] for m in delta["changes"]["meals"]] == [meal.id]
+    assert [m["medication_name"] for m in delta["changes"]["medication_records"]] == ["영양제1"]
+    assert delta["deleted"]["meals"][0]["id"] == full["changes"]["meals"][0]["id"]
+
+    # limit 단위로 나눠 받기 (삭제된 1번은 12번 삭제 기록으로만 남음)
+    page = DatabaseService.get_changes(db, "user-1", since=0, limit=4)
+    assert page["has_more"] and page["cursor"] == 5
+
+def test_statistics_counters():
+    """기록 수가 추가/동기화/삭제와 함께 갱신되고 한 행 조회로 반환되는지 확인"""
+    db = make_session()
+    assert DatabaseService.get_user_statistics(db, "user-1") == {
+        "meals": 0, "supplement_analyses": 0, "health_checkups": 0, "fact_checks": 0, "medication_records": 0
+    }
+
+    payload = make_payload(5)
+    DatabaseService.sync_user_data(db, "user-1", payload)
+    DatabaseService.sync_user_data(db, "user-1", payload)  # 재시도는 개수에 영향 없음
+    meal = DatabaseService.add_meal_record(db, "user-1", {"date": "2026-10-20"})
+    DatabaseService.delete_record(db, "user-1", "fact_checks", 1)
+
+    queries = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: queries.append(args[2]))
+    stats = DatabaseService.get_user_statistics(db, "user-1")
+    assert stats == {"meals": 6, "supplement_analyses": 1, "health_checkups": 1, "fact_checks": 0, "medication_records": 5}
+    assert len(queries) == 1 and "user_sync_state" in queries[0]
+
+    # 캐시된 결과는 쿼리 없이 반환, 쓰기 후에는 바로 반영
+    DatabaseService.get_user_statistics(db, "user-1")
+    assert len(queries) == 1
+    DatabaseService.delete_record(db, "user-1", "meals", meal.id)
+    assert DatabaseService.get_user_statistics(db, "user-1")["meals"] == 5
+    assert DatabaseService.get_user_statistics(db, "user-2")["meals"] == 0
+
+if __name__ == "__main__":
+    print("🧪 데이터 동기화 일괄 저장 테스트")
+    print("=" * 50)
+    test_bulk_sync_single_commit()
+    test_sync_is_idempotent()
+    test_single_add_then_sync()
+    test_bulk_sync_partial_failure()
+    test_changes_since_cursor()
+    test_statistics_counters()
+    print("\n✅ 동기화 테스트 완료!")
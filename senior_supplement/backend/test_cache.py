@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+응답 캐시 테스트
+"""
+import asyncio
+import time
+from cache import ReadThroughCache, TTLCache, etag_matches, make_etag
+from db_service import DatabaseService, latest_record_cache, latest_cache_key, statistics_cache
+from test_bulk_sync import make_session
+
+def test_ttl_cache():
+    """만료와 LRU 제거 확인"""
+    cache = TTLCache(ttl=0.05, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)  # 가장 오래 안 쓴 b 제거
+    assert cache.get("a") == 1 and cache.get("b") is None and cache.get("c") == 3
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+def test_read_through_cache():
+    """두 번째 조회부터 loader를 호출하지 않고, 조회 중 무효화된 값은 저장하지 않는지 확인"""
+    cache = ReadThroughCache("test", ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return b'{"value":1}'
+
+    async def stale_loader():
+        cache.invalidate("user-1")  # 읽는 도중 저장 요청이 들어온 상황
+        return b'{"value":"old"}'
+
+    async def scenario():
+        assert await cache.get_or_load("user-1", loader) == b'{"value":1}'
+        assert await cache.get_or_load("user-1", loader) == b'{"value":1}'
+        assert len(calls) == 1
+
+        cache.invalidate("user-1")
+        assert await cache.get_or_load("user-1", stale_loader) == b'{"value":"old"}'
+        assert await cache.get_or_load("user-1", loader) == b'{"value":1}'
+        assert len(calls) == 2
+
+        # 조회가 끝난 키의 세대 번호는 남기지 않음 (사용자 수만큼 계속 늘어나지 않도록)
+        for index in range(100):
+            cache.invalidate(f"user-{index}")
+            await cache.get_or_load(f"user-{index}", loader)
+        assert cache._generations == {} and cache._loading == {}
+
+    asyncio.run(scenario())
+
+def test_versioned_by_writes():
+    """저장/동기화/삭제로 데이터 버전이 바뀌면 다른 워커에서 캐시한 응답도 쓰지 않는지 확인"""
+    db = make_session()
+    version = DatabaseService.get_data_version(db, "user-1")
+    latest_record_cache.backend.set(latest_cache_key("health_checkups", "user-1", version), b"cached")
+
+    DatabaseService.save_health_checkup(db, "user-1", {"checkup_date": "2026-10-01"})
+    DatabaseService.sync_user_data(db, "user-1", {"meals": [{"date": "2026-10-01"}]})
+    DatabaseService.delete_record(db, "user-1", "health_checkups", 1)
+    new_version = DatabaseService.get_data_version(db, "user-1")
+    assert new_version == 3 and latest_record_cache.backend.get(latest_cache_key("health_checkups", "user-1", new_version)) is None
+
+    # 통계 캐시도 버전이 다르면 다시 조회 (다른 워커의 쓰기는 이 프로세스의 캐시를 지우지 못함)
+    stats = DatabaseService.get_user_statistics(db, "user-1", new_version)
+    assert stats["health_checkups"] == 0 and stats["meals"] == 1
+    statistics_cache.set("user-1", (new_version - 1, {**stats, "meals": 99}))
+    assert DatabaseService.get_user_statistics(db, "user-1", new_version)["meals"] == 1
+
+def test_etag_from_data_version():
+    """데이터가 바뀔 때만 ETag가 바뀌고, If-None-Match 비교가 맞는지 확인"""
+    db = make_session()
+    version = DatabaseService.get_data_version(db, "user-1")
+    etag = make_etag(version, "/api/users/user-1/statistics", "")
+    assert version == 0
+    assert etag == make_etag(DatabaseService.get_data_version(db, "user-1"), "/api/users/user-1/statistics", "")
+    assert etag != make_etag(version, "/api/users/user-1/meals", "date=2026-10-01")
+
+    DatabaseService.add_meal_record(db, "user-1", {"date": "2026-10-01"})
+    DatabaseService.update_medication_taken(db, "user-1", "2026-10-01", "없는 약", True)  # 변경 없음
+    assert DatabaseService.get_data_version(db, "user-1") == 1
+    DatabaseService.delete_record(db, "user-1", "meals", 1)
+    assert DatabaseService.get_data_version(db, "user-1") == 2
+    assert DatabaseService.get_data_version(db, "user-2") == 0
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag.removeprefix("W/")}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag) and not etag_matches('W/"1-abc"', etag)
+
+if __name__ == "__main__":
+    print("🧪 응답 캐시 테스트")
+    print("=" * 50)
+    test_ttl_cache()
+    test_read_through_cache()
+    test_versioned_by_writes()
+    test_etag_from_data_version()
+    print("\n✅ 캐시 테스트 완료!")
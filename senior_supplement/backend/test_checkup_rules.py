@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+건강검진 수치 규칙 판정 테스트
+"""
+import time
+from checkup_rules import build_checkup_result, format_metrics, interpret_checkup
+
+def statuses(result):
+    return {key: metric["status"] for key, metric in result["metrics"].items()}
+
+def test_status_levels():
+    """test_all_status_levels.py의 정상/주의/위험 예시가 규칙만으로 같은 상태가 되는지 확인"""
+    cases = [
+        ("혈압: 120/80 mmHg, 총콜레스테롤: 180 mg/dL, 혈당: 90 mg/dL, BMI: 22.0", "정상"),
+        ("혈압: 140/90 mmHg, 총콜레스테롤: 220 mg/dL, 혈당: 110 mg/dL, BMI: 24.5", "주의"),
+        ("혈압: 160/100 mmHg, 총콜레스테롤: 280 mg/dL, 혈당: 140 mg/dL, BMI: 28.0", "위험"),
+    ]
+    for text, expected in cases:
+        result = interpret_checkup(text, 170, 70)
+        assert result["status"] == expected, (text, result)
+        assert result["recognized"] == 4 and not result["narrative"]
+        assert result["metrics"]["bmi"]["value"] in ("22", "24.5", "28")  # 텍스트의 BMI 우선
+
+def test_parse_metrics():
+    """라벨 표기 방식이 달라도 지표를 구분하는지 확인"""
+    result = interpret_checkup("LDL 콜레스테롤 165, HDL-콜레스테롤: 38, 공복 혈당 99, AST(SGOT) 45, ALT 30")
+    assert statuses(result) == {
+        "ldl": "위험", "hdl": "주의", "fasting_glucose": "정상", "ast": "주의", "alt": "정상"
+    }
+    assert "total_cholesterol" not in result["metrics"] and result["status"] == "위험"
+
+    result = interpret_checkup("수축기 혈압 150 이완기 혈압 95, 골밀도 T-score -1.5")
+    assert result["metrics"]["blood_pressure"]["value"] == "150/95"
+    assert statuses(result) == {"blood_pressure": "주의", "t_score": "주의"}
+
+    assert interpret_checkup("T-score -2.6, 혈압 145/85")["metrics"]["t_score"]["status"] == "위험"
+    # 키/체중으로 BMI 계산 (대한비만학회 기준 23 이상 주의)
+    assert interpret_checkup("특이사항 없음", 160, 50)["metrics"]["bmi"] == {
+        "name": "BMI", "value": "19.5", "unit": "kg/m²", "status": "정상", "note": "정상"
+    }
+    assert interpret_checkup("특이사항 없음")["status"] is None
+
+def test_narrative_detection():
+    """수치 외 서술이 있으면 LLM 해석 대상으로 표시"""
+    assert not interpret_checkup("혈압 145/90, 콜레스테롤 230mg/dL, 혈당 115mg/dL")["narrative"]
+    result = interpret_checkup("검진일 2026-10-01 혈압 118/76. 의사 소견: 최근 체중이 늘어 식습관 개선과 운동이 필요합니다.")
+    assert result["narrative"] and result["recognized"] == 1
+
+    # 짧은 소견도 서술로 판단 (수치가 정상이어도 규칙 판정만으로 끝내지 않음)
+    for text in ["요단백 양성, 혈압 120/80", "간초음파 지방간, 혈당 90",
+                 "흉부 X선 이상, 혈당 90", "혈압 120/80 고혈압약 복용중"]:
+        result = interpret_checkup(text)
+        assert result["narrative"] and result["status"] == "정상", text
+        assert "검진 소견은 반영하지 않았으니" in build_checkup_result(result, "김영희")["content"]
+
+def test_non_fasting_glucose():
+    """식후/무작위 혈당은 공복혈당 기준으로 판정하지 않음"""
+    for text in ["식후 혈당 190", "random glucose 150", "식후 2시간 혈당 190"]:
+        result = interpret_checkup(text)
+        assert "fasting_glucose" not in result["metrics"] and result["unrecognized"], text
+    assert interpret_checkup("공복 혈당 130")["metrics"]["fasting_glucose"]["status"] == "위험"
+    assert interpret_checkup("혈당 90")["metrics"]["fasting_glucose"]["status"] == "정상"
+
+def test_unrecognized_values():
+    """규칙에 없는 검사 수치는 버리지 않고 기록 (LLM 해석 대상)"""
+    result = interpret_checkup("혈압 120/80, 중성지방 300, 당화혈색소 8.0")
+    assert result["recognized"] == 1 and result["unrecognized"] == ["중성지방", "당화혈색소"]
+    assert interpret_checkup("eGFR 40, 크레아티닌 2.1")["unrecognized"] == ["eGFR", "크레아티닌"]
+    assert interpret_checkup("감마지티피 250")["unrecognized"] == ["감마지티피"]
+    # 날짜/키/체중은 검사 수치가 아님
+    assert interpret_checkup("검진일 2026-10-01 키 160 체중 55 혈압 118/76")["unrecognized"] == []
+
+    # fast_mode 결과에는 건너뛴 항목을 안내
+    fast = build_checkup_result(interpret_checkup("혈압 120/80, 당화혈색소 8.0"), "김영희")
+    assert fast["skipped_values"] == ["당화혈색소"] and "당화혈색소 수치는 판정하지 못했으니" in fast["content"]
+
+def test_checkup_result():
+    """규칙 판정만으로 checkup_expert 응답과 같은 필드를 만드는지 확인"""
+    result = build_checkup_result(interpret_checkup("T-score -2.6, 혈압 145/85"), "김영희")
+    print(f"규칙 판정 결과: {result['content']}")
+    assert result["status"] == "위험" and result["recommended_nutrient"] == "칼슘과 비타민 D"
+    assert {"analysis_logic", "content", "action_plan", "metrics"} <= set(result)
+    assert "골밀도 T-score -2.6(위험, 골다공증)" in format_metrics(result["metrics"])
+
+    normal = build_checkup_result(interpret_checkup("혈압 118/76, 혈당 90"), "김영희")
+    assert normal["status"] == "정상" and normal["recommended_nutrient"] == "비타민 D"
+    assert build_checkup_result(interpret_checkup("특이사항 없음"), "김영희")["status"] == "Unknown"
+
+def test_speed():
+    """한 번 판정이 1ms 미만인지 확인"""
+    text = "혈압: 160/100 mmHg, 총콜레스테롤: 280 mg/dL, 혈당: 140 mg/dL, BMI: 28.0, AST 45, ALT 60"
+    start = time.perf_counter()
+    for _ in range(1000):
+        interpret_checkup(text, 170, 70)
+    elapsed = (time.perf_counter() - start) / 1000
+    print(f"판정 1회: {elapsed * 1_000_000:.0f}µs")
+    assert elapsed < 0.001
+
+if __name__ == "__main__":
+    print("🧪 검진 수치 규칙 판정 테스트")
+    print("=" * 50)
+    test_status_levels()
+    test_parse_metrics()
+    test_narrative_detection()
+    test_unrecognized_values()
+    test_non_fasting_glucose()
+    test_checkup_result()
+    test_speed()
+    print("\n✅ 규칙 판정 테스트 완료!")
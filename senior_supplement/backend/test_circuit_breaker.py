@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+AWS 의존성 서킷 브레이커 테스트
+"""
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, is_outage, is_youtube_outage
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FakeClientError(Exception):
+    """botocore ClientError와 같은 response 구조"""
+
+    def __init__(self, code, status):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}
+
+class NoTranscriptFound(Exception):
+    pass
+
+def fail(error):
+    def call():
+        raise error
+    return call
+
+def test_open_and_recover():
+    """연속 실패 시 열리고, 대기 후 시험 호출 1건으로 복구"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("bedrock_converse", failure_threshold=3, recovery_seconds=30, clock=clock)
+    outage = FakeClientError("ServiceUnavailableException", 503)
+    for _ in range(3):
+        try:
+            breaker.call(fail(outage))
+        except FakeClientError:
+            pass
+    assert breaker.state == OPEN and breaker.stats["trips"] == 1
+
+    # 열린 동안은 호출하지 않고 바로 거절
+    calls = []
+    try:
+        breaker.call(calls.append, "호출")
+        assert False, "열린 브레이커가 호출을 허용했습니다."
+    except CircuitOpenError as e:
+        assert e.retry_after == 30
+    assert calls == [] and breaker.stats["rejected"] == 1
+
+    # 대기 후 시험 호출 1건만 허용, 실패하면 다시 열림
+    clock.now = 31
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()  # 시험 호출 진행 중
+    breaker.record_failure(outage)
+    assert breaker.state == OPEN and breaker.stats["trips"] == 2
+
+    clock.now = 62
+    assert breaker.call(lambda: "응답") == "응답"
+    assert breaker.state == CLOSED and breaker.stats["consecutive_failures"] == 0
+    print(f"브레이커 상태: {breaker.stats}")
+
+def test_failure_classification():
+    """요청 오류/영상별 오류는 서비스 장애로 세지 않음"""
+    assert is_outage(FakeClientError("ThrottlingException", 400))
+    assert is_outage(FakeClientError("InternalServerException", 500))
+    assert is_outage(ConnectionError("endpoint 연결 실패"))
+    assert not is_outage(FakeClientError("ValidationException", 400))
+    assert not is_outage(FakeClientError("AccessDeniedException", 403))  # 모델 미활성화 등
+    assert not is_youtube_outage(NoTranscriptFound())
+    assert is_youtube_outage(ConnectionError())
+
+    breaker = CircuitBreaker("youtube_transcripts", failure_threshold=1, is_failure=is_youtube_outage)
+    for _ in range(3):
+        try:
+            breaker.call(fail(NoTranscriptFound()))
+        except NoTranscriptFound:
+            pass
+    assert breaker.state == CLOSED
+
+if __name__ == "__main__":
+    print("🧪 서킷 브레이커 테스트")
+    print("=" * 50)
+    test_open_and_recover()
+    test_failure_classification()
+    print("\n✅ 서킷 브레이커 테스트 완료!")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+DB 엔진 설정 (SQLite WAL, 연결 풀, 비동기 세션) 테스트
+"""
+import asyncio
+import os
+import tempfile
+import threading
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from database import Base, async_database_url, create_async_db_engine, create_db_engine, engine_options, pool_status
+from db_service import AsyncDatabaseService, DatabaseService, statistics_cache
+
+def test_sqlite_pragmas():
+    """SQLite 파일 DB에 WAL/synchronous/busy_timeout이 적용되는지 확인"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_engine = create_db_engine(f"sqlite:///{os.path.join(tmp_dir, 'app.db')}")
+        with db_engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() > 0
+        print(f"풀 상태: {pool_status(db_engine)}")
+        db_engine.dispose()
+
+def test_concurrent_writes():
+    """여러 스레드에서 동시에 기록해도 database is locked 오류가 없는지 확인"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_engine = create_db_engine(f"sqlite:///{os.path.join(tmp_dir, 'app.db')}")
+        Base.metadata.create_all(bind=db_engine)
+        Session = sessionmaker(bind=db_engine)
+        errors = []
+
+        def write(worker):
+            db = Session()
+            try:
+                for i in range(20):
+                    DatabaseService.add_medication_record(
+                        db, f"user-{worker % 2}", {"date": "2026-10-19", "medication_name": f"약{worker}-{i}"}
+                    )
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        with db_engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM medication_records")).scalar() == 120
+            # 사용자별 순번이 겹치지 않음
+            assert conn.execute(text("SELECT MAX(last_seq) FROM user_sync_state")).scalar() == 60
+        db_engine.dispose()
+
+def test_postgres_options():
+    """PostgreSQL 연결 풀/타임아웃 옵션 확인"""
+    options = engine_options("postgresql://user:pw@db.example.com:5432/health_app")
+    assert options["pool_pre_ping"] and options["pool_size"] > 0 and options["pool_recycle"] > 0
+    assert "statement_timeout" in options["connect_args"]["options"]
+
+def test_async_service():
+    """AsyncDatabaseService가 ORM 객체 대신 값을 돌려주고 여러 요청을 동시에 처리하는지 확인"""
+    assert async_database_url("sqlite:///./health_app.db") == "sqlite+aiosqlite:///./health_app.db"
+    assert async_database_url("postgresql://u:pw@host:5432/db").startswith("postgresql+asyncpg://u:pw@")
+
+    async def scenario(url):
+        statistics_cache.clear()
+        db_engine = create_async_db_engine(url)
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        Session = async_sessionmaker(db_engine, autoflush=False, expire_on_commit=False)
+
+        async def add_meals(user_id):
+            async with Session() as db:
+                for day in range(1, 6):
+                    meal_id = await AsyncDatabaseService.add_meal_record(db, user_id, {"date": f"2026-10-0{day}"})
+                    assert isinstance(meal_id, int)
+
+        await asyncio.gather(*(add_meals(f"user-{i}") for i in range(4)))
+        async with Session() as db:
+            page = await AsyncDatabaseService.list_meals(db, "user-0", start_date="2026-10-01", end_date="2026-10-31")
+            stats = await AsyncDatabaseService.get_user_statistics(db, "user-3")
+            user = await AsyncDatabaseService.get_user_by_id(db, "없는 사용자")
+        await db_engine.dispose()
+        return page, stats, user
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        page, stats, user = asyncio.run(scenario(f"sqlite:///{os.path.join(tmp_dir, 'app.db')}"))
+    assert len(page["items"]) == 5 and stats["meals"] == 5 and user is None
+
+if __name__ == "__main__":
+    print("🧪 DB 엔진 설정 테스트")
+    print("=" * 50)
+    test_sqlite_pragmas()
+    test_concurrent_writes()
+    test_postgres_options()
+    test_async_service()
+    print("\n✅ DB 엔진 설정 테스트 완료!")
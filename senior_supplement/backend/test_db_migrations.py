@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+기존 데이터베이스 스키마 보정 테스트
+"""
+import os
+import sqlite3
+import tempfile
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import Session
+from database import Base, MealRecord
+from db_migrations import run_migrations
+from db_service import DatabaseService, statistics_cache
+
+OLD_MEAL_TABLE = """
+CREATE TABLE meal_records (
+    id INTEGER PRIMARY KEY, user_id VARCHAR, date VARCHAR, meal_type VARCHAR,
+    foods JSON, nutrients JSON, calories FLOAT, image_path VARCHAR, ai_analysis JSON, created_at DATETIME
+)
+"""
+
+def test_upgrade_old_database():
+    """예전 스키마 DB에 새 컬럼/인덱스를 추가하고 기존 행을 변환하는지 확인"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute(OLD_MEAL_TABLE)
+        conn.executemany(
+            "INSERT INTO meal_records (user_id, date, meal_type) VALUES (?, ?, ?)",
+            [("user-1", "2026-10-01", "아침"), ("user-2", "2026-10-02", "점심"),
+             ("user-1", "2026-10-03", "저녁"), ("user-1", "잘못된 날짜", "간식")]
+        )
+        conn.commit()
+        conn.close()
+
+        statistics_cache.clear()
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine, Base.metadata)
+        run_migrations(engine, Base.metadata)  # 두 번 실행해도 안전
+
+        indexes = {index["name"] for index in inspect(engine).get_indexes("meal_records")}
+        assert {"uq_meal_records_user_client", "ix_meal_records_user_seq", "ix_meal_records_user_date"} <= indexes
+
+        with Session(engine) as db:
+            meals = DatabaseService.get_meals_by_date_range(db, "user-1", "2026-10-01", "2026-10-31")
+            assert [meal.meal_type for meal in meals] == ["아침", "저녁"]
+            assert db.get(MealRecord, 4).record_date is None
+            assert DatabaseService.get_user_statistics(db, "user-1")["meals"] == 3
+            days = DatabaseService.get_daily_summaries(db, "user-1", "2026-10-01", "2026-10-31")
+            assert [day["date"] for day in days] == ["2026-10-01", "2026-10-03"]
+
+            # 기존 행에 부여된 순번 다음부터 새 순번 할당
+            changes = DatabaseService.get_changes(db, "user-1", since=0)
+            assert changes["cursor"] == 3
+            DatabaseService.add_meal_record(db, "user-1", {"date": "2026-10-04"})
+            assert DatabaseService.get_changes(db, "user-1", since=3)["cursor"] == 4
+
+            # 예전 단건 API 행(client_id 없음)에 내용 해시 ID를 부여해 다시 동기화해도 중복되지 않음
+            meal = {"date": "2026-10-05", "meal_type": "점심"}
+            old = DatabaseService.add_meal_record(db, "user-1", meal)
+            old_id, old.client_id = old.id, None
+            db.commit()
+        run_migrations(engine, Base.metadata)
+        with Session(engine) as db:
+            assert db.get(MealRecord, old_id).client_id is not None
+            result = DatabaseService.sync_user_data(db, "user-1", {"meals": [meal]})
+            assert result["tables"]["meals"]["skipped"] == 1
+        engine.dispose()
+
+if __name__ == "__main__":
+    print("🧪 DB 스키마 보정 테스트")
+    print("=" * 50)
+    test_upgrade_old_database()
+    print("\n✅ 스키마 보정 테스트 완료!")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+음식명 정규화 인덱스 테스트
+"""
+import time
+from food_name_index import FoodNameIndex, food_name_index, to_jamo, edit_distance
+
+def test_exact_and_alias():
+    """표준 음식명과 별칭 매칭 테스트"""
+    cases = {
+        "배추김치": "배추김치",
+        "배추 김치": "배추김치",
+        "김치": "배추김치",
+        "Kimchi": "배추김치",
+        "된장찌개": "된장국",
+        "흰 쌀밥": "흰밥",
+        "오징어 콩나물 볶음": "오징어콩나물볶음",
+    }
+    for label, expected in cases.items():
+        found = food_name_index.match(label)
+        print(f"{label} -> {found}")
+        assert found is not None and found.food_id == expected
+    assert food_name_index.match("김치찌개").food_id == "김치찌개"
+
+def test_substring_and_fuzzy():
+    """부분 일치와 자모 단위 유사 일치 테스트"""
+    found = food_name_index.match("배추김치 한 접시")
+    assert found.food_id == "배추김치" and found.method == "exact"  # 분량 단어를 떼고 일치
+    assert food_name_index.match("밥 한 공기").food_id == "흰밥"
+
+    found = food_name_index.match("깍뚜기")
+    print(f"깍뚜기 -> {found}")
+    assert found.food_id == "깍두기" and found.method == "fuzzy"
+
+    assert food_name_index.match("미역국 1인분").food_id == "미역국"
+    assert food_name_index.match("a bowl of kimchi").food_id == "배추김치"
+
+    # 재료 이름이 들어간 다른 음식은 매칭하지 않음 (unmatched_foods로)
+    for label in ["김치볶음밥", "김치전", "kimchi fried rice", "오징어볶음밥", "미역국밥"]:
+        assert food_name_index.match(label) is None, label
+
+    # 짧은 음식명이 들어간 오타도 유사 일치 ("김치찌게" ⊃ "김치")
+    for label, expected in {"김치찌게": "김치찌개", "콩나물꾹": "콩나물국", "시금치나믈": "시금치나물",
+                            "오징어콩나물복음": "오징어콩나물볶음", "된장찌게": "된장국"}.items():
+        found = food_name_index.match(label)
+        assert found is not None and found.food_id == expected and found.method == "fuzzy", label
+
+    # 한 글자 별칭("밥")은 부분 일치에 쓰지 않음
+    assert food_name_index.match("볶음밥") is None
+    assert food_name_index.match("불고기") is None
+
+def test_generic_terms():
+    """일반적인 라벨 감지 테스트"""
+    for label in ["Food", "음식", " 식사 ", ""]:
+        assert food_name_index.is_generic(label)
+        assert food_name_index.resolve(label) is None
+    assert not food_name_index.is_generic("미역국")
+
+def test_jamo_distance():
+    """자모 분해와 편집 거리 테스트"""
+    assert to_jamo("깍두기") == "ㄲㅏㄱㄷㅜㄱㅣ"
+    assert edit_distance(to_jamo("깍두기"), to_jamo("깍뚜기")) == 1
+    assert edit_distance("abc", "xyz", max_distance=1) == 2
+
+def test_match_speed():
+    """캐시되지 않은 라벨의 매칭 속도 확인"""
+    index = FoodNameIndex(cache_size=0)
+    labels = ["배추 김치", "깍뚜기", "미역국밥", "불고기"]
+    runs = 500
+    start = time.perf_counter()
+    for _ in range(runs):
+        for label in labels:
+            index.match(label)
+    per_call_us = (time.perf_counter() - start) / (runs * len(labels)) * 1_000_000
+    print(f"라벨 매칭 평균: {per_call_us:.1f}µs")
+    assert per_call_us < 5000
+
+if __name__ == "__main__":
+    print("🧪 음식명 정규화 인덱스 테스트")
+    print("=" * 50)
+    test_exact_and_alias()
+    test_substring_and_fuzzy()
+    test_generic_terms()
+    test_jamo_distance()
+    test_match_speed()
+    print("\n✅ 음식명 정규화 인덱스 테스트 완료!")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+로컬 영양성분 데이터베이스 테스트
+"""
+import time
+from korean_food_classifier import korean_classifier
+from food_nutrition_db import nutrition_db, NUTRIENT_FIELDS
+
+def test_covers_classifier_foods():
+    """분류 데이터베이스의 모든 음식이 영양성분 DB에 있는지 확인"""
+    missing = [
+        food_name
+        for foods in korean_classifier.food_database.values()
+        for food_name in foods
+        if food_name not in nutrition_db
+    ]
+    print(f"누락된 음식: {missing}")
+    assert missing == []
+
+def test_meal_totals():
+    """식사 합계 계산 테스트"""
+    totals = nutrition_db.compute_meal_totals([
+        "흰밥",
+        {"name": "배추 김치", "portion": 2},
+        {"name": "된장국", "portion": "0.5"},
+        "불고기",
+    ])
+    print(f"합계: {totals}")
+
+    assert set(totals['nutrients']) == set(NUTRIENT_FIELDS)
+    assert totals['calories'] == 310 + 16 * 2 + 60 * 0.5
+    assert [item['name'] for item in totals['matched_foods']] == ["흰밥", "배추김치", "된장국"]
+    assert totals['unmatched_foods'] == ["불고기"]
+
+def test_lacking_nutrient():
+    """부족 영양소 판정 테스트"""
+    rice_only = nutrition_db.compute_meal_totals(["흰밥"])['nutrients']
+    lacking = nutrition_db.find_lacking_nutrient(rice_only, "여성")
+    print(f"흰밥만 먹었을 때 부족 영양소: {lacking}")
+    assert lacking is not None
+    assert lacking['name'] in ("단백질", "칼슘", "식이섬유", "철분")
+
+    plenty = {"protein": 100, "calcium": 1000, "fiber": 30, "iron": 10}
+    assert nutrition_db.find_lacking_nutrient(plenty, "남성") is None
+
+def test_lookup_speed():
+    """식사 합계 계산 속도 확인"""
+    meal = ["흰밥", "된장국", "배추김치", "시금치나물", "계란말이"]
+    runs = 10000
+    start = time.perf_counter()
+    for _ in range(runs):
+        nutrition_db.compute_meal_totals(meal)
+    per_call_us = (time.perf_counter() - start) / runs * 1_000_000
+    print(f"한 끼 계산 평균: {per_call_us:.1f}µs")
+    assert per_call_us < 1000
+
+if __name__ == "__main__":
+    print("🧪 영양성분 데이터베이스 테스트")
+    print("=" * 50)
+    test_covers_classifier_foods()
+    test_meal_totals()
+    test_lacking_nutrient()
+    test_lookup_speed()
+    print("\n✅ 영양성분 데이터베이스 테스트 완료!")
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+백그라운드 의존성 점검 (readiness) 테스트
+"""
+from database import create_db_engine, ping_database
+from health_checks import HealthMonitor
+
+def failing():
+    raise ConnectionError("연결 실패")
+
+def test_status():
+    """필수 점검 실패는 not_ready, 선택 점검 실패는 degraded"""
+    monitor = HealthMonitor()
+    monitor.register("database", lambda: {"dialect": "sqlite"}, required=True)
+    monitor.register("sts", failing)
+    assert monitor.status == "starting" and not monitor.ready
+
+    monitor.refresh()
+    snapshot = monitor.snapshot()
+    print(f"점검 결과: {snapshot}")
+    assert snapshot["status"] == "degraded" and monitor.ready
+    assert snapshot["checks"]["database"]["dialect"] == "sqlite"
+    assert snapshot["checks"]["sts"] == {
+        "ok": False, "error": "ConnectionError: 연결 실패", "required": False,
+        "latency_ms": snapshot["checks"]["sts"]["latency_ms"]
+    }
+
+    monitor.register("database", failing, required=True)
+    monitor.refresh()
+    assert monitor.status == "not_ready" and not monitor.ready
+
+    monitor.probes.pop("sts")
+    monitor.register("database", lambda: None, required=True)
+    monitor.refresh()
+    assert monitor.status == "ready"
+
+def test_ping_database():
+    """DB 점검은 SELECT 1"""
+    assert ping_database(create_db_engine("sqlite://")) == {"dialect": "sqlite"}
+
+if __name__ == "__main__":
+    print("🧪 헬스 점검 테스트")
+    print("=" * 50)
+    test_status()
+    test_ping_database()
+    print("\n✅ 헬스 점검 테스트 완료!")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+기록 목록 조회 (키셋 페이지네이션, 필드 선택, 일별 요약) 테스트
+"""
+import orjson
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from database import FactCheck, HealthCheckup
+from db_service import DatabaseService
+from test_bulk_sync import make_session
+
+def add_fact_checks(db, count):
+    base = datetime(2026, 10, 1, 9, 0)
+    for i in range(count):
+        # 같은 시각에 저장된 기록도 id로 구분되는지 확인하기 위해 두 개씩 같은 created_at
+        db.add(FactCheck(user_id="user-1", query=f"질문{i}", source_type="text", credibility_score=0.5,
+                         fact_check_result={"detail": "x" * 2000}, created_at=base + timedelta(minutes=i // 2)))
+    db.commit()
+
+def test_keyset_pagination():
+    """커서로 끝까지 넘기면 모든 기록이 한 번씩 최신순으로 나오는지 확인"""
+    db = make_session()
+    add_fact_checks(db, 25)
+
+    seen, cursor = [], None
+    while True:
+        page = DatabaseService.list_fact_checks(db, "user-1", cursor=cursor, limit=10)
+        seen.extend(item["query"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == 25 and len(set(seen)) == 25
+    assert seen[0] == "질문24" and seen[-1] == "질문0"
+
+    try:
+        DatabaseService.list_fact_checks(db, "user-1", cursor="잘못된커서")
+        assert False, "잘못된 커서를 감지하지 못했습니다."
+    except ValueError:
+        pass
+
+def test_field_projection():
+    """요청한 컬럼만 SELECT 하는지 확인"""
+    db = make_session()
+    add_fact_checks(db, 3)
+
+    queries = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: queries.append(args[2]))
+    page = DatabaseService.list_fact_checks(db, "user-1", fields="query,credibility_score")
+    print(f"선택 조회 SQL: {queries[-1].splitlines()[0]}")
+    assert set(page["items"][0]) == {"query", "credibility_score", "id", "created_at"}
+    assert "fact_check_result" not in queries[-1]
+
+    # 기본 필드는 기존 응답과 같음
+    full = DatabaseService.list_fact_checks(db, "user-1")
+    assert set(full["items"][0]) == set(DatabaseService.DEFAULT_LIST_FIELDS[FactCheck])
+
+    for bad_fields in ("user_id", "query,password"):
+        try:
+            DatabaseService.list_fact_checks(db, "user-1", fields=bad_fields)
+            assert False, "알 수 없는 필드를 감지하지 못했습니다."
+        except ValueError:
+            pass
+
+def test_raw_json_passthrough():
+    """JSON 컬럼을 파싱 없이 내보내도 응답 내용이 같은지 확인"""
+    db = make_session()
+    add_fact_checks(db, 3)
+    DatabaseService.add_meal_record(db, "user-1", {"date": "2026-10-01", "foods": ["흰밥", "된장국"],
+                                                   "ai_analysis": {"content": "단백질 보충 필요", "score": 0.8}})
+
+    for method, kwargs in ((DatabaseService.list_fact_checks, {}),
+                           (DatabaseService.list_meals, {"date": "2026-10-01"})):
+        decoded = method(db, "user-1", **kwargs)
+        raw = method(db, "user-1", **kwargs, raw_json=True)
+        assert orjson.loads(orjson.dumps(raw)) == decoded
+    assert isinstance(raw["items"][0]["ai_analysis"], orjson.Fragment)
+    assert raw["items"][0]["image_path"] is None
+
+def test_meal_list_and_deferred_details():
+    """식사 목록 날짜 필터와 큰 JSON 컬럼 지연 로딩 확인"""
+    db = make_session()
+    for day in ("2026-10-01", "2026-10-02", "2026-10-03"):
+        DatabaseService.add_meal_record(db, "user-1", {"date": day, "foods": ["흰밥"], "ai_analysis": {"content": "요약"}})
+
+    page = DatabaseService.list_meals(db, "user-1", start_date="2026-10-02", end_date="2026-10-03", fields=["date"])
+    assert [item["date"] for item in page["items"]] == ["2026-10-03", "2026-10-02"]
+
+    DatabaseService.save_health_checkup(db, "user-1", {"checkup_date": "2026-10-01", "checkup_data": {"혈압": "120/80"}})
+    db.expunge_all()
+    queries = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: queries.append(args[2]))
+    checkup = DatabaseService.get_latest_health_checkup(db, "user-1")
+    assert checkup.checkup_data == {"혈압": "120/80"}
+    assert len(queries) == 1  # 최신 조회는 상세 컬럼을 한 번에 로드
+
+    db.expunge_all()
+    summary = db.query(HealthCheckup).first()
+    assert "checkup_data" not in summary.__dict__  # 일반 조회에서는 지연 로딩
+
+def test_daily_summaries():
+    """식사/복용 기록 변경이 해당 날짜의 일별 요약에 바로 반영되는지 확인"""
+    db = make_session()
+    DatabaseService.add_meal_record(db, "user-1", {"date": "2026-10-01", "calories": 500, "nutrients": {"protein": 20}})
+    DatabaseService.add_meal_record(db, "user-1", {"date": "2026-10-01", "calories": 300, "nutrients": {"protein": 5.5}})
+    DatabaseService.add_medication_record(db, "user-1", {"date": "2026-10-01", "medication_name": "비타민D"})
+    DatabaseService.add_medication_record(db, "user-1", {"date": "2026-10-01", "medication_name": "오메가3"})
+    DatabaseService.update_medication_taken(db, "user-1", "2026-10-01", "비타민D", True)
+    DatabaseService.sync_user_data(db, "user-1", {
+        "meals": [{"id": "m1", "date": "2026-10-02", "calories": 400}],
+        "medication_records": [{"date": "2026-10-03", "medication_name": "칼슘", "taken": True}],
+    })
+
+    days = DatabaseService.get_daily_summaries(db, "user-1", "2026-10-01", "2026-10-31")
+    assert [day["date"] for day in days] == ["2026-10-01", "2026-10-02", "2026-10-03"]
+    assert days[0]["calories"] == 800 and days[0]["nutrients"]["protein"] == 25.5 and days[0]["meal_count"] == 2
+    assert days[0]["medication_total"] == 2 and days[0]["adherence_rate"] == 0.5
+    assert days[1]["adherence_rate"] is None and days[2]["adherence_rate"] == 1.0
+
+    # 동기화로 날짜가 바뀌면 이전 날짜 요약은 사라짐, 삭제도 반영
+    DatabaseService.sync_user_data(db, "user-1", {"meals": [{"id": "m1", "date": "2026-10-04", "calories": 400}]})
+    DatabaseService.delete_record(db, "user-1", "medication_records", 3)
+    days = DatabaseService.get_daily_summaries(db, "user-1", "2026-10-01", "2026-10-31")
+    assert [day["date"] for day in days] == ["2026-10-01", "2026-10-04"]
+
+    try:
+        DatabaseService.get_daily_summaries(db, "user-1", "2026-10-31", "2026-10-01")
+        assert False, "잘못된 기간을 감지하지 못했습니다."
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    print("🧪 기록 목록 조회 테스트")
+    print("=" * 50)
+    test_keyset_pagination()
+    test_field_projection()
+    test_raw_json_passthrough()
+    test_meal_list_and_deferred_details()
+    test_daily_summaries()
+    print("\n✅ 목록 조회 테스트 완료!")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+작업별 모델 선택 / 대형 모델 재시도 / 호출 기록 테스트
+"""
+from model_router import ModelRouter, estimate_cost
+
+LARGE = "anthropic.claude-3-5-sonnet-20240620-v1:0"
+FAST = "us.anthropic.claude-3-5-haiku-20241022-v1:0"
+
+def test_candidates():
+    """짧은 텍스트 작업만 소형 모델을 먼저 사용하는지 확인"""
+    router = ModelRouter(LARGE, FAST)
+    assert router.candidates("checkup_text", input_chars=300) == [FAST, LARGE]
+    assert router.candidates("checkup_text", input_chars=5000) == [LARGE]  # 긴 입력
+    assert router.candidates("supplement_plan", input_chars=10) == [LARGE]
+    assert router.candidates("알 수 없는 작업") == [LARGE]
+    # 이미지를 받지 못하는 소형 모델은 건너뜀
+    assert router.candidates("food_verification", 100, has_image=True) == [LARGE]
+    assert ModelRouter(LARGE, "anthropic.claude-3-haiku-20240307-v1:0").candidates(
+        "food_verification", 100, has_image=True
+    )[0].startswith("anthropic.claude-3-haiku")
+    assert ModelRouter(LARGE, FAST, enabled=False).candidates("checkup_text", 10) == [LARGE]
+
+def test_accepts():
+    """형식이 맞고 확신도가 충분한 소형 모델 결과만 그대로 사용"""
+    router = ModelRouter(LARGE, FAST)
+    assert router.accepts("checkup_text", {"status": "주의", "content": "혈압이 조금 높습니다."})
+    assert router.accepts("checkup_text", {"status": "정상", "content": "양호", "confidence": 0.9})
+    assert not router.accepts("checkup_text", {"status": "주의", "content": "요약", "confidence": 0.3})
+    assert not router.accepts("checkup_text", {"status": "Yellow", "content": "요약"})
+    assert not router.accepts("text_fact_check", {"overall_credibility": "낮음", "fact_check_result": ""})
+    assert not router.accepts("checkup_text", None)
+    assert router.accepts("default", {"anything": 1})
+
+def test_stats():
+    """작업별 호출 수, 재시도, 지연 시간, 예상 비용 기록"""
+    router = ModelRouter(LARGE, FAST)
+    usage = {"inputTokens": 1000, "outputTokens": 200}
+    for elapsed in (0.5, 0.7, 0.6):
+        router.record("checkup_text", FAST, elapsed, usage)
+    router.record_escalation("checkup_text")
+    router.record("checkup_text", LARGE, 3.0, usage)
+
+    stats = router.stats["routes"]["checkup_text"]
+    print(f"검진 텍스트 라우팅 기록: {stats}")
+    assert stats["calls"] == 4 and stats["escalations"] == 1
+    assert stats["models"] == {FAST: 3, LARGE: 1}
+    assert stats["p50_ms"] == 700.0 and stats["p95_ms"] == 3000.0
+    assert abs(stats["cost_usd"] - (3 * estimate_cost(FAST, usage) + estimate_cost(LARGE, usage))) < 1e-9
+
+    assert abs(estimate_cost(LARGE, usage) - (1000 * 3 + 200 * 15) / 1_000_000) < 1e-12
+    assert estimate_cost(FAST, usage) < estimate_cost(LARGE, usage) / 3
+    assert estimate_cost("unknown-model", usage) == 0.0
+
+if __name__ == "__main__":
+    print("🧪 모델 라우팅 테스트")
+    print("=" * 50)
+    test_candidates()
+    test_accepts()
+    test_stats()
+    print("\n✅ 모델 라우팅 테스트 완료!")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+프롬프트 템플릿 레지스트리 테스트
+"""
+import os
+import tempfile
+import time
+from prompt_templates import PromptRegistry, PromptTemplateError, prompt_registry
+
+USER_VARS = {
+    "name": "김영희",
+    "age": "75",
+    "gender": "여성",
+    "height": "160",
+    "weight": "58",
+    "checkup_text": "T-score -2.6, 혈압 145/85",
+}
+
+def legacy_load_prompt(filename, variables):
+    """기존 방식 (파일 읽기 + 변수별 replace)"""
+    with open(os.path.join(prompt_registry.prompts_dir, filename), "r", encoding="utf-8") as f:
+        content = f.read()
+    for key, value in variables.items():
+        content = content.replace(f"{{{{{key}}}}}", str(value))
+    return content
+
+def test_render_matches_legacy():
+    """컴파일된 템플릿 렌더링 결과가 기존 방식과 같은지 확인"""
+    rendered = prompt_registry.render("checkup_expert.txt", USER_VARS)
+    assert rendered == legacy_load_prompt("checkup_expert.txt", USER_VARS)
+    assert "{{" not in rendered
+    print("✅ 기존 방식과 동일한 결과")
+
+def test_static_prefix_has_no_user_data():
+    """사용자 변수는 모두 고정 앞부분 뒤에 오는지 확인 (프롬프트 캐시 대상)"""
+    for filename in ("checkup_expert.txt", "meal_vision_coach.txt", "final_supplement_expert.txt"):
+        template = prompt_registry.get(filename)
+        assert "{{" not in template.static_prefix
+        assert len(template.static_prefix) > len("".join(template.literals[1:]))
+
+    variables = {**USER_VARS, "name": "박철수", "checkup_text": "혈당 130mg/dL"}
+    parts = prompt_registry.render_parts("checkup_expert.txt", variables, extra_static=("분류 기준",))
+    assert parts.static[1] == "분류 기준"
+    assert "박철수" not in "".join(parts.static)
+    assert "박철수" in parts.dynamic and "혈당 130mg/dL" in parts.dynamic
+    assert parts.static[0] + parts.dynamic == prompt_registry.render("checkup_expert.txt", variables)
+    print(f"✅ 고정 앞부분 {len(parts.static[0])}자 / 사용자별 부분 {len(parts.dynamic)}자")
+
+def test_variable_validation():
+    """누락/알 수 없는 변수 검증 테스트"""
+    missing = dict(USER_VARS)
+    del missing["checkup_text"]
+    try:
+        prompt_registry.render("checkup_expert.txt", missing)
+        assert False, "누락된 변수를 감지하지 못했습니다."
+    except PromptTemplateError as e:
+        print(f"누락 변수 감지: {e}")
+        assert "checkup_text" in str(e)
+
+    try:
+        prompt_registry.render("checkup_expert.txt", {**USER_VARS, "nickname": "영희"})
+        assert False, "알 수 없는 변수를 감지하지 못했습니다."
+    except PromptTemplateError as e:
+        print(f"알 수 없는 변수 감지: {e}")
+        assert "nickname" in str(e)
+
+    try:
+        prompt_registry.render("not_exists.txt", {})
+        assert False, "없는 템플릿을 감지하지 못했습니다."
+    except FileNotFoundError:
+        pass
+
+def test_reload_on_mtime_change():
+    """파일이 바뀐 경우에만 다시 로드되는지 확인"""
+    with tempfile.TemporaryDirectory() as prompts_dir:
+        path = os.path.join(prompts_dir, "hello.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("안녕하세요 {{name}}님")
+
+        registry = PromptRegistry(prompts_dir, check_interval=0)
+        first = registry.get("hello.txt")
+        assert registry.render("hello.txt", {"name": "철수"}) == "안녕하세요 철수님"
+        assert registry.get("hello.txt") is first
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("반갑습니다 {{name}}님")
+        mtime = os.path.getmtime(path) + 1
+        os.utime(path, (mtime, mtime))
+
+        assert registry.render("hello.txt", {"name": "철수"}) == "반갑습니다 철수님"
+        assert registry.get("hello.txt") is not first
+
+def test_render_speed():
+    """렌더링 속도 비교"""
+    runs = 2000
+    start = time.perf_counter()
+    for _ in range(runs):
+        legacy_load_prompt("final_supplement_expert.txt", {**USER_VARS, "checkup_analysis_result": "", "meal_analysis_result": "", "retrieved_context": ""})
+    legacy = time.perf_counter() - start
+
+    variables = {key: USER_VARS[key] for key in ("name", "age", "gender", "height", "weight")}
+    variables.update({"checkup_analysis_result": "", "meal_analysis_result": "", "retrieved_context": ""})
+    start = time.perf_counter()
+    for _ in range(runs):
+        prompt_registry.render("final_supplement_expert.txt", variables)
+    compiled = time.perf_counter() - start
+
+    print(f"기존: {legacy / runs * 1e6:.1f}µs, 컴파일: {compiled / runs * 1e6:.1f}µs")
+
+if __name__ == "__main__":
+    print("🧪 프롬프트 템플릿 레지스트리 테스트")
+    print("=" * 50)
+    test_render_matches_legacy()
+    test_static_prefix_has_no_user_data()
+    test_variable_validation()
+    test_reload_on_mtime_change()
+    test_render_speed()
+    print("\n✅ 프롬프트 템플릿 테스트 완료!")
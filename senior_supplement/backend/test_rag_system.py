@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+RAG 시스템 지연 로드 테스트 (로드 전에는 SQLite 키워드 검색으로 대체)
+"""
+import os
+import sqlite3
+import tempfile
+from rag_system import RAGSystem
+
+def make_data_dir():
+    data_path = tempfile.mkdtemp()
+    conn = sqlite3.connect(os.path.join(data_path, "medicines.db"))
+    conn.execute("CREATE TABLE drugs (name TEXT, company TEXT, effect TEXT, full_text TEXT)")
+    conn.execute("INSERT INTO drugs VALUES ('비타민D 정', '제약사', '뼈 건강', '비타민D 1000IU 함유')")
+    conn.commit()
+    conn.close()
+    return data_path
+
+def test_lazy_load():
+    """lazy=True면 인덱스/클라이언트 없이 바로 생성되고, 검색은 폴백 사용"""
+    rag = RAGSystem(data_path=make_data_dir(), lazy=True)
+    assert rag.state == "not_loaded" and not rag.is_ready
+    assert rag._bedrock is None  # 임베딩 클라이언트는 처음 사용할 때 생성
+
+    results = rag.search_similar_documents("비타민D", top_k=3)
+    assert [doc["name"] for doc in results] == ["비타민D 정"]
+    assert results[0]["source"] == "sqlite_fallback"
+
+    rag.load()  # 인덱스 파일이 없는 디렉터리
+    assert rag.state == "unavailable" and not rag.is_ready
+
+if __name__ == "__main__":
+    print("🧪 RAG 지연 로드 테스트")
+    print("=" * 50)
+    test_lazy_load()
+    print("\n✅ RAG 지연 로드 테스트 완료!")
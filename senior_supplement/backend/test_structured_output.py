@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Claude 응답 구조화 (JSON 추출/복구, 스키마 검증, tool use) 테스트
+"""
+from structured_output import (
+    CheckupAnalysis, MealVisionResult, StructuredOutputError, SupplementPlan,
+    extract_json, parse_converse_response, supports_tool_use, tool_config
+)
+
+def text_response(text, stop_reason="end_turn"):
+    return {"output": {"message": {"content": [{"text": text}]}}, "stopReason": stop_reason}
+
+def test_extract_json():
+    """코드블록, 설명 문장, 끝 쉼표, 문자열 안 괄호가 섞인 응답에서 JSON 추출"""
+    assert extract_json('분석 결과입니다.\n```json\n{"status": "주의", "items": [1, 2,],}\n```\n참고하세요.') == {
+        "status": "주의", "items": [1, 2]
+    }
+    assert extract_json('결과: {"content": "혈압 {140/90} 주의", "quote": "\\"높음\\""} 입니다. {"다른": 1}') == {
+        "content": "혈압 {140/90} 주의", "quote": '"높음"'
+    }
+    assert extract_json('{형식 오류} 다시 작성: {"ok": true}') == {"ok": True}
+    assert extract_json("JSON이 없는 응답") is None
+    assert extract_json("") is None
+
+def test_repair_truncated():
+    """최대 토큰에서 잘린 응답을 마지막 완결 항목까지 살리는지 확인"""
+    assert extract_json('{"status": "주의", "content": "혈압이 높') == {"status": "주의", "content": "혈압이 높"}
+    assert extract_json('```json\n{"supplement_list": [{"name": "비타민D"}, {"name": "칼') == {
+        "supplement_list": [{"name": "비타민D"}, {"name": "칼"}]
+    }
+    assert extract_json('{"status": "정상", "action_plan": ') == {"status": "정상"}
+    assert extract_json('{"a": {"b": [1, 2') == {"a": {"b": [1, 2]}}
+
+def test_schema_validation():
+    """스키마에 맞게 형 변환하고, 필수 필드가 없으면 오류"""
+    plan = parse_converse_response(text_response(
+        '{"total_safety_level": 2, "content": "안전합니다", "supplement_list": [{"name": "오메가3"}], "note": "추가"}'
+    ), SupplementPlan)
+    assert plan["total_safety_level"] == "2" and plan["note"] == "추가"
+    assert plan["supplement_list"][0]["schedule"] == {"time": "", "timing": ""}
+
+    meal = parse_converse_response(text_response(
+        '{"food_items": [{"name": "흰밥", "confidence": "높음", "bbox": [0.1, 0.1, 0.3, 0.3]}]}'
+    ), MealVisionResult)
+    assert meal["food_items"][0]["confidence"] is None and meal["food_items"][0]["portion"] == 1.0
+
+    for text in ('{"content": "상태 필드 없음"}', "죄송합니다. 분석할 수 없습니다."):
+        try:
+            parse_converse_response(text_response(text), CheckupAnalysis)
+            assert False, "잘못된 응답을 감지하지 못했습니다."
+        except StructuredOutputError as e:
+            assert e.raw_text == text
+
+def test_tool_use():
+    """스키마를 도구로 강제하고 toolUse 입력을 그대로 사용하는지 확인"""
+    config = tool_config(SupplementPlan)
+    spec = config["tools"][0]["toolSpec"]
+    assert config["toolChoice"] == {"tool": {"name": "supplement_plan"}} and spec["name"] == "supplement_plan"
+    schema = spec["inputSchema"]["json"]
+    assert "$defs" not in schema and "$ref" not in str(schema)
+    assert schema["properties"]["supplement_list"]["items"]["properties"]["schedule"]["type"] == "object"
+    assert "content" in schema["required"]
+
+    response = {"output": {"message": {"content": [
+        {"toolUse": {"toolUseId": "t1", "name": "checkup_analysis", "input": {"status": "위험", "content": "요약"}}}
+    ]}}, "stopReason": "tool_use"}
+    assert parse_converse_response(response, CheckupAnalysis)["status"] == "위험"
+
+    assert supports_tool_use("anthropic.claude-3-5-sonnet-20240620-v1:0")
+    assert supports_tool_use("us.anthropic.claude-sonnet-4-5-20250929-v1:0")
+    assert not supports_tool_use("anthropic.claude-v2")
+
+if __name__ == "__main__":
+    print("🧪 응답 구조화 테스트")
+    print("=" * 50)
+    test_extract_json()
+    test_repair_truncated()
+    test_schema_validation()
+    test_tool_use()
+    print("\n✅ 응답 구조화 테스트 완료!")
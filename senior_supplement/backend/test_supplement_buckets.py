@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+영양제 추천 버킷 / RAG 컨텍스트 캐시 테스트
+"""
+import time
+from supplement_buckets import (
+    BUCKETS, RecommendationContextCache, age_band, find_bucket, normalize_nutrient
+)
+
+class FakeRAG:
+    """검색 호출 수를 세는 RAG 대역"""
+
+    def __init__(self):
+        self.searches = []
+
+    def search_similar_documents(self, query, top_k=5):
+        self.searches.append(query)
+        return [{"name": f"{query} 문서", "full_text": f"{query} 관련 내용"}]
+
+    def get_safety_information(self, supplements):
+        self.searches.append("safety")
+        return "\n".join(f"{name}: 과다 복용 주의" for name in supplements)
+
+    def get_supplement_interactions(self, supplements):
+        self.searches.append("interactions")
+        return [{"supplement": name, "interaction_info": "상호작용 정보"} for name in supplements]
+
+def names(bucket):
+    return [item["name"] for item in bucket.supplement_list]
+
+def test_buckets():
+    """기존 빠른 추천 규칙 + 권장 영양소가 버킷에 반영되는지 확인"""
+    assert age_band(49) == "50세 미만" and age_band(65) == "65~74세" and age_band(90) == "75세 이상"
+    assert names(find_bucket(70, "남성")) == ["비타민D", "칼슘", "오메가3"]
+    assert names(find_bucket(40, "여성")) == ["비타민D", "철분"]
+    assert names(find_bucket(70, "여성", "오메가3")) == ["오메가3", "비타민D", "칼슘", "철분"]
+    # 검진 권장 영양소가 없으면 식단 권장 영양소 사용
+    bucket = find_bucket(55, "male", "", "식이섬유")
+    assert (bucket.gender, bucket.nutrient) == ("남성", "식이섬유") and names(bucket)[0] == "식이섬유"
+    # 칼륨은 보충제 대신 주의 문구로
+    potassium = find_bucket(70, "여성", "칼륨 (채소·과일)")
+    assert "칼륨" not in names(potassium) and "채소·과일" in potassium.special_caution
+    assert normalize_nutrient("칼슘과 비타민 D") == "칼슘" and normalize_nutrient("Omega-3") == "오메가3"
+    assert normalize_nutrient("", "알 수 없음") == ""
+    # 표 순서가 아니라 텍스트에서 먼저 나온 영양소
+    assert normalize_nutrient("오메가3, 칼슘") == "오메가3"
+    assert normalize_nutrient("철분 또는 비타민D") == "철분"
+    assert len(BUCKETS) == 4 * 3 * 9
+
+def test_context_cache():
+    """버킷 검색어와 안전성 정보는 한 번만 검색하고 재사용"""
+    rag = FakeRAG()
+    cache = RecommendationContextCache(rag)
+    cache.precompute()
+    searched = len(rag.searches)
+    assert searched == len({query for bucket in BUCKETS.values() for query in bucket.queries}) + 2
+
+    bucket = find_bucket(70, "여성", "칼슘과 비타민 D")
+    assert cache.is_ready(bucket)
+    context, sources, interactions = cache.context(bucket, "칼슘과 비타민 D", "")
+    assert len(rag.searches) == searched  # 추가 검색 없음
+    assert "[칼슘 문서]" in context and "[여성 시니어 노인 영양제 추천 문서]" in context
+    assert "비타민D: 과다 복용 주의" in context and sources == 3 and interactions == 4
+
+    # 버킷에 없는 권장 영양소 원문은 한 번 검색 후 캐시
+    cache.context(bucket, "루테인")
+    cache.context(bucket, "루테인")
+    assert rag.searches[searched:] == ["루테인"]
+
+    # RAG 인덱스가 새로 로드되면 캐시를 비우고 다시 검색
+    cache.clear()
+    assert not cache.is_ready(bucket) and cache.stats["safety_cached"] is False
+
+    # 빈 결과는 캐시하지 않음 (RAG 인덱스가 나중에 로드되는 경우)
+    empty = RecommendationContextCache(type("EmptyRAG", (FakeRAG,), {
+        "search_similar_documents": lambda self, query, top_k=5: []
+    })())
+    empty.search("비타민D")
+    assert not empty.is_ready(find_bucket(70, "여성", "비타민D")) and empty.stats["cached_queries"] == 0
+
+def test_context_cache_before_rag_loaded():
+    """RAG 로드 전 SQLite 폴백 결과와 clear()를 건너간 검색은 캐시하지 않음"""
+    class LoadingRAG(FakeRAG):
+        state = "loading"
+
+        def search_similar_documents(self, query, top_k=5):
+            self.searches.append(query)
+            return [{"name": f"{query} 문서", "full_text": "폴백 내용", "source": "sqlite_fallback"}]
+
+    rag = LoadingRAG()
+    cache = RecommendationContextCache(rag)
+    cache.search("비타민D")
+    cache.safety()
+    assert cache.stats["cached_queries"] == 0 and cache.stats["safety_cached"] is False
+
+    # 인덱스를 쓸 수 없는 환경에서는 폴백이 유일한 경로라 캐시
+    rag.state = "unavailable"
+    cache.search("비타민D")
+    cache.safety()
+    assert cache.stats["cached_queries"] == 1 and cache.stats["safety_cached"] is True
+
+    # 검색 도중 RAG 로드가 끝나 clear()가 실행되면 그 검색 결과는 저장하지 않음
+    class RacingRAG(FakeRAG):
+        def search_similar_documents(self, query, top_k=5):
+            racing.clear()
+            return super().search_similar_documents(query, top_k)
+
+    racing = RecommendationContextCache(RacingRAG())
+    assert racing.search("칼슘") and racing.stats["cached_queries"] == 0
+
+def test_fast_lookup_speed():
+    """버킷 조회가 1ms 미만인지 확인"""
+    start = time.perf_counter()
+    for _ in range(1000):
+        find_bucket(72, "여성", "칼슘과 비타민 D", "단백질")
+    elapsed = (time.perf_counter() - start) / 1000
+    print(f"버킷 조회 1회: {elapsed * 1_000_000:.1f}µs")
+    assert elapsed < 0.001
+
+if __name__ == "__main__":
+    print("🧪 영양제 추천 버킷 테스트")
+    print("=" * 50)
+    test_buckets()
+    test_context_cache()
+    test_context_cache_before_rag_loaded()
+    test_fast_lookup_speed()
+    print("\n✅ 영양제 추천 버킷 테스트 완료!")